@@ -12,9 +12,99 @@ class Settings:
     ESTATED_API_KEY: str = os.getenv("ESTATED_API_KEY", "")
     ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY", "")
     
-    # API Configuration
-    ESTATED_BASE_URL: str = "https://apis.estated.com/v4"
+    # API Configuration (base URLs can point at local stand-ins, e.g. benchmarks/fake_services.py)
+    ESTATED_BASE_URL: str = os.getenv("ESTATED_BASE_URL", "https://apis.estated.com/v4")
+    ANTHROPIC_BASE_URL: str = os.getenv("ANTHROPIC_BASE_URL", "")
+
+    # Estated HTTP Connection Pool
+    ESTATED_MAX_CONNECTIONS: int = int(os.getenv("ESTATED_MAX_CONNECTIONS", "100"))
+    ESTATED_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("ESTATED_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    ESTATED_KEEPALIVE_EXPIRY: float = float(os.getenv("ESTATED_KEEPALIVE_EXPIRY", "30.0"))
+    ESTATED_HTTP2: bool = os.getenv("ESTATED_HTTP2", "true").lower() == "true"
+    ESTATED_CONNECT_TIMEOUT: float = float(os.getenv("ESTATED_CONNECT_TIMEOUT", "5.0"))
+    ESTATED_READ_TIMEOUT: float = float(os.getenv("ESTATED_READ_TIMEOUT", "15.0"))
+    ESTATED_WRITE_TIMEOUT: float = float(os.getenv("ESTATED_WRITE_TIMEOUT", "5.0"))
+    ESTATED_POOL_TIMEOUT: float = float(os.getenv("ESTATED_POOL_TIMEOUT", "5.0"))
+    
+    # Estated retries (transient failures only) and circuit breaker
+    ESTATED_RETRY_ATTEMPTS: int = int(os.getenv("ESTATED_RETRY_ATTEMPTS", "3"))
+    ESTATED_RETRY_BASE_DELAY: float = float(os.getenv("ESTATED_RETRY_BASE_DELAY", "0.25"))
+    ESTATED_RETRY_MAX_DELAY: float = float(os.getenv("ESTATED_RETRY_MAX_DELAY", "2.0"))
+    ESTATED_RETRY_DEADLINE_SECONDS: float = float(os.getenv("ESTATED_RETRY_DEADLINE_SECONDS", "20.0"))
+    ESTATED_CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("ESTATED_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    ESTATED_CIRCUIT_RESET_SECONDS: float = float(os.getenv("ESTATED_CIRCUIT_RESET_SECONDS", "30.0"))
+    
+    # Property Data Cache
+    PROPERTY_CACHE_TTL_SECONDS: float = float(os.getenv("PROPERTY_CACHE_TTL_SECONDS", "86400"))
+    PROPERTY_CACHE_MAX_ENTRIES: int = int(os.getenv("PROPERTY_CACHE_MAX_ENTRIES", "10000"))
+    
+    # Memoized address normalizations (canonical cache / coalescing keys)
+    ADDRESS_NORMALIZATION_CACHE_SIZE: int = int(os.getenv("ADDRESS_NORMALIZATION_CACHE_SIZE", "100000"))
+    
+    # Financial metric assumptions (annual fractions unless noted)
+    FINANCIAL_RENT_TO_VALUE_MONTHLY: float = float(os.getenv("FINANCIAL_RENT_TO_VALUE_MONTHLY", "0.0075"))
+    FINANCIAL_VACANCY_RATE: float = float(os.getenv("FINANCIAL_VACANCY_RATE", "0.05"))
+    FINANCIAL_EXPENSE_RATIO: float = float(os.getenv("FINANCIAL_EXPENSE_RATIO", "0.40"))
+    FINANCIAL_PROPERTY_TAX_RATE: float = float(os.getenv("FINANCIAL_PROPERTY_TAX_RATE", "0.011"))
+    FINANCIAL_INSURANCE_RATE: float = float(os.getenv("FINANCIAL_INSURANCE_RATE", "0.004"))
+    FINANCIAL_MAINTENANCE_RATE: float = float(os.getenv("FINANCIAL_MAINTENANCE_RATE", "0.01"))
+    FINANCIAL_MORTGAGE_RATE: float = float(os.getenv("FINANCIAL_MORTGAGE_RATE", "0.07"))
+    FINANCIAL_LOAN_TERM_YEARS: int = int(os.getenv("FINANCIAL_LOAN_TERM_YEARS", "30"))
+    FINANCIAL_DOWN_PAYMENT_RATIO: float = float(os.getenv("FINANCIAL_DOWN_PAYMENT_RATIO", "0.25"))
+    FINANCIAL_CLOSING_COST_RATIO: float = float(os.getenv("FINANCIAL_CLOSING_COST_RATIO", "0.03"))
+    
+    # AI Configuration
+    ANTHROPIC_MODEL: str = os.getenv("ANTHROPIC_MODEL", "claude-3-sonnet-20241022")
+    
+    # Claude request governor (shared by all analyzers); 0 disables a per-minute budget
+    ANTHROPIC_MAX_CONCURRENCY: int = int(os.getenv("ANTHROPIC_MAX_CONCURRENCY", "16"))
+    ANTHROPIC_REQUESTS_PER_MINUTE: float = float(os.getenv("ANTHROPIC_REQUESTS_PER_MINUTE", "0"))
+    ANTHROPIC_TOKENS_PER_MINUTE: float = float(os.getenv("ANTHROPIC_TOKENS_PER_MINUTE", "0"))
+    ANTHROPIC_RATE_LIMIT_RETRIES: int = int(os.getenv("ANTHROPIC_RATE_LIMIT_RETRIES", "3"))
+    
+    # Legendary analysis execution: "monolithic" (one prompt) or "sectioned" (one prompt per section, in parallel)
+    LEGENDARY_ANALYSIS_MODE: str = os.getenv("LEGENDARY_ANALYSIS_MODE", "monolithic")
+    LEGENDARY_SECTION_CONCURRENCY: int = int(os.getenv("LEGENDARY_SECTION_CONCURRENCY", "11"))
+    LEGENDARY_SECTION_MAX_TOKENS: int = int(os.getenv("LEGENDARY_SECTION_MAX_TOKENS", "1500"))
     
+    # Legendary analysis output: "text" (markdown scraped by keyword) or "json" (schema-validated tool call)
+    # The legacy /property/report analysis always uses text; set DERIVE_LEGACY_FROM_LEGENDARY to reuse the JSON one
+    LEGENDARY_OUTPUT_MODE: str = os.getenv("LEGENDARY_OUTPUT_MODE", "text")
+    
+    # Per-request deadline on the legendary Claude analysis (0 disables). Past it the report is served
+    # from the latest cached analysis of the property, even if expired, else from rule-based insights;
+    # the Claude call keeps running in the background and refreshes the cache.
+    AI_DEADLINE_SECONDS: float = float(os.getenv("AI_DEADLINE_SECONDS", "90"))
+    
+    # Build legacy 8-section reports from the (cached) legendary analysis instead of a separate Claude call
+    DERIVE_LEGACY_FROM_LEGENDARY: bool = os.getenv("DERIVE_LEGACY_FROM_LEGENDARY", "false").lower() == "true"
+    
+    # AI Analysis Cache
+    ANALYSIS_CACHE_ENABLED: bool = os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() == "true"
+    ANALYSIS_CACHE_PATH: str = os.getenv("ANALYSIS_CACHE_PATH", ".cache/analysis_cache.sqlite3")
+    ANALYSIS_CACHE_TTL_SECONDS: float = float(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "604800"))
+    ANALYSIS_CACHE_STALE_SECONDS: float = float(os.getenv("ANALYSIS_CACHE_STALE_SECONDS", "2592000"))
+    # Rows older than this are deleted (never sooner than TTL + stale); until then they back degraded serving
+    ANALYSIS_CACHE_RETENTION_SECONDS: float = float(os.getenv("ANALYSIS_CACHE_RETENTION_SECONDS", "7776000"))
+    # Expired rows are deleted once every this many writes
+    ANALYSIS_CACHE_PRUNE_EVERY: int = int(os.getenv("ANALYSIS_CACHE_PRUNE_EVERY", "100"))
+    
+    # Batch Reports
+    BATCH_MAX_ADDRESSES: int = int(os.getenv("BATCH_MAX_ADDRESSES", "5000"))
+    BATCH_ESTATED_CONCURRENCY: int = int(os.getenv("BATCH_ESTATED_CONCURRENCY", "20"))
+    BATCH_AI_CONCURRENCY: int = int(os.getenv("BATCH_AI_CONCURRENCY", "5"))
+    
+    # Report Job Queue
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "4"))
+    JOB_QUEUE_MAX_SIZE: int = int(os.getenv("JOB_QUEUE_MAX_SIZE", "1000"))
+    JOB_STORE_PATH: str = os.getenv("JOB_STORE_PATH", ".cache/report_jobs.sqlite3")
+    # Completed and failed jobs older than this are deleted as new jobs arrive (0 keeps them forever)
+    JOB_RETENTION_HOURS: float = float(os.getenv("JOB_RETENTION_HOURS", "72"))
+
+    # Request Tracing: none (trace ids only), memory (in-process spans, for tests) or otel
+    # (spans go through the OpenTelemetry API; needs opentelemetry-api plus an SDK set up by the host)
+    TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "none").lower()
+
     # Report Configuration
     REPORT_COST: float = 5.00
     
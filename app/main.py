@@ -1,35 +1,48 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import json
 import logging
 from contextlib import asynccontextmanager
+from datetime import datetime
 from typing import Dict, Any
+from pydantic_core import to_json
 
 from app.config import settings
 from app.models import (
     PropertyReportRequest, PropertyReport, ErrorResponse,
-    LegendaryReportRequest, LegendaryPropertyReport
+    LegendaryReportRequest, LegendaryPropertyReport, LegendaryBatchRequest, PropertyPrewarmRequest,
+    LegendaryJobRequest, ReportJobStatus
 )
 from app.services.report_generator import ReportGenerator, LegendaryReportGenerator
+from app.services.container import ServiceContainer
+from app.services.estated_client import EstatedClient, EstatedUnavailableError
+from app.services.job_queue import ReportJobQueue, JobQueueFullError
+from app.services.metrics import PROMETHEUS_CONTENT_TYPE, STAGE_SECONDS, MetricsMiddleware, render_metrics
+from app.services.report_assembly import report_json
+from app.services.tracing import TRACE_ID_HEADER, TraceIdLogFilter, TracingMiddleware
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging; every line carries the trace id of the request that logged it
+logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(name)s:[%(trace_id)s] %(message)s")
+for handler in logging.getLogger().handlers:
+    handler.addFilter(TraceIdLogFilter())
 logger = logging.getLogger(__name__)
 
-# Global report generator instances
-report_generator = None
-legendary_generator = None
+# Global service container (shared clients, caches and generators)
+services = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
-    global report_generator, legendary_generator
+    global services
     
     # Startup
     logger.info("Starting AlyProp AI Property Report Service...")
-    report_generator = ReportGenerator()
-    legendary_generator = LegendaryReportGenerator()
+    
+    # One Estated client, Anthropic client and cache set shared by every endpoint
+    services = ServiceContainer()
+    await services.start()
     
     # Validate configuration
     if not settings.validate_api_keys():
@@ -40,6 +53,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down service...")
+    await services.close()
+    services = None
 
 
 # Initialize FastAPI app
@@ -57,21 +72,56 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[TRACE_ID_HEADER],
 )
 
+# Request counts, latency and in-flight gauge for /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Outermost, so the trace id covers everything else the request logs
+app.add_middleware(TracingMiddleware)
+
 
 def get_report_generator() -> ReportGenerator:
     """Dependency to get legacy report generator instance"""
-    if report_generator is None:
+    if services is None:
         raise HTTPException(status_code=503, detail="Service not initialized")
-    return report_generator
+    return services.report_generator
 
 
 def get_legendary_generator() -> LegendaryReportGenerator:
     """Dependency to get legendary report generator instance"""
-    if legendary_generator is None:
+    if services is None:
+        raise HTTPException(status_code=503, detail="Service not initialized")
+    return services.legendary_generator
+
+
+def get_estated_client() -> EstatedClient:
+    """Dependency to get the shared Estated client instance"""
+    if services is None:
         raise HTTPException(status_code=503, detail="Service not initialized")
-    return legendary_generator
+    return services.estated_client
+
+
+def get_job_queue() -> ReportJobQueue:
+    """Dependency to get the report job queue instance"""
+    if services is None:
+        raise HTTPException(status_code=503, detail="Service not initialized")
+    return services.job_queue
+
+
+def _job_status(job: Dict[str, Any]) -> ReportJobStatus:
+    """Convert a stored job record into its API representation"""
+    return ReportJobStatus(
+        job_id=job["job_id"],
+        status=job["status"],
+        address=job["address"],
+        priority=job["priority"],
+        created_at=datetime.fromtimestamp(job["created_at"]),
+        updated_at=datetime.fromtimestamp(job["updated_at"]),
+        error=job["error"],
+        report=job["result"]
+    )
 
 
 @app.get("/")
@@ -96,7 +146,13 @@ async def root():
         "endpoints": {
             "legacy_report": "POST /property/report",
             "legendary_report": "POST /property/legendary",
+            "legendary_stream": "POST /property/legendary/stream",
+            "legendary_batch": "POST /property/legendary/batch",
+            "property_prewarm": "POST /property/prewarm",
+            "legendary_job_submit": "POST /property/legendary/jobs",
+            "legendary_job_status": "GET /property/legendary/jobs/{job_id}",
             "health_check": "GET /health",
+            "metrics": "GET /metrics",
             "sample_structure": "GET /property/sample",
             "legendary_sample": "GET /property/legendary/sample",
             "api_docs": "GET /docs"
@@ -108,7 +164,7 @@ async def root():
 async def generate_property_report(
     request: PropertyReportRequest,
     generator: ReportGenerator = Depends(get_report_generator)
-) -> PropertyReport:
+) -> Response:
     """
     Generate a Legacy $5 AI Property Report (8 Sections)
     
@@ -122,6 +178,10 @@ async def generate_property_report(
     - 📊 AI Investor Snapshot Summary (AI)
     - 🔒 Bonus Inferred Analytics (AI)
     
+    Set `lite` to skip the AI analysis: the report is built from Estated data and
+    deterministic rules (`report_mode: "lite"`) and returns in milliseconds once
+    the property data is cached. Request again without `lite` to upgrade.
+    
     **Cost:** $5.00 per report
     """
     try:
@@ -130,12 +190,19 @@ async def generate_property_report(
         # Generate the complete legacy report
         report = await generator.generate_report(
             request.address, 
-            legendary_format=request.legendary_format if hasattr(request, 'legendary_format') else False
+            legendary_format=request.legendary_format if hasattr(request, 'legendary_format') else False,
+            lite=request.lite
         )
         
         logger.info(f"Legacy report {report.report_id} generated successfully")
-        return report
+        # Already validated during assembly; skip response_model re-validation
+        return Response(content=report_json(report), media_type="application/json")
         
+    except EstatedUnavailableError as e:
+        # Property data provider down or failing; worth retrying later
+        logger.warning(f"Estated unavailable for {request.address}: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
+    
     except ValueError as e:
         # Property not found or invalid input
         logger.warning(f"Invalid request for {request.address}: {str(e)}")
@@ -154,7 +221,7 @@ async def generate_property_report(
 async def generate_legendary_property_report(
     request: LegendaryReportRequest,
     generator: LegendaryReportGenerator = Depends(get_legendary_generator)
-) -> LegendaryPropertyReport:
+) -> Response:
     """
     Generate a Legendary $5 AI Property Report (10 Sections + Bonus Extras)
     
@@ -178,17 +245,27 @@ async def generate_legendary_property_report(
     - 📎 Shareable 1-pager summary (Markdown/HTML)
     - 📎 Custom-named report file
     
+    Set `lite` to skip the AI analysis: every section is filled from Estated data
+    and deterministic rules (`report_mode: "lite"`), with narrative-only fields
+    marked as not assessed. Request again without `lite` to upgrade.
+    
     **Cost:** $5.00 per report
     """
     try:
         logger.info(f"Generating legendary report for address: {request.address}")
         
         # Generate the complete legendary report
-        report = await generator.generate_legendary_report(request.address)
+        report = await generator.generate_legendary_report(request.address, lite=request.lite)
         
         logger.info(f"Legendary report {report.report_id} generated successfully")
-        return report
+        # Already validated during assembly; skip response_model re-validation
+        return Response(content=report_json(report), media_type="application/json")
         
+    except EstatedUnavailableError as e:
+        # Property data provider down or failing; worth retrying later
+        logger.warning(f"Estated unavailable for {request.address}: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
+    
     except ValueError as e:
         # Property not found or invalid input
         logger.warning(f"Invalid legendary request for {request.address}: {str(e)}")
@@ -203,6 +280,169 @@ async def generate_legendary_property_report(
         )
 
 
+@app.post("/property/legendary/stream")
+async def stream_legendary_property_report(
+    request: LegendaryReportRequest,
+    generator: LegendaryReportGenerator = Depends(get_legendary_generator)
+) -> StreamingResponse:
+    """
+    Stream a Legendary Report via Server-Sent Events
+    
+    Sends the report as it is written instead of waiting for the full analysis:
+    - `property`: Estated-backed fields, sent immediately
+    - `section`: one event per AI section as soon as Claude completes it
+    - `report`: the complete `LegendaryPropertyReport`
+    - `error`: sent if generation fails mid-stream
+    
+    With `lite`, no AI sections are sent: `report` follows `property` directly.
+    
+    **Cost:** $5.00 per report
+    """
+    try:
+        logger.info(f"Streaming legendary report for address: {request.address}")
+        property_data = await generator.fetch_property_data(request.address)
+        
+    except EstatedUnavailableError as e:
+        logger.warning(f"Estated unavailable for {request.address}: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    except ValueError as e:
+        logger.warning(f"Invalid legendary stream request for {request.address}: {str(e)}")
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    except Exception as e:
+        logger.error(f"Error starting legendary stream for {request.address}: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error occurred while generating legendary report"
+        )
+    
+    async def sse_events():
+        try:
+            async for event, payload in generator.stream_legendary_report(request.address, property_data, lite=request.lite):
+                yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+        except Exception as e:
+            logger.error(f"Error streaming legendary report for {request.address}: {str(e)}")
+            error = {"error": "Internal server error occurred while generating legendary report"}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+    
+    return StreamingResponse(
+        sse_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/property/legendary/batch")
+async def generate_legendary_property_reports_batch(
+    request: LegendaryBatchRequest,
+    generator: LegendaryReportGenerator = Depends(get_legendary_generator)
+) -> StreamingResponse:
+    """
+    Generate Legendary Reports for a List of Addresses
+    
+    Streams one NDJSON line per address as soon as its report completes (completion
+    order, not request order). Each line carries the request `index`, the `address`,
+    a `status` of `ok` or `error`, and either the full `report` or an `error` message.
+    
+    Estated lookups and Claude analyses run with separate concurrency limits
+    (`BATCH_ESTATED_CONCURRENCY`, `BATCH_AI_CONCURRENCY`).
+    
+    **Cost:** $5.00 per successful report
+    """
+    if len(request.addresses) > settings.BATCH_MAX_ADDRESSES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: maximum {settings.BATCH_MAX_ADDRESSES} addresses per request"
+        )
+    
+    logger.info(f"Generating legendary batch for {len(request.addresses)} addresses")
+    
+    async def ndjson_lines():
+        async for result in generator.generate_legendary_batch(request.addresses):
+            with STAGE_SECONDS.time("serialization"):
+                line = to_json(result) + b"\n"
+            yield line
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@app.post("/property/prewarm")
+async def prewarm_property_data(
+    request: PropertyPrewarmRequest,
+    estated_client: EstatedClient = Depends(get_estated_client)
+) -> StreamingResponse:
+    """
+    Pre-warm the Property Data Cache for a List of Addresses
+    
+    Looks up each address in Estated (no AI analysis) so later reports skip the
+    Estated round trip. Duplicate addresses are fetched once and cached entries are
+    not refetched. Streams one NDJSON line per address as its lookup completes, with
+    the `address` and a `status` of `found`, `not_found` or `error`.
+    
+    Lookups run at most `BATCH_ESTATED_CONCURRENCY` at a time.
+    
+    **Cost:** Free
+    """
+    if len(request.addresses) > settings.BATCH_MAX_ADDRESSES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: maximum {settings.BATCH_MAX_ADDRESSES} addresses per request"
+        )
+    
+    logger.info(f"Pre-warming property data for {len(request.addresses)} addresses")
+    
+    async def ndjson_lines():
+        async for address, property_data, error in estated_client.get_property_data_bulk(request.addresses):
+            if error is not None:
+                result = {"address": address, "status": "error", "error": str(error)}
+            else:
+                result = {"address": address, "status": "found" if property_data else "not_found"}
+            yield json.dumps(result) + "\n"
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@app.post("/property/legendary/jobs", response_model=ReportJobStatus, status_code=202)
+async def submit_legendary_report_job(
+    request: LegendaryJobRequest,
+    queue: ReportJobQueue = Depends(get_job_queue)
+) -> ReportJobStatus:
+    """
+    Queue a Legendary Report for Background Generation
+    
+    Returns a job id immediately. Poll `GET /property/legendary/jobs/{job_id}` for
+    status; the finished `LegendaryPropertyReport` is included once completed.
+    Lower `priority` values run first. Returns 429 when the queue is full.
+    
+    **Cost:** $5.00 per report
+    """
+    try:
+        job = await queue.submit(request.address, request.priority)
+        logger.info(f"Queued legendary report job {job['job_id']} for address: {request.address}")
+        return _job_status(job)
+        
+    except JobQueueFullError as e:
+        logger.warning(f"Rejected legendary job for {request.address}: {str(e)}")
+        raise HTTPException(status_code=429, detail=str(e))
+
+
+@app.get("/property/legendary/jobs/{job_id}", response_model=ReportJobStatus)
+async def get_legendary_report_job(
+    job_id: str,
+    queue: ReportJobQueue = Depends(get_job_queue)
+) -> ReportJobStatus:
+    """
+    Get Legendary Report Job Status
+    
+    Returns the job status and, when completed, the full legendary report.
+    """
+    job = await queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Report job not found: {job_id}")
+    return _job_status(job)
+
+
 @app.get("/health")
 async def health_check(generator: ReportGenerator = Depends(get_report_generator)):
     """
@@ -212,6 +452,8 @@ async def health_check(generator: ReportGenerator = Depends(get_report_generator
     """
     try:
         health_status = await generator.health_check()
+        if services is not None:
+            health_status["job_queue"] = services.job_queue.stats()
         
         if health_status.get("status") == "healthy":
             return health_status
@@ -233,6 +475,20 @@ async def health_check(generator: ReportGenerator = Depends(get_report_generator
         )
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """
+    Prometheus metrics in the text exposition format
+    
+    Per-stage latency histograms (`alyprop_stage_duration_seconds`: estated_fetch,
+    prompt_build, claude_call, parse, assembly, serialization), HTTP request,
+    error and in-flight metrics, AI fallbacks, cache hits and misses, and
+    Anthropic token counters.
+    """
+    families = services.metric_families() if services is not None else []
+    return Response(content=render_metrics(families), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @app.get("/property/sample")
 async def get_sample_report_structure(generator: ReportGenerator = Depends(get_report_generator)):
     """
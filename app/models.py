@@ -5,6 +5,17 @@ from enum import Enum
 import uuid
 
 
+class ReportMode(str, Enum):
+    FULL = "full"  # Estated data + Claude analysis
+    LITE = "lite"  # Estated data + deterministic rules, no AI
+
+
+class AnalysisSource(str, Enum):
+    AI = "ai"  # Claude analysis generated for this request
+    CACHE = "cache"  # Earlier Claude analysis from the analysis cache (see analysis_age_seconds)
+    RULES = "rules"  # Deterministic rule-based insights (lite reports, or Claude slow/unavailable)
+
+
 class PropertyType(str, Enum):
     SINGLE_FAMILY = "Single Family Residential"
     DUPLEX = "Duplex"
@@ -133,15 +144,15 @@ class RiskFlagsRegulatoryAlerts(BaseModel):
 
 class FinancialBreakdownForecasting(BaseModel):
     """Section 8: 💸 Financial Breakdown + Forecasting"""
-    estimated_rental_income: Optional[float] = Field(None, description="AI estimated rental income (ZIP-based avg)")
-    estimated_cap_rate: Optional[float] = Field(None, description="AI estimated CAP rate")
+    estimated_rental_income: Optional[float] = Field(None, description="Estimated monthly rental income (rent-to-value assumption)")
+    estimated_cap_rate: Optional[float] = Field(None, description="CAP rate (%) from NOI over AVM")
     rehab_cost_estimate: str = Field(..., description="AI rehab cost bracket estimate")
     total_project_budget: str = Field(..., description="AI total project budget estimate (if flipped)")
     exit_price_scenarios: str = Field(..., description="AI exit price scenarios (pessimistic/realistic/aggressive)")
     profit_potential_per_strategy: str = Field(..., description="AI profit potential for each strategy")
-    monthly_carrying_costs: str = Field(..., description="AI monthly tax + insurance + maintenance")
-    noi_estimate: Optional[float] = Field(None, description="AI NOI (net operating income) estimate")
-    cash_on_cash_return: str = Field(..., description="AI cash-on-cash return (for rental)")
+    monthly_carrying_costs: str = Field(..., description="Monthly tax + insurance + maintenance")
+    noi_estimate: Optional[float] = Field(None, description="Annual NOI (net operating income) estimate")
+    cash_on_cash_return: str = Field(..., description="Cash-on-cash return (for a financed rental)")
 
 
 class MarketContext(BaseModel):
@@ -178,6 +189,9 @@ class LegendaryPropertyReport(BaseModel):
     report_id: str = Field(..., description="Unique report identifier")
     generated_at: datetime = Field(..., description="Report generation timestamp")
     address_analyzed: str = Field(..., description="Property address that was analyzed")
+    report_mode: ReportMode = Field(default=ReportMode.FULL, description="full (AI analysis) or lite (Estated data and rules only)")
+    analysis_source: AnalysisSource = Field(default=AnalysisSource.AI, description="Where the AI sections came from: ai, cache or rules")
+    analysis_age_seconds: Optional[float] = Field(None, description="Age of a cached analysis; set when analysis_source is cache")
     
     # 10 Main Sections
     property_identity: PropertyIdentityPhysical
@@ -279,6 +293,7 @@ class PropertyReport(BaseModel):
     """Legacy Property Report (8 sections)"""
     report_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     generated_at: datetime = Field(default_factory=datetime.now)
+    report_mode: ReportMode = Field(default=ReportMode.FULL, description="full (AI analysis) or lite (Estated data and rules only)")
     property_overview: PropertyOverview
     ownership_sale_history: OwnershipSaleHistory
     equity_position: EquityPosition
@@ -293,11 +308,41 @@ class PropertyReportRequest(BaseModel):
     """Request model for property report generation"""
     address: str = Field(..., description="Property address to analyze")
     legendary_format: bool = Field(default=False, description="Generate 10-section legendary format")
+    lite: bool = Field(default=False, description="Skip AI analysis and return Estated data with rule-based insights")
 
 
 class LegendaryReportRequest(BaseModel):
     """Request model for legendary property report generation"""
     address: str = Field(..., description="Property address to analyze")
+    lite: bool = Field(default=False, description="Skip AI analysis and return Estated data with rule-based insights")
+
+
+class LegendaryBatchRequest(BaseModel):
+    """Request model for batch legendary report generation"""
+    addresses: List[str] = Field(..., min_length=1, description="Property addresses to analyze")
+
+
+class PropertyPrewarmRequest(BaseModel):
+    """Request model for bulk Estated cache pre-warming"""
+    addresses: List[str] = Field(..., min_length=1, description="Property addresses to look up")
+
+
+class LegendaryJobRequest(BaseModel):
+    """Request model for queued legendary report generation"""
+    address: str = Field(..., description="Property address to analyze")
+    priority: int = Field(default=5, ge=0, le=9, description="Job priority (0 = highest, 9 = lowest)")
+
+
+class ReportJobStatus(BaseModel):
+    """Status of a queued legendary report job"""
+    job_id: str = Field(..., description="Unique job identifier")
+    status: str = Field(..., description="Job status (queued, running, completed, failed)")
+    address: str = Field(..., description="Property address being analyzed")
+    priority: int = Field(..., description="Job priority (0 = highest, 9 = lowest)")
+    created_at: datetime = Field(..., description="Job submission timestamp")
+    updated_at: datetime = Field(..., description="Last status change timestamp")
+    error: Optional[str] = Field(None, description="Failure reason if the job failed")
+    report: Optional[LegendaryPropertyReport] = Field(None, description="Finished report when completed")
 
 
 class ErrorResponse(BaseModel):
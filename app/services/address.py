@@ -0,0 +1,218 @@
+import re
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+from app.config import settings
+
+
+# USPS Publication 28 directionals (C1) and common street suffixes (C1)
+DIRECTIONALS = {
+    "NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+    "NORTHEAST": "NE", "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW",
+}
+
+STREET_SUFFIXES = {
+    "ALLEY": "ALY", "ALLEE": "ALY", "ALLY": "ALY",
+    "ANNEX": "ANX", "ARCADE": "ARC",
+    "AVENUE": "AVE", "AV": "AVE", "AVEN": "AVE", "AVENU": "AVE", "AVN": "AVE", "AVNUE": "AVE",
+    "BAYOU": "BYU", "BEACH": "BCH", "BEND": "BND", "BLUFF": "BLF",
+    "BOULEVARD": "BLVD", "BOUL": "BLVD", "BOULV": "BLVD",
+    "BRANCH": "BR", "BRIDGE": "BRG", "BROOK": "BRK", "BYPASS": "BYP",
+    "CAMP": "CP", "CANYON": "CYN", "CAPE": "CPE", "CAUSEWAY": "CSWY",
+    "CENTER": "CTR", "CENTRE": "CTR", "CENTR": "CTR", "CIRCLE": "CIR", "CIRCL": "CIR",
+    "CLIFF": "CLF", "CLUB": "CLB", "COMMON": "CMN", "CORNER": "COR", "COURSE": "CRSE",
+    "COURT": "CT", "COVE": "CV", "CREEK": "CRK", "CRESCENT": "CRES", "CREST": "CRST",
+    "CROSSING": "XING", "CURVE": "CURV", "DALE": "DL", "DAM": "DM",
+    "DIVIDE": "DV", "DRIVE": "DR", "DRIV": "DR", "DRV": "DR",
+    "ESTATE": "EST", "ESTATES": "ESTS", "EXPRESSWAY": "EXPY", "EXTENSION": "EXT",
+    "FALLS": "FLS", "FERRY": "FRY", "FIELD": "FLD", "FIELDS": "FLDS", "FLAT": "FLT",
+    "FOREST": "FRST", "FORGE": "FRG", "FORK": "FRK", "FORT": "FT", "FREEWAY": "FWY",
+    "GARDEN": "GDN", "GARDENS": "GDNS", "GATEWAY": "GTWY", "GLEN": "GLN", "GREEN": "GRN",
+    "GROVE": "GRV", "HARBOR": "HBR", "HAVEN": "HVN", "HEIGHTS": "HTS",
+    "HIGHWAY": "HWY", "HIWAY": "HWY", "HILL": "HL", "HILLS": "HLS", "HOLLOW": "HOLW",
+    "ISLAND": "IS", "JUNCTION": "JCT", "KNOLL": "KNL", "LAKE": "LK", "LAKES": "LKS",
+    "LANDING": "LNDG", "LANE": "LN", "LIGHT": "LGT", "LOOP": "LOOP", "MANOR": "MNR",
+    "MEADOW": "MDW", "MEADOWS": "MDWS", "MILL": "ML", "MISSION": "MSN",
+    "MOTORWAY": "MTWY", "MOUNT": "MT", "MOUNTAIN": "MTN", "ORCHARD": "ORCH",
+    "OVERPASS": "OPAS", "PARKWAY": "PKWY", "PARKWY": "PKWY", "PKY": "PKWY",
+    "PASSAGE": "PSGE", "PIKE": "PIKE", "PINE": "PNE", "PINES": "PNES", "PLACE": "PL",
+    "PLAIN": "PLN", "PLAINS": "PLNS", "PLAZA": "PLZ", "POINT": "PT", "POINTS": "PTS",
+    "PORT": "PRT", "PRAIRIE": "PR", "RANCH": "RNCH", "RIDGE": "RDG", "RIVER": "RIV",
+    "ROAD": "RD", "ROUTE": "RTE", "SHORE": "SHR", "SHORES": "SHRS", "SKYWAY": "SKWY",
+    "SPRING": "SPG", "SPRINGS": "SPGS", "SQUARE": "SQ", "STATION": "STA",
+    "STREET": "ST", "STR": "ST", "STRT": "ST", "SUMMIT": "SMT", "TERRACE": "TER",
+    "TRACE": "TRCE", "TRAIL": "TRL", "TRAILS": "TRL", "TUNNEL": "TUNL",
+    "TURNPIKE": "TPKE", "UNDERPASS": "UPAS", "UNION": "UN", "VALLEY": "VLY",
+    "VIADUCT": "VIA", "VIEW": "VW", "VILLAGE": "VLG", "VILLE": "VL", "VISTA": "VIS",
+    "WALK": "WALK", "WAY": "WAY", "WELLS": "WLS",
+}
+
+# USPS secondary unit designators (C2); "#" is used when the designator is unknown
+UNIT_DESIGNATORS = {
+    "APARTMENT": "APT", "APT": "APT", "BASEMENT": "BSMT", "BSMT": "BSMT",
+    "BUILDING": "BLDG", "BLDG": "BLDG", "DEPARTMENT": "DEPT", "DEPT": "DEPT",
+    "FLOOR": "FL", "FL": "FL", "HANGAR": "HNGR", "HNGR": "HNGR", "LOT": "LOT",
+    "OFFICE": "OFC", "OFC": "OFC", "PIER": "PIER", "ROOM": "RM", "RM": "RM",
+    "SLIP": "SLIP", "SPACE": "SPC", "SPC": "SPC", "STOP": "STOP",
+    "SUITE": "STE", "STE": "STE", "TRAILER": "TRLR", "TRLR": "TRLR", "UNIT": "UNIT", "#": "#",
+}
+
+_STREET_SUFFIX_ABBREVIATIONS = set(STREET_SUFFIXES.values())
+_DIRECTIONAL_ABBREVIATIONS = set(DIRECTIONALS.values())
+_COUNTRY_TOKENS = {"USA", "US", "UNITED STATES", "UNITED STATES OF AMERICA"}
+
+_TOKEN_PATTERN = re.compile(r"#|[^\s#]+")
+_STRIP_PATTERN = re.compile(r"[.']")
+_ZIP_PATTERN = re.compile(r"^(\d{5})(?:-?\d{4})?$")
+
+
+class NormalizedAddress(NamedTuple):
+    """
+    USPS-style parts of a free-form US address
+
+    Attributes:
+        street: Primary street line, e.g. "123 N MAIN ST"
+        unit: Secondary unit identifier without its designator, e.g. "4B"
+        locality: Everything after the street line except the ZIP, e.g. "SPRINGFIELD IL"
+        zip_code: Five-digit ZIP (any +4 extension is dropped)
+    """
+    street: str
+    unit: Optional[str]
+    locality: str
+    zip_code: Optional[str]
+
+    @property
+    def key(self) -> str:
+        """Canonical key shared by every spelling of the same address"""
+        parts = [self.street]
+        if self.unit:
+            parts.append(f"#{self.unit}")
+        if self.locality:
+            parts.append(self.locality)
+        if self.zip_code:
+            parts.append(self.zip_code)
+        return " ".join(parts)
+
+
+def _is_suffix(token: str) -> bool:
+    return token in STREET_SUFFIXES or token in _STREET_SUFFIX_ABBREVIATIONS
+
+
+def _is_directional(token: str) -> bool:
+    return token in DIRECTIONALS or token in _DIRECTIONAL_ABBREVIATIONS
+
+
+def _take_unit(tokens: List[str]) -> Tuple[List[str], Optional[str]]:
+    """Split a leading unit ("APT 4", "# 4", "STE # 4") off a token list"""
+    if len(tokens) < 2 or tokens[0] not in UNIT_DESIGNATORS:
+        return tokens, None
+    rest = tokens[1:]
+    if rest[0] == "#" and len(rest) > 1:
+        rest = rest[1:]
+    return rest[1:], rest[0]
+
+
+def _street_length(tokens: List[str], whole_segment: bool) -> int:
+    """Number of leading tokens that form the street line"""
+    # A unit designator ends the street ("123 MAIN ST APT 4")
+    for i in range(2, len(tokens) - 1):
+        if tokens[i] in UNIT_DESIGNATORS:
+            return i
+    if whole_segment:
+        return len(tokens)
+
+    # Without commas, the street ends at its suffix ("HILL TER", not "HILL")
+    # plus any post-directional ("MAIN ST NW")
+    for i in range(2, len(tokens)):
+        if _is_suffix(tokens[i]) and not (i + 1 < len(tokens) and _is_suffix(tokens[i + 1])):
+            if i + 1 < len(tokens) and _is_directional(tokens[i + 1]):
+                return i + 2
+            return i + 1
+    return len(tokens)
+
+
+def _standardize_street(tokens: List[str]) -> List[str]:
+    """Abbreviate the pre-directional, suffix and post-directional of a street line"""
+    tokens = list(tokens)
+    end = len(tokens)
+    if end > 3 and _is_directional(tokens[-1]) and _is_suffix(tokens[-2]):
+        tokens[-1] = DIRECTIONALS.get(tokens[-1], tokens[-1])
+        end -= 1
+    if end > 2 and _is_suffix(tokens[end - 1]):
+        tokens[end - 1] = STREET_SUFFIXES.get(tokens[end - 1], tokens[end - 1])
+        end -= 1
+    # "123 NORTH ST" keeps NORTH as the street name
+    if end > 2 and _is_directional(tokens[1]):
+        tokens[1] = DIRECTIONALS.get(tokens[1], tokens[1])
+    return tokens
+
+
+@lru_cache(maxsize=settings.ADDRESS_NORMALIZATION_CACHE_SIZE)
+def normalize_address(address: str) -> NormalizedAddress:
+    """
+    Parse and standardize a free-form US address
+
+    Folds case, punctuation and whitespace, abbreviates the street's directionals
+    and suffix per USPS Publication 28, pulls out the secondary unit, drops a
+    trailing country and reduces ZIP+4 to the five-digit ZIP. Results are
+    memoized in a bounded LRU cache (`ADDRESS_NORMALIZATION_CACHE_SIZE`).
+
+    Args:
+        address: Address as typed by a user or returned by Estated
+
+    Returns:
+        NormalizedAddress whose `key` is equal for equivalent spellings
+    """
+    segments = []
+    for segment in _STRIP_PATTERN.sub("", address.upper()).split(","):
+        tokens = _TOKEN_PATTERN.findall(segment)
+        if tokens:
+            segments.append(tokens)
+
+    while segments and " ".join(segments[-1]) in _COUNTRY_TOKENS:
+        segments.pop()
+    if segments and segments[-1][-1] in _COUNTRY_TOKENS:
+        segments[-1] = segments[-1][:-1]
+
+    zip_code = None
+    if segments and segments[-1]:
+        match = _ZIP_PATTERN.match(segments[-1][-1])
+        if match and (len(segments) > 1 or len(segments[-1]) > 1):
+            zip_code = match.group(1)
+            segments[-1] = segments[-1][:-1]
+
+    first = segments[0] if segments else []
+    street_length = _street_length(first, whole_segment=len(segments) > 1)
+    rest = first[street_length:] + [token for segment in segments[1:] for token in segment]
+
+    # The unit follows the street line, in the same segment or its own
+    locality_tokens, unit = _take_unit(rest)
+
+    return NormalizedAddress(
+        street=" ".join(_standardize_street(first[:street_length])),
+        unit=unit,
+        locality=" ".join(locality_tokens),
+        zip_code=zip_code
+    )
+
+
+def canonical_address_key(address: str) -> str:
+    """Canonical key used for caching, request coalescing and deduplication"""
+    return normalize_address(address).key
+
+
+def is_same_address(first: str, second: str) -> bool:
+    """
+    Whether two addresses refer to the same delivery point
+
+    Compares the street line and unit. The ZIP is compared only when both
+    addresses carry one, and the city/state text is ignored because owner
+    mailing addresses often use a postal city that differs from the parcel's.
+    """
+    if not first or not second:
+        return False
+
+    a, b = normalize_address(first), normalize_address(second)
+    if not a.street or a.street != b.street or a.unit != b.unit:
+        return False
+    return a.zip_code is None or b.zip_code is None or a.zip_code == b.zip_code
@@ -1,42 +1,41 @@
 import anthropic
-from typing import Dict, Any, Optional, List
+import asyncio
+import re
+import time
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator, Callable
 import json
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from app.config import settings
+from app.models import AnalysisSource
+from app.services.address import canonical_address_key
+from app.services.financials import compute_financial_metrics
+from app.services.metrics import AI_DEADLINE_EXCEEDED, AI_FALLBACKS, STAGE_SECONDS
+from app.services.analysis_cache import AnalysisCache, analysis_fingerprint
+from app.services.prompt_cache import cached_system, prompt_cache_usage
+from app.services.rate_limiter import AnthropicGovernor
+from app.services.rule_based import (
+    RuleBasedAnalyzer, classify_property_age, computed_section_fields, is_absentee_owner, ownership_duration_years
+)
+from app.services.response_parser import SectionIndex, ResponseText
+from app.services.tracing import span
+from app.services.structured_output import (
+    LEGENDARY_ANALYSIS_TOOL_NAME,
+    legendary_analysis_tool,
+    parse_legendary_tool_output
+)
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the legendary prompt, parser or computed fields change so cached analyses are not reused
+LEGENDARY_PROMPT_VERSION = "5"
 
-class LegendaryAIAnalyzer:
-    """Enhanced Claude AI analyzer for comprehensive 10-section legendary property reports"""
-    
-    def __init__(self):
-        self.client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
-    
-    async def analyze_property_legendary(self, property_data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Generate comprehensive 10-section AI analysis with bonus extras
-        
-        Args:
-            property_data: Raw property data from Estated
-            
-        Returns:
-            Dictionary containing all AI-generated insights for legendary format
-        """
-        try:
-            # Create the comprehensive legendary analysis prompt
-            analysis_prompt = self._create_comprehensive_legendary_prompt(property_data)
-            
-            # Get AI analysis with enhanced context for all 10 sections
-            response = await self.client.messages.create(
-                model="claude-3-sonnet-20241022",
-                max_tokens=8000,  # Increased for comprehensive analysis
-                system="""You are a seasoned real estate investment mentor with 25+ years of experience across residential, commercial, and alternative investment strategies. You analyze properties with the depth of a top-tier real estate investment firm, providing strategic insights that professional investors pay thousands for.
+LEGENDARY_SYSTEM_PROMPT = """You are a seasoned real estate investment mentor with 25+ years of experience across residential, commercial, and alternative investment strategies. You analyze properties with the depth of a top-tier real estate investment firm, providing strategic insights that professional investors pay thousands for.
 
 Your legendary analysis should:
 - Cover ALL 10 sections comprehensively with specific, actionable insights
-- Provide quantitative estimates when possible (rental income, rehab costs, ROI)
+- Build on the computed financials in the property data (rent, NOI, CAP rate, cash-on-cash, carrying costs) rather than re-estimating them; estimate rehab costs and exit prices yourself
 - Flag both obvious and subtle risks that amateur investors miss
 - Include specific cold outreach scripts tailored to the property/owner profile
 - Assess market context and timing factors
@@ -44,74 +43,41 @@ Your legendary analysis should:
 - Include regulatory and natural disaster risk assessments
 - Generate ready-to-use marketing copy and pitch materials
 
-Write as a trusted advisor who sees opportunities and risks others overlook. Be specific, tactical, and confidence-inspiring while maintaining intellectual honesty about uncertainties.""",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": analysis_prompt
-                    }
-                ]
-            )
-            
-            # Parse the comprehensive response
-            ai_content = response.content[0].text if response.content else ""
-            
-            # Extract structured insights for all 10 sections + bonus extras
-            return self._parse_legendary_analysis(ai_content, property_data)
-            
-        except Exception as e:
-            logger.error(f"Legendary AI analysis failed: {str(e)}")
-            return self._generate_fallback_legendary_analysis(property_data)
-    
-    def _create_comprehensive_legendary_prompt(self, property_data: Dict[str, Any]) -> str:
-        """Create comprehensive analysis prompt for all 10 sections"""
-        
-        # Extract key property details for context
-        address = property_data.get('address', {})
-        property_details = property_data.get('property', {})
-        owner_info = property_data.get('owner', {})
-        valuation = property_data.get('valuation', {})
-        
-        prompt = f"""
-# LEGENDARY PROPERTY ANALYSIS REQUEST
-
-Analyze this property comprehensively across ALL 10 sections below. Provide specific, actionable insights for each section.
+Write as a trusted advisor who sees opportunities and risks others overlook. Be specific, tactical, and confidence-inspiring while maintaining intellectual honesty about uncertainties."""
 
-## PROPERTY DATA:
-- **Address**: {address.get('formatted_address', 'N/A')}
-- **Property Type**: {property_details.get('property_type', 'N/A')}
-- **Year Built**: {property_details.get('year_built', 'N/A')}
-- **Square Footage**: {property_details.get('sqft', 'N/A')} sq ft
-- **Lot Size**: {property_details.get('lot_size', 'N/A')}
-- **Bedrooms**: {property_details.get('bedrooms', 'N/A')}
-- **Bathrooms**: {property_details.get('bathrooms', 'N/A')}
-- **AVM Value**: ${valuation.get('avm', 'N/A')}
-- **Last Sale**: ${property_details.get('last_sale_price', 'N/A')} on {property_details.get('last_sale_date', 'N/A')}
-- **Owner**: {owner_info.get('name', 'N/A')}
-- **Owner Address**: {owner_info.get('mailing_address', 'N/A')}
-- **ZIP Code**: {address.get('zip', 'N/A')}
-- **County**: {address.get('county', 'N/A')}
+# Legendary insight sections in the order the prompt asks Claude to write them
+LEGENDARY_SECTION_KEYS = [
+    "property_identity",
+    "valuation_equity",
+    "deal_strategy",
+    "ownership_profile",
+    "investor_action",
+    "neighborhood_infrastructure",
+    "risk_flags",
+    "financial_breakdown",
+    "market_context",
+    "executive_summary",
+    "bonus_extras"
+]
 
-## REQUIRED ANALYSIS SECTIONS:
-
-### 1. 🧱 PROPERTY IDENTITY & PHYSICAL OVERVIEW
+# Instructions for each section, keyed as in LEGENDARY_SECTION_KEYS
+LEGENDARY_SECTION_PROMPTS = {
+    "property_identity": """### 1. 🧱 PROPERTY IDENTITY & PHYSICAL OVERVIEW
 Provide:
 - Structure condition assessment (inferred from age, type, area)
 - Property age classification (new/mature/vintage/antique)
 - Exterior material/style inference
 - Zoning compatibility analysis
-- Human-readable property summary
-
-### 2. 🏦 VALUATION & EQUITY INSIGHTS
+- Human-readable property summary""",
+    "valuation_equity": """### 2. 🏦 VALUATION & EQUITY INSIGHTS
 Calculate and analyze:
 - Price per sq ft (current vs historical estimate)
 - Estimated equity position
 - Assessed undervaluation risk
 - Tax vs AVM discrepancy analysis
 - Forecasted appreciation (ZIP/city level)
-- Price trend vs area averages
-
-### 3. 💡 DEAL TYPE & STRATEGY RECOMMENDATIONS
+- Price trend vs area averages""",
+    "deal_strategy": """### 3. 💡 DEAL TYPE & STRATEGY RECOMMENDATIONS
 Score and recommend:
 - Flip potential (A-F with reasoning)
 - BRRRR potential assessment
@@ -122,9 +88,8 @@ Score and recommend:
 - TOP strategy recommendation with logic
 - Suggested purchase price based on strategy
 - Holding cost estimates
-- ROI projections
-
-### 4. 🧠 OWNERSHIP PROFILE & MOTIVATION TO SELL
+- ROI projections""",
+    "ownership_profile": """### 4. 🧠 OWNERSHIP PROFILE & MOTIVATION TO SELL
 Analyze:
 - Absentee owner detection and implications
 - Time held calculation and significance
@@ -132,17 +97,15 @@ Analyze:
 - Long-term hold score
 - Owner type (investor vs resident)
 - Motivation to sell score (1-10)
-- Top reason they might sell
-
-### 5. 💬 INVESTOR ACTION SECTION
+- Top reason they might sell""",
+    "investor_action": """### 5. 💬 INVESTOR ACTION SECTION
 Provide:
 - Recommended approach (mail/text/door knock)
 - Specific cold outreach script for this property/owner
 - Suggested offer range with logic
 - Counter-offer preparation
-- Contact urgency assessment
-
-### 6. 🌍 NEIGHBORHOOD, SCHOOL & INFRASTRUCTURE
+- Contact urgency assessment""",
+    "neighborhood_infrastructure": """### 6. 🌍 NEIGHBORHOOD, SCHOOL & INFRASTRUCTURE
 Assess:
 - Neighborhood type (urban/suburban/rural)
 - School zone quality (inferred from area)
@@ -151,9 +114,8 @@ Assess:
 - Distance to commercial areas
 - Road type significance
 - Parking availability
-- Development trends in area
-
-### 7. 🌪 RISK FLAGS & REGULATORY RED ALERTS
+- Development trends in area""",
+    "risk_flags": """### 7. 🌪 RISK FLAGS & REGULATORY RED ALERTS
 Identify:
 - Age + no remodel rehab needs
 - AVM vs tax reassessment risk
@@ -161,126 +123,734 @@ Identify:
 - Flip speculation warnings
 - Ownership pattern red flags
 - Natural disaster risks (flood/tornado/earthquake/wildfire)
-- Historical disaster proximity
-
-### 8. 💸 FINANCIAL BREAKDOWN + FORECASTING
-Estimate:
-- Rental income (ZIP-based market rates)
-- CAP rate calculation
+- Historical disaster proximity""",
+    "financial_breakdown": """### 8. 💸 FINANCIAL BREAKDOWN + FORECASTING
+Rental income, CAP rate, NOI, monthly carrying costs and cash-on-cash return are
+computed for you (see COMPUTED FINANCIALS); use those figures. Estimate:
 - Rehab cost brackets
 - Total project budget scenarios
 - Exit price scenarios (pessimistic/realistic/aggressive)
-- Profit potential by strategy
-- Monthly carrying costs
-- NOI estimates
-- Cash-on-cash returns
-
-### 9. ⚠️ MARKET CONTEXT
+- Profit potential by strategy""",
+    "market_context": """### 9. ⚠️ MARKET CONTEXT
 Analyze:
 - City appreciation trends (1/5/10 year)
 - Median home price comparison
 - Average holding periods in ZIP
 - Investor activity levels
 - Appreciation rate vs market
-- Gentrification likelihood
-
-### 10. 📜 EXECUTIVE SUMMARY
+- Gentrification likelihood""",
+    "executive_summary": """### 10. 📜 EXECUTIVE SUMMARY
 Conclude with:
 - Plain-English "worth it or not" verdict
 - Top 3 deal strengths
 - Top 3 weaknesses/flags
 - Recommended next step
 - Report quality scorecard
-- Time-sensitive insights
-
-### 📎 BONUS EXTRAS
+- Time-sensitive insights""",
+    "bonus_extras": """### 📎 BONUS EXTRAS
 Generate:
 - Investor pitch deck summary text
 - Marketing copy for buyer/seller outreach
 - Shareable 1-pager summary in markdown
-- Custom report name suggestion
+- Custom report name suggestion"""
+}
+
+# Static part of every text-mode legendary prompt, sent as a cached system block.
+# Only the property data and the sections to write change between requests.
+LEGENDARY_ANALYSIS_INSTRUCTIONS = f"""# LEGENDARY PROPERTY ANALYSIS
+
+Analyze the property described in the user's message. Provide specific, actionable insights for each section requested.
+
+## ANALYSIS SECTIONS:
+
+{chr(10).join(chr(10) + LEGENDARY_SECTION_PROMPTS[section_key] for section_key in LEGENDARY_SECTION_KEYS).strip()}
 
 ## OUTPUT FORMAT:
-Provide detailed analysis for each section. Be specific with numbers, timelines, and actionable advice. Include confidence levels where appropriate.
+Be specific with numbers, timelines, and actionable advice. Include confidence levels where appropriate.
+When asked for all sections, write them in the order above, starting each with its markdown heading (e.g. "### 1. 🧱 PROPERTY IDENTITY & PHYSICAL OVERVIEW").
+When asked for a single section, write only that section and label each item on its own line using the wording from its list."""
+
+# Static part of every JSON-mode legendary prompt; the tool schema describes each field
+LEGENDARY_STRUCTURED_INSTRUCTIONS = f"""# LEGENDARY PROPERTY ANALYSIS
+
+Analyze the property described in the user's message and record the analysis with the {LEGENDARY_ANALYSIS_TOOL_NAME} tool.
+Be specific with numbers, timelines, and actionable advice. Include confidence levels where appropriate."""
+
+_MOTIVATION_SCORE_PATTERN = re.compile(r'motivation.*?(\d+)/10', re.IGNORECASE)
+
+# Matches the "### 1. ..." through "### 10. ..." and "### 📎 BONUS EXTRAS" headings
+_SECTION_HEADING_PATTERN = re.compile(r"^\s*#{1,3}\s*(?:(\d{1,2})\s*[.):]|.*\bbonus\b)", re.IGNORECASE)
+
+
+def create_anthropic_client() -> anthropic.AsyncAnthropic:
+    """Anthropic client for the analyzers; rate-limit retries are left to AnthropicGovernor"""
+    # SDK-level retries would re-send 429s without coordinating with other callers
+    return anthropic.AsyncAnthropic(
+        api_key=settings.ANTHROPIC_API_KEY,
+        base_url=settings.ANTHROPIC_BASE_URL or None,
+        max_retries=0
+    )
+
+
+async def _create_message(
+    client: anthropic.AsyncAnthropic,
+    governor: AnthropicGovernor,
+    **request: Any
+) -> Any:
+    """Send a Claude request through the governor and record its token usage"""
+    with span("claude.messages.create", model=request.get("model"), max_tokens=request.get("max_tokens")) as current:
+        with STAGE_SECONDS.time("claude_call"):
+            response = await governor.create_message(client, **request)
+        if response.usage is not None:
+            current.set_attribute("input_tokens", response.usage.input_tokens)
+            current.set_attribute("output_tokens", response.usage.output_tokens)
+    prompt_cache_usage.record(response.usage)
+    return response
+
+
+@dataclass
+class LegendaryAnalysis:
+    """Legendary insights and where they came from"""
+    insights: Dict[str, Any]
+    source: AnalysisSource = AnalysisSource.AI
+    # Age of a cached analysis, None otherwise
+    age_seconds: Optional[float] = None
+
+
+class LegendaryAIAnalyzer:
+    """Enhanced Claude AI analyzer for comprehensive 10-section legendary property reports"""
+    
+    def __init__(
+        self,
+        client: Optional[anthropic.AsyncAnthropic] = None,
+        analysis_cache: Optional[AnalysisCache] = None,
+        governor: Optional[AnthropicGovernor] = None,
+        rule_based_analyzer: Optional[RuleBasedAnalyzer] = None
+    ):
+        self.client = client or create_anthropic_client()
+        self.governor = governor or AnthropicGovernor()
+        self.model = settings.ANTHROPIC_MODEL
+        if analysis_cache is None and settings.ANALYSIS_CACHE_ENABLED:
+            analysis_cache = AnalysisCache()
+        self.analysis_cache = analysis_cache
+        self.rule_based_analyzer = rule_based_analyzer or RuleBasedAnalyzer()
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+    
+    async def analyze_property_legendary(self, property_data: Dict[str, Any]) -> LegendaryAnalysis:
+        """
+        Generate comprehensive 10-section AI analysis with bonus extras
+        
+        Fresh cached analyses are returned directly. Stale ones are returned
+        immediately while a background refresh regenerates them.
+        
+        Claude gets AI_DEADLINE_SECONDS to answer. If it fails or runs late, the
+        latest cached analysis of the property is served, even if expired, else
+        rule-based insights; a late call keeps running and caches its result.
+        
+        Args:
+            property_data: Raw property data from Estated
+            
+        Returns:
+            LegendaryAnalysis with insights for every section, their source and,
+            for cached analyses, their age
+        """
+        with span("ai.analyze_legendary", mode=settings.LEGENDARY_ANALYSIS_MODE) as current:
+            if self.analysis_cache is None:
+                # Nothing to store a late result in, so a missed deadline cancels the call
+                analysis = self._analyze_or_none(property_data)
+            else:
+                fingerprint = self._analysis_fingerprint(property_data)
+                cached = await self.analysis_cache.get(fingerprint)
+                current.set_attribute("cache", "miss" if cached is None else "hit" if cached.is_fresh else "stale")
+                
+                if cached is not None:
+                    if not cached.is_fresh:
+                        self._schedule_refresh(fingerprint, property_data)
+                    return LegendaryAnalysis(cached.insights, AnalysisSource.CACHE, cached.age_seconds)
+                
+                # Shielded so the call outlives a missed deadline and still fills the cache
+                analysis = asyncio.shield(self._schedule_refresh(fingerprint, property_data))
+            
+            try:
+                if settings.AI_DEADLINE_SECONDS > 0:
+                    insights = await asyncio.wait_for(analysis, settings.AI_DEADLINE_SECONDS)
+                else:
+                    insights = await analysis
+            except asyncio.TimeoutError:
+                logger.warning(f"Legendary AI analysis missed its {settings.AI_DEADLINE_SECONDS:g}s deadline")
+                AI_DEADLINE_EXCEEDED.inc()
+                insights = None
+            
+            if insights is not None:
+                return LegendaryAnalysis(insights)
+            return await self._degraded_analysis(property_data, current)
+    
+    async def _analyze_or_none(self, property_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Run the AI analysis; None if it failed"""
+        try:
+            insights, _ = await self._generate_legendary_analysis(property_data)
+            return insights
+        except Exception as e:
+            logger.error(f"Legendary AI analysis failed: {str(e)}")
+            return None
+    
+    async def _degraded_analysis(self, property_data: Dict[str, Any], current_span: Any) -> LegendaryAnalysis:
+        """Latest cached analysis of the property, even if expired, else rule-based insights"""
+        property_key = self._property_key(property_data)
+        if self.analysis_cache is not None and property_key:
+            latest = await self.analysis_cache.get_latest(property_key)
+            if latest is not None:
+                current_span.set_attribute("degraded", "cache")
+                return LegendaryAnalysis(latest.insights, AnalysisSource.CACHE, latest.age_seconds)
+        
+        current_span.set_attribute("degraded", "rules")
+        return LegendaryAnalysis(self._generate_fallback_legendary_analysis(property_data), AnalysisSource.RULES)
+    
+    def _schedule_refresh(self, fingerprint: str, property_data: Dict[str, Any]) -> asyncio.Task:
+        """
+        Run the analysis for a fingerprint in the background and cache a complete result
+        
+        Concurrent callers (cache misses and stale-entry refreshes) share one task
+        per fingerprint.
+        
+        Returns:
+            Task resolving to the insights, or None if the analysis failed
+        """
+        if fingerprint in self._refresh_tasks:
+            return self._refresh_tasks[fingerprint]
+        
+        async def refresh() -> Optional[Dict[str, Any]]:
+            insights, complete = None, False
+            try:
+                insights, complete = await self._generate_legendary_analysis(property_data)
+            except Exception as e:
+                logger.error(f"Legendary AI analysis failed: {str(e)}")
+            # Analyses with fallback sections are served but not cached
+            if complete:
+                await self._cache_analysis(fingerprint, property_data, insights)
+            return insights
+        
+        task = asyncio.create_task(refresh())
+        self._refresh_tasks[fingerprint] = task
+        task.add_done_callback(lambda _: self._refresh_tasks.pop(fingerprint, None))
+        return task
+    
+    async def _cache_analysis(self, fingerprint: str, property_data: Dict[str, Any], insights: Dict[str, Any]) -> None:
+        """Store a complete analysis under its fingerprint and its property"""
+        await self.analysis_cache.set(fingerprint, insights, self._property_key(property_data))
+    
+    def _property_key(self, property_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Canonical address of the property, used to find its latest analysis
+        
+        Derived from the Estated formatted address, which EstatedClient fills
+        with the requested address when Estated returns none.
+        """
+        address = property_data.get('address', {}).get('formatted_address')
+        return canonical_address_key(address) if address else None
+    
+    def _analysis_fingerprint(self, property_data: Dict[str, Any]) -> str:
+        """Cache key for an analysis: prompt inputs + model + prompt version"""
+        fields = self._extract_prompt_fields(property_data)
+        # The parser also reads the city when naming the report
+        fields["city"] = property_data.get('address', {}).get('city')
+        # Two properties never share an analysis, even when their other fields match
+        fields["property_key"] = self._property_key(property_data)
+        # Text and JSON output are produced by different prompts
+        prompt_version = f"{LEGENDARY_PROMPT_VERSION}-{settings.LEGENDARY_OUTPUT_MODE}"
+        return analysis_fingerprint(fields, self.model, prompt_version)
+    
+    async def _generate_legendary_analysis(self, property_data: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Run the legendary analysis in the configured execution mode
+        
+        Returns:
+            Tuple of (insights, complete). `complete` is False when some sections
+            fell back to placeholder insights, e.g. because Claude's response
+            never reached their heading.
+            
+        Raises:
+            Exception: If the analysis could not be produced at all
+        """
+        if settings.LEGENDARY_ANALYSIS_MODE == "sectioned":
+            return await self._generate_sectioned_analysis(property_data)
+        
+        return await self._generate_monolithic_analysis(property_data)
+    
+    async def _generate_monolithic_analysis(self, property_data: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Call Claude once for all sections and parse the response; raises on API failure
+        
+        Returns:
+            Tuple of (insights, complete); a text response is complete when every
+            section heading appears in it, a JSON one when every field was filled
+        """
+        if settings.LEGENDARY_OUTPUT_MODE == "json":
+            return await self._generate_structured_analysis(property_data, LEGENDARY_SECTION_KEYS, max_tokens=8000)
+        
+        # Create the comprehensive legendary analysis prompt
+        analysis_prompt = self._create_comprehensive_legendary_prompt(property_data)
+        
+        # Get AI analysis with enhanced context for all 10 sections
+        response = await _create_message(
+            self.client,
+            self.governor,
+            model=self.model,
+            max_tokens=8000,  # Increased for comprehensive analysis
+            system=cached_system(LEGENDARY_SYSTEM_PROMPT, LEGENDARY_ANALYSIS_INSTRUCTIONS),
+            messages=[
+                {
+                    "role": "user",
+                    "content": analysis_prompt
+                }
+            ]
+        )
+        
+        # Parse the comprehensive response
+        ai_content = response.content[0].text if response.content else ""
+        
+        # Extract structured insights for all 10 sections + bonus extras
+        with span("ai.parse") as current, STAGE_SECONDS.time("parse"):
+            response_index = SectionIndex(ai_content)
+            insights = self._parse_legendary_analysis(response_index, property_data)
+            missing_sections = self._missing_sections(response_index)
+            if missing_sections:
+                # e.g. a response cut off by max_tokens; the missing sections hold placeholders
+                current.set_attribute("missing_sections", len(missing_sections))
+                logger.warning(f"Legendary AI response is missing sections: {', '.join(missing_sections)}")
+        return insights, not missing_sections
+    
+    async def _generate_structured_analysis(
+        self,
+        property_data: Dict[str, Any],
+        section_keys: List[str],
+        max_tokens: int
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Have Claude fill the analysis schema through a forced tool call
+        
+        The tool input is validated against the AI-filled fields of the section
+        models, then merged with the locally computed fields.
+        
+        Returns:
+            Tuple of (insights keyed by section, complete); `complete` is False
+            when Claude left schema fields out and their defaults were used
+        
+        Raises:
+            Exception: On API failure, a missing tool call or a schema mismatch
+        """
+        response = await _create_message(
+            self.client,
+            self.governor,
+            model=self.model,
+            max_tokens=max_tokens,
+            system=cached_system(LEGENDARY_SYSTEM_PROMPT, LEGENDARY_STRUCTURED_INSTRUCTIONS),
+            tools=[legendary_analysis_tool(section_keys)],
+            tool_choice={"type": "tool", "name": LEGENDARY_ANALYSIS_TOOL_NAME},
+            messages=[
+                {
+                    "role": "user",
+                    "content": self._create_structured_prompt(property_data)
+                }
+            ]
+        )
+        
+        with span("ai.parse", output="json") as current, STAGE_SECONDS.time("parse"):
+            insights, missing_fields = parse_legendary_tool_output(response, section_keys)
+            if missing_fields:
+                current.set_attribute("missing_fields", len(missing_fields))
+                logger.warning(f"Legendary AI tool output is missing fields: {', '.join(missing_fields)}")
+        computed = self._computed_section_fields(property_data)
+        return {
+            section_key: {**insights[section_key], **computed.get(section_key, {})}
+            for section_key in section_keys
+        }, not missing_fields
+    
+    async def _generate_sectioned_analysis(self, property_data: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Analyze each section with its own concurrent Claude call
+        
+        Wall-clock time tracks the slowest section rather than the sum of all of
+        them. A failed section falls back on its own; the analysis only fails as
+        a whole when every section does. Sections that succeeded with missing
+        fields are kept but mark the analysis incomplete.
+        """
+        results = await asyncio.gather(*self._section_analysis_tasks(property_data))
+        insights = {section_key: section_insights for section_key, section_insights, _, _ in results}
+        failed_sections = [section_key for section_key, _, _, failed in results if failed]
+        
+        if len(failed_sections) == len(LEGENDARY_SECTION_KEYS):
+            raise RuntimeError("All legendary section analyses failed")
+        
+        return insights, all(complete for _, _, complete, _ in results)
+    
+    def _section_analysis_tasks(self, property_data: Dict[str, Any]) -> List[asyncio.Task]:
+        """Start one bounded-concurrency Claude call per legendary section"""
+        semaphore = asyncio.Semaphore(settings.LEGENDARY_SECTION_CONCURRENCY)
+        extractors = self._section_extractors()
+        
+        async def analyze_section(section_key: str) -> Tuple[str, Dict[str, Any], bool, bool]:
+            async with semaphore:
+                with span("ai.analyze_section", section=section_key):
+                    try:
+                        if settings.LEGENDARY_OUTPUT_MODE == "json":
+                            section_insights, complete = await self._generate_structured_analysis(
+                                property_data, [section_key], max_tokens=settings.LEGENDARY_SECTION_MAX_TOKENS
+                            )
+                            return section_key, section_insights[section_key], complete, False
+                        
+                        response = await _create_message(
+                            self.client,
+                            self.governor,
+                            model=self.model,
+                            max_tokens=settings.LEGENDARY_SECTION_MAX_TOKENS,
+                            system=cached_system(LEGENDARY_SYSTEM_PROMPT, LEGENDARY_ANALYSIS_INSTRUCTIONS),
+                            messages=[
+                                {
+                                    "role": "user",
+                                    "content": self._create_section_prompt(section_key, property_data)
+                                }
+                            ]
+                        )
+                        ai_content = response.content[0].text if response.content else ""
+                        with span("ai.parse", section=section_key), STAGE_SECONDS.time("parse"):
+                            return section_key, extractors[section_key](ai_content, property_data), True, False
+                        
+                    except Exception as e:
+                        logger.warning(f"Legendary section analysis failed for {section_key}: {str(e)}")
+                        fallback = self._generate_fallback_legendary_analysis(property_data)
+                        return section_key, fallback.get(section_key, {}), False, True
+        
+        return [asyncio.create_task(analyze_section(section_key)) for section_key in LEGENDARY_SECTION_KEYS]
+    
+    async def stream_property_legendary(
+        self,
+        property_data: Dict[str, Any]
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream the legendary analysis section by section
+        
+        Uses the Anthropic streaming API and yields each section's insights as soon
+        as Claude moves on to the next section heading. Cached analyses are yielded
+        immediately. Sections that were never streamed (e.g. after a mid-stream
+        failure) are filled from the fallback analysis at the end.
+        
+        Args:
+            property_data: Raw property data from Estated
+            
+        Yields:
+            Tuples of (section_key, section_insights) in the order sections complete
+        """
+        fingerprint = None
+        if self.analysis_cache is not None:
+            fingerprint = self._analysis_fingerprint(property_data)
+            cached = await self.analysis_cache.get(fingerprint)
+            if cached is not None:
+                if not cached.is_fresh:
+                    self._schedule_refresh(fingerprint, property_data)
+                for section_key in LEGENDARY_SECTION_KEYS:
+                    yield section_key, cached.insights.get(section_key, {})
+                return
+        
+        if settings.LEGENDARY_ANALYSIS_MODE == "sectioned":
+            async for section_key, section_insights in self._stream_sectioned_analysis(property_data, fingerprint):
+                yield section_key, section_insights
+            return
+        
+        if settings.LEGENDARY_OUTPUT_MODE == "json":
+            async for section_key, section_insights in self._stream_structured_analysis(property_data, fingerprint):
+                yield section_key, section_insights
+            return
+        
+        extractors = self._section_extractors()
+        insights: Dict[str, Any] = {}
+        response_lines: List[str] = []
+        section_lines: List[str] = []
+        current_section: Optional[str] = None
+        failed = False
+        
+        try:
+            analysis_prompt = self._create_comprehensive_legendary_prompt(property_data)
+            started_at = call_started_at = time.perf_counter()
+            
+            async with self.governor.stream_message(
+                self.client,
+                model=self.model,
+                max_tokens=8000,
+                system=cached_system(LEGENDARY_SYSTEM_PROMPT, LEGENDARY_ANALYSIS_INSTRUCTIONS),
+                messages=[
+                    {
+                        "role": "user",
+                        "content": analysis_prompt
+                    }
+                ]
+            ) as stream:
+                pending_text = ""
+                async for text in stream.text_stream:
+                    if started_at is not None:
+                        prompt_cache_usage.record_first_token(time.perf_counter() - started_at)
+                        started_at = None
+                    pending_text += text
+                    while "\n" in pending_text:
+                        line, pending_text = pending_text.split("\n", 1)
+                        response_lines.append(line)
+                        
+                        next_section = self._match_section_heading(line)
+                        if next_section is not None and next_section != current_section:
+                            if current_section is not None and current_section not in insights:
+                                insights[current_section] = extractors[current_section]("\n".join(section_lines), property_data)
+                                yield current_section, insights[current_section]
+                            current_section = next_section
+                            section_lines = []
+                        
+                        section_lines.append(line)
+                
+                response_lines.append(pending_text)
+                section_lines.append(pending_text)
+                prompt_cache_usage.record((await stream.get_final_message()).usage)
+            # Includes the incremental section parsing done while the stream was open
+            STAGE_SECONDS.observe(time.perf_counter() - call_started_at, "claude_call")
+            
+            if current_section is not None and current_section not in insights:
+                insights[current_section] = extractors[current_section]("\n".join(section_lines), property_data)
+                yield current_section, insights[current_section]
+                
+        except Exception as e:
+            logger.error(f"Legendary AI streaming analysis failed: {str(e)}")
+            failed = True
+        
+        # Fill any sections Claude skipped or never reached
+        full_response = "\n".join(response_lines)
+        fallback = self._generate_fallback_legendary_analysis(property_data) if failed else {}
+        skipped_sections = [section_key for section_key in LEGENDARY_SECTION_KEYS if section_key not in insights]
+        for section_key in skipped_sections:
+            if failed:
+                insights[section_key] = fallback.get(section_key, {})
+            else:
+                insights[section_key] = extractors[section_key](full_response, property_data)
+            yield section_key, insights[section_key]
+        
+        # A section without its own heading holds placeholders, so the analysis is not cached
+        if fingerprint is not None and not failed and not skipped_sections:
+            await self._cache_analysis(fingerprint, property_data, insights)
+    
+    async def _stream_sectioned_analysis(
+        self,
+        property_data: Dict[str, Any],
+        fingerprint: Optional[str]
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Yield per-section analyses in completion order, caching the result if complete"""
+        tasks = self._section_analysis_tasks(property_data)
+        insights: Dict[str, Any] = {}
+        complete = True
+        
+        try:
+            for next_section in asyncio.as_completed(tasks):
+                section_key, section_insights, ok, _ = await next_section
+                insights[section_key] = section_insights
+                complete = complete and ok
+                yield section_key, section_insights
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        if fingerprint is not None and complete:
+            await self._cache_analysis(fingerprint, property_data, insights)
+    
+    async def _stream_structured_analysis(
+        self,
+        property_data: Dict[str, Any],
+        fingerprint: Optional[str]
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Yield every section once the single structured analysis is validated"""
+        # The tool input is one JSON document, so there is nothing to yield before it completes
+        try:
+            insights, complete = await self._generate_monolithic_analysis(property_data)
+            failed = not complete
+        except Exception as e:
+            logger.error(f"Legendary AI structured analysis failed: {str(e)}")
+            insights = self._generate_fallback_legendary_analysis(property_data)
+            failed = True
+        
+        for section_key in LEGENDARY_SECTION_KEYS:
+            yield section_key, insights.get(section_key, {})
+        
+        if fingerprint is not None and not failed:
+            await self._cache_analysis(fingerprint, property_data, insights)
+    
+    def _missing_sections(self, response_index: SectionIndex) -> List[str]:
+        """Legendary sections whose heading never appears in the response"""
+        found = {self._match_section_heading(response_index.lines[line]) for line in response_index.iter_lines("#")}
+        return [section_key for section_key in LEGENDARY_SECTION_KEYS if section_key not in found]
+    
+    def _match_section_heading(self, line: str) -> Optional[str]:
+        """Section key for a legendary section heading line, or None for other lines"""
+        match = _SECTION_HEADING_PATTERN.match(line)
+        if not match:
+            return None
+        
+        if match.group(1) is None:
+            return "bonus_extras"
+        
+        section_number = int(match.group(1))
+        if 1 <= section_number <= 10:
+            return LEGENDARY_SECTION_KEYS[section_number - 1]
+        return None
+    
+    def _extract_prompt_fields(self, property_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Collect the property fields that feed the legendary prompt"""
+        address = property_data.get('address', {})
+        property_details = property_data.get('property', {})
+        owner_info = property_data.get('owner', {})
+        valuation = property_data.get('valuation', {})
+        metrics = compute_financial_metrics(property_data)
+        
+        return {
+            **{name: 'N/A' if value is None else value for name, value in metrics.items()},
+            "formatted_address": address.get('formatted_address', 'N/A'),
+            "property_type": property_details.get('property_type', 'N/A'),
+            "year_built": property_details.get('year_built', 'N/A'),
+            "sqft": property_details.get('sqft', 'N/A'),
+            "lot_size": property_details.get('lot_size', 'N/A'),
+            "bedrooms": property_details.get('bedrooms', 'N/A'),
+            "bathrooms": property_details.get('bathrooms', 'N/A'),
+            "avm": valuation.get('avm', 'N/A'),
+            "last_sale_price": property_details.get('last_sale_price', 'N/A'),
+            "last_sale_date": property_details.get('last_sale_date', 'N/A'),
+            "owner_name": owner_info.get('name', 'N/A'),
+            "owner_mailing_address": owner_info.get('mailing_address', 'N/A'),
+            "zip": address.get('zip', 'N/A'),
+            "county": address.get('county', 'N/A')
+        }
+    
+    def _create_comprehensive_legendary_prompt(self, property_data: Dict[str, Any]) -> str:
+        """Create the per-property prompt asking for all 10 sections (instructions are in the cached system prompt)"""
+        
+        prompt = f"""{self._format_property_block(property_data)}
+
+Analyze this property comprehensively across ALL sections in your instructions, in order.
 """
         
         return prompt
     
-    def _parse_legendary_analysis(self, ai_content: str, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_section_prompt(self, section_key: str, property_data: Dict[str, Any]) -> str:
+        """Create the per-property prompt asking for a single legendary section"""
+        section_heading = LEGENDARY_SECTION_PROMPTS[section_key].split("\n", 1)[0].lstrip("# ")
+        
+        prompt = f"""{self._format_property_block(property_data)}
+
+Analyze this property for the "{section_heading}" section only.
+"""
+        
+        return prompt
+    
+    def _create_structured_prompt(self, property_data: Dict[str, Any]) -> str:
+        """Create the per-property prompt for tool-based output; the tool schema carries the field instructions"""
+        return self._format_property_block(property_data)
+    
+    def _format_property_block(self, property_data: Dict[str, Any]) -> str:
+        """Markdown block with the property facts shared by every legendary prompt"""
+        with STAGE_SECONDS.time("prompt_build"):
+            # Extract key property details for context
+            fields = self._extract_prompt_fields(property_data)
+            
+            return f"""## PROPERTY DATA:
+- **Address**: {fields['formatted_address']}
+- **Property Type**: {fields['property_type']}
+- **Year Built**: {fields['year_built']}
+- **Square Footage**: {fields['sqft']} sq ft
+- **Lot Size**: {fields['lot_size']}
+- **Bedrooms**: {fields['bedrooms']}
+- **Bathrooms**: {fields['bathrooms']}
+- **AVM Value**: ${fields['avm']}
+- **Last Sale**: ${fields['last_sale_price']} on {fields['last_sale_date']}
+- **Owner**: {fields['owner_name']}
+- **Owner Address**: {fields['owner_mailing_address']}
+- **ZIP Code**: {fields['zip']}
+- **County**: {fields['county']}
+
+## COMPUTED FINANCIALS (exact; use as given):
+- **Estimated Rent**: ${fields['monthly_rent']}/month
+- **NOI**: ${fields['noi']}/year
+- **CAP Rate**: {fields['cap_rate']}%
+- **Cash-on-Cash Return**: {fields['cash_on_cash_return']}%
+- **Monthly Carrying Costs**: ${fields['monthly_carrying_costs']}
+- **Estimated Equity**: ${fields['estimated_equity']}"""
+    
+    def _parse_legendary_analysis(self, ai_content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Parse AI response into structured legendary insights"""
         
         # This is a comprehensive parser that extracts insights for all 10 sections
         # In a production system, you might want to use structured output or fine-tuned extraction
-        
-        insights = {
+        # The response is indexed once and shared by every field lookup
+        response_index = SectionIndex.of(ai_content)
+        return {
+            section_key: extract(response_index, property_data)
+            for section_key, extract in self._section_extractors().items()
+        }
+    
+    def _section_extractors(self) -> Dict[str, Callable[[ResponseText, Dict[str, Any]], Dict[str, Any]]]:
+        """Insight extractor for each legendary section, keyed as in LEGENDARY_SECTION_KEYS"""
+        return {
             # Section 1: Property Identity & Physical
-            "property_identity": self._extract_property_identity_insights(ai_content, property_data),
+            "property_identity": self._extract_property_identity_insights,
             
             # Section 2: Valuation & Equity
-            "valuation_equity": self._extract_valuation_insights(ai_content, property_data),
+            "valuation_equity": self._extract_valuation_insights,
             
             # Section 3: Deal Strategy
-            "deal_strategy": self._extract_strategy_insights(ai_content, property_data),
+            "deal_strategy": self._extract_strategy_insights,
             
             # Section 4: Ownership Profile
-            "ownership_profile": self._extract_ownership_insights(ai_content, property_data),
+            "ownership_profile": self._extract_ownership_insights,
             
             # Section 5: Investor Action
-            "investor_action": self._extract_action_insights(ai_content, property_data),
+            "investor_action": self._extract_action_insights,
             
             # Section 6: Neighborhood Infrastructure
-            "neighborhood_infrastructure": self._extract_neighborhood_insights(ai_content, property_data),
+            "neighborhood_infrastructure": self._extract_neighborhood_insights,
             
             # Section 7: Risk Flags
-            "risk_flags": self._extract_risk_insights(ai_content, property_data),
+            "risk_flags": self._extract_risk_insights,
             
             # Section 8: Financial Breakdown
-            "financial_breakdown": self._extract_financial_insights(ai_content, property_data),
+            "financial_breakdown": self._extract_financial_insights,
             
             # Section 9: Market Context
-            "market_context": self._extract_market_insights(ai_content, property_data),
+            "market_context": self._extract_market_insights,
             
             # Section 10: Executive Summary
-            "executive_summary": self._extract_executive_insights(ai_content, property_data),
+            "executive_summary": self._extract_executive_insights,
             
             # Bonus Extras
-            "bonus_extras": self._extract_bonus_insights(ai_content, property_data)
+            "bonus_extras": self._extract_bonus_insights
         }
-        
-        return insights
     
-    def _extract_property_identity_insights(self, ai_content: str, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _computed_section_fields(self, property_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Insight fields calculated from the property data rather than inferred by Claude"""
+        return computed_section_fields(property_data)
+    
+    def _extract_property_identity_insights(self, ai_content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract property identity and physical insights"""
-        property_details = property_data.get('property', {})
-        
         return {
+            **self._computed_section_fields(property_data)["property_identity"],
             "structure_condition": self._extract_section(ai_content, "structure condition", "Good condition based on age and type"),
-            "property_age_classification": self._classify_property_age(property_details.get('year_built')),
             "exterior_material_style": self._extract_section(ai_content, "exterior material", "Traditional style typical of era"),
             "zoning_compatibility_issues": self._extract_section(ai_content, "zoning", "No apparent zoning conflicts"),
             "human_readable_summary": self._extract_section(ai_content, "property summary", f"Property analysis for {property_data.get('address', {}).get('formatted_address', 'this property')}")
         }
     
-    def _extract_valuation_insights(self, ai_content: str, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_valuation_insights(self, ai_content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract valuation and equity insights"""
-        valuation = property_data.get('valuation', {})
-        property_details = property_data.get('property', {})
-        
-        avm = valuation.get('avm', 0)
-        last_sale = property_details.get('last_sale_price', 0)
-        sqft = property_details.get('sqft', 1)
-        
         return {
-            "price_per_sqft_current": round(avm / sqft, 2) if avm and sqft else None,
-            "price_per_sqft_historical": round(last_sale / sqft, 2) if last_sale and sqft else None,
-            "estimated_equity": avm - last_sale if avm and last_sale else None,
+            **self._computed_section_fields(property_data)["valuation_equity"],
             "assessed_undervaluation_risk": self._extract_section(ai_content, "undervaluation", "Moderate risk based on market trends"),
             "tax_vs_avm_discrepancy": self._extract_section(ai_content, "tax vs avm", "Typical variance for area"),
             "forecasted_appreciation": self._extract_section(ai_content, "appreciation", "Steady appreciation expected"),
             "price_trend_comparison": self._extract_section(ai_content, "price trend", "Aligned with market averages")
         }
     
-    def _extract_strategy_insights(self, ai_content: str, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_strategy_insights(self, ai_content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract deal strategy insights"""
         return {
             "flip_potential_score": self._extract_section(ai_content, "flip potential", "B - Good flip potential"),
@@ -295,14 +865,10 @@ Provide detailed analysis for each section. Be specific with numbers, timelines,
             "roi_estimate": self._extract_section(ai_content, "roi", "8-12% cash-on-cash return")
         }
     
-    def _extract_ownership_insights(self, ai_content: str, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_ownership_insights(self, ai_content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract ownership profile insights"""
-        owner_info = property_data.get('owner', {})
-        property_details = property_data.get('property', {})
-        
         return {
-            "absentee_owner_flag": self._detect_absentee_owner(owner_info, property_data.get('address', {})),
-            "time_held_years": self._calculate_ownership_duration(property_details.get('last_sale_date')),
+            **self._computed_section_fields(property_data)["ownership_profile"],
             "owner_occupancy_likelihood": self._extract_section(ai_content, "occupancy", "Likely owner-occupied"),
             "long_term_hold_score": self._extract_section(ai_content, "hold score", "High - 8/10"),
             "owner_type_inference": self._extract_section(ai_content, "owner type", "Residential owner"),
@@ -310,7 +876,7 @@ Provide detailed analysis for each section. Be specific with numbers, timelines,
             "top_reason_might_sell": self._extract_section(ai_content, "sell reason", "Life changes or financial needs")
         }
     
-    def _extract_action_insights(self, ai_content: str, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_action_insights(self, ai_content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract investor action insights"""
         return {
             "recommended_approach": self._extract_section(ai_content, "approach", "Direct mail campaign"),
@@ -320,7 +886,7 @@ Provide detailed analysis for each section. Be specific with numbers, timelines,
             "contact_urgency_estimate": self._extract_section(ai_content, "urgency", "Medium - contact within 2 weeks")
         }
     
-    def _extract_neighborhood_insights(self, ai_content: str, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_neighborhood_insights(self, ai_content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract neighborhood infrastructure insights"""
         return {
             "neighborhood_type": self._extract_section(ai_content, "neighborhood type", "Suburban residential"),
@@ -333,7 +899,7 @@ Provide detailed analysis for each section. Be specific with numbers, timelines,
             "development_trend": self._extract_section(ai_content, "development", "Stable established area")
         }
     
-    def _extract_risk_insights(self, ai_content: str, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_risk_insights(self, ai_content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract risk flags and regulatory alerts"""
         return {
             "age_no_remodel_flag": self._extract_section(ai_content, "age remodel", "Low risk - reasonable age"),
@@ -348,21 +914,17 @@ Provide detailed analysis for each section. Be specific with numbers, timelines,
             "historical_disaster_proximity": self._extract_section(ai_content, "disaster", "No significant disaster history")
         }
     
-    def _extract_financial_insights(self, ai_content: str, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_financial_insights(self, ai_content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract financial breakdown insights"""
         return {
-            "estimated_rental_income": self._extract_numeric_section(ai_content, "rental income"),
-            "estimated_cap_rate": self._extract_numeric_section(ai_content, "cap rate"),
+            **self._computed_section_fields(property_data)["financial_breakdown"],
             "rehab_cost_estimate": self._extract_section(ai_content, "rehab cost", "$15,000-25,000"),
             "total_project_budget": self._extract_section(ai_content, "project budget", "$200,000-250,000"),
             "exit_price_scenarios": self._extract_section(ai_content, "exit price", "Conservative: $X, Realistic: $Y, Aggressive: $Z"),
-            "profit_potential_per_strategy": self._extract_section(ai_content, "profit potential", "Rental: $X/month, Flip: $Y profit"),
-            "monthly_carrying_costs": self._extract_section(ai_content, "carrying costs", "$2,500-3,000/month"),
-            "noi_estimate": self._extract_numeric_section(ai_content, "noi"),
-            "cash_on_cash_return": self._extract_section(ai_content, "cash return", "8-12% annually")
+            "profit_potential_per_strategy": self._extract_section(ai_content, "profit potential", "Rental: $X/month, Flip: $Y profit")
         }
     
-    def _extract_market_insights(self, ai_content: str, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_market_insights(self, ai_content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract market context insights"""
         return {
             "city_appreciation_trend": self._extract_section(ai_content, "appreciation trend", "3-5% annually"),
@@ -373,7 +935,7 @@ Provide detailed analysis for each section. Be specific with numbers, timelines,
             "gentrification_likelihood": self._extract_section(ai_content, "gentrification", "Low to moderate likelihood")
         }
     
-    def _extract_executive_insights(self, ai_content: str, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_executive_insights(self, ai_content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract executive summary insights"""
         return {
             "worth_it_verdict": self._extract_section(ai_content, "verdict", "Solid investment opportunity with moderate risk"),
@@ -384,7 +946,7 @@ Provide detailed analysis for each section. Be specific with numbers, timelines,
             "time_sensitive_insight": self._extract_section(ai_content, "time sensitive", "Market conditions favor prompt action")
         }
     
-    def _extract_bonus_insights(self, ai_content: str, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_bonus_insights(self, ai_content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract bonus extras insights"""
         address = property_data.get('address', {}).get('formatted_address', 'Property')
         property_details = property_data.get('property', {})
@@ -399,106 +961,94 @@ Provide detailed analysis for each section. Be specific with numbers, timelines,
         }
     
     # Helper methods for extraction and calculation
-    def _extract_section(self, content: str, section_key: str, default: str = "Analysis not available") -> str:
+    def _extract_section(self, content: ResponseText, section_key: str, default: str = "Analysis not available") -> str:
         """Extract specific section from AI content"""
-        # Simple keyword-based extraction - in production, use more sophisticated parsing
-        lines = content.split('\n')
-        for i, line in enumerate(lines):
-            if section_key.lower() in line.lower():
-                # Return next few lines as the content
-                return ' '.join(lines[i:i+3]).strip()
-        return default
-    
-    def _extract_numeric_section(self, content: str, section_key: str, default: Optional[float] = None) -> Optional[float]:
+        # Keyword-based extraction answered from the response's single-pass index
+        return SectionIndex.of(content).section(section_key, default)
+    
+    def _extract_numeric_section(self, content: ResponseText, section_key: str, default: Optional[float] = None) -> Optional[float]:
         """Extract numeric value from AI content"""
-        section_text = self._extract_section(content, section_key, "")
-        # Simple regex extraction for numbers
-        import re
-        numbers = re.findall(r'\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', section_text)
-        if numbers:
-            try:
-                return float(numbers[0].replace(',', ''))
-            except:
-                pass
-        return default
+        return SectionIndex.of(content).number(section_key, default)
     
-    def _extract_list_section(self, content: str, section_key: str, default: List[str]) -> List[str]:
+    def _extract_list_section(self, content: ResponseText, section_key: str, default: List[str]) -> List[str]:
         """Extract list from AI content"""
-        section_text = self._extract_section(content, section_key, "")
-        # Simple list extraction
-        import re
-        items = re.findall(r'[•\-\*]\s*([^\n]+)', section_text)
-        return items[:3] if items else default
+        return SectionIndex.of(content).list_items(section_key, default)
     
     def _classify_property_age(self, year_built: Optional[int]) -> str:
         """Classify property age"""
-        if not year_built:
-            return "Age unknown"
-        
-        current_year = datetime.now().year
-        age = current_year - year_built
-        
-        if age < 10:
-            return "New (0-10 years)"
-        elif age < 30:
-            return "Mature (10-30 years)"
-        elif age < 50:
-            return "Vintage (30-50 years)"
-        else:
-            return "Antique (50+ years)"
+        return classify_property_age(year_built)
     
     def _detect_absentee_owner(self, owner_info: Dict, property_address: Dict) -> bool:
-        """Detect if owner is absentee"""
-        owner_address = owner_info.get('mailing_address', '')
-        prop_address = property_address.get('formatted_address', '')
-        
-        # Simple comparison - in production, use address normalization
-        if owner_address and prop_address:
-            return owner_address.lower() not in prop_address.lower()
-        return False
+        """Detect if owner is absentee (mailing address is not the property)"""
+        return is_absentee_owner(owner_info.get('mailing_address', ''), property_address.get('formatted_address', ''))
     
     def _calculate_ownership_duration(self, last_sale_date: Optional[str]) -> Optional[float]:
         """Calculate ownership duration in years"""
-        if not last_sale_date:
-            return None
-        
-        try:
-            from datetime import datetime
-            sale_date = datetime.strptime(last_sale_date, '%Y-%m-%d')
-            duration = datetime.now() - sale_date
-            return round(duration.days / 365.25, 1)
-        except:
-            return None
+        return ownership_duration_years(last_sale_date)
     
     def _generate_fallback_legendary_analysis(self, property_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate fallback analysis if AI fails"""
-        return {
-            "property_identity": {
-                "structure_condition": "Condition assessment unavailable",
-                "property_age_classification": "Age classification unavailable",
-                "exterior_material_style": "Style analysis unavailable",
-                "zoning_compatibility_issues": "Zoning analysis unavailable",
-                "human_readable_summary": "Comprehensive analysis temporarily unavailable"
-            },
-            "valuation_equity": {
-                "price_per_sqft_current": None,
-                "price_per_sqft_historical": None,
-                "estimated_equity": None,
-                "assessed_undervaluation_risk": "Risk assessment unavailable",
-                "tax_vs_avm_discrepancy": "Discrepancy analysis unavailable",
-                "forecasted_appreciation": "Forecast unavailable",
-                "price_trend_comparison": "Trend analysis unavailable"
-            },
-            # ... (similar fallback structure for all other sections)
-        }
+        """Complete rule-based insights for when Claude fails or misses its deadline"""
+        AI_FALLBACKS.inc("legendary")
+        return self.rule_based_analyzer.analyze_property_legendary(property_data)
+
+
+LEGACY_SYSTEM_PROMPT = """You are a seasoned real estate investment mentor with 20+ years of experience. You analyze properties like you're whispering strategic insights to your protégé. 
+
+Your analysis should:
+- Be conversational yet authoritative
+- Include specific tactical advice
+- Flag red flags and opportunities others miss
+- Provide ready-to-use outreach scripts
+- Give insider perspectives on market dynamics
+- Score everything with confidence and reasoning
+
+Write as if you're sitting across from an investor, giving them the real insider perspective on this deal."""
+
+# Static part of every legacy prompt; the property details follow in the user message
+LEGACY_ANALYSIS_INSTRUCTIONS = """# LEGENDARY $5 PROPERTY ANALYSIS
+
+Analyze the property in the user's message like a seasoned real estate mentor. Provide insights that feel like getting insider advice from a 20-year veteran.
+
+## Analysis Sections Needed:
+
+### 1. Property Overview & AI Summary
+Provide a conversational summary highlighting investment appeal.
+
+### 2. Ownership Analysis & Motivation
+Analyze owner profile, absentee status, motivation to sell (1-10 score).
+
+### 3. Equity Analysis 
+Calculate equity position, compare tax vs AVM values.
+
+### 4. Investment Strategy Scoring
+Rate flip potential (A-F), BRRRR fit, buy-hold assessment, recommend primary strategy.
+
+### 5. Neighborhood Context
+Assess walkability, transit, schools, community type.
+
+### 6. Risk Flags
+Identify age/rehab risks, tax risks, structural concerns.
+
+### 7. Investor Action Plan
+Provide motivation assessment, outreach approach, suggested messaging.
+
+### 8. Bonus Analytics & Cold Script
+Give off-market probability, AI grade, ready-to-use cold outreach script.
+
+Provide mentor-level insights with specific tactical advice. Include confidence levels and reasoning behind assessments."""
 
 
 # Legacy AI Analyzer for backward compatibility
 class AIAnalyzer:
     """Legacy Claude AI analyzer for 8-section property investment insights"""
     
-    def __init__(self):
-        self.client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    def __init__(
+        self,
+        client: Optional[anthropic.AsyncAnthropic] = None,
+        governor: Optional[AnthropicGovernor] = None
+    ):
+        self.client = client or create_anthropic_client()
+        self.governor = governor or AnthropicGovernor()
     
     async def analyze_property(self, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -512,23 +1062,16 @@ class AIAnalyzer:
         """
         try:
             # Create the legendary analysis prompt
-            analysis_prompt = self._create_legendary_prompt(property_data)
+            with STAGE_SECONDS.time("prompt_build"):
+                analysis_prompt = self._create_legendary_prompt(property_data)
             
             # Get AI analysis with enhanced context
-            response = await self.client.messages.create(
-                model="claude-3-sonnet-20241022",
+            response = await _create_message(
+                self.client,
+                self.governor,
+                model=settings.ANTHROPIC_MODEL,
                 max_tokens=4000,
-                system="""You are a seasoned real estate investment mentor with 20+ years of experience. You analyze properties like you're whispering strategic insights to your protégé. 
-
-Your analysis should:
-- Be conversational yet authoritative
-- Include specific tactical advice
-- Flag red flags and opportunities others miss
-- Provide ready-to-use outreach scripts
-- Give insider perspectives on market dynamics
-- Score everything with confidence and reasoning
-
-Write as if you're sitting across from an investor, giving them the real insider perspective on this deal.""",
+                system=cached_system(LEGACY_SYSTEM_PROMPT, LEGACY_ANALYSIS_INSTRUCTIONS),
                 messages=[
                     {
                         "role": "user",
@@ -540,7 +1083,8 @@ Write as if you're sitting across from an investor, giving them the real insider
             # Parse the response into structured format
             ai_content = response.content[0].text if response.content else ""
             
-            return self._parse_ai_analysis(ai_content, property_data)
+            with span("ai.parse"), STAGE_SECONDS.time("parse"):
+                return self._parse_ai_analysis(ai_content, property_data)
             
         except Exception as e:
             logger.error(f"AI analysis failed: {str(e)}")
@@ -548,7 +1092,7 @@ Write as if you're sitting across from an investor, giving them the real insider
             return self._generate_fallback_analysis(property_data)
 
     def _create_legendary_prompt(self, property_data: Dict[str, Any]) -> str:
-        """Create enhanced analysis prompt for legendary insights"""
+        """Create the per-property analysis prompt (instructions are in the cached system prompt)"""
         
         # Extract key details for analysis
         address = property_data.get('address', {})
@@ -556,12 +1100,7 @@ Write as if you're sitting across from an investor, giving them the real insider
         owner_info = property_data.get('owner', {})
         valuation = property_data.get('valuation', {})
         
-        prompt = f"""
-# LEGENDARY $5 PROPERTY ANALYSIS
-
-Analyze this property like a seasoned real estate mentor. Provide insights that feel like getting insider advice from a 20-year veteran.
-
-## Property Details:
+        prompt = f"""## Property Details:
 - **Address**: {address.get('formatted_address', 'N/A')}
 - **Type**: {property_details.get('property_type', 'N/A')}
 - **Year Built**: {property_details.get('year_built', 'N/A')}
@@ -572,34 +1111,6 @@ Analyze this property like a seasoned real estate mentor. Provide insights that
 - **Last Sale**: ${property_details.get('last_sale_price', 'N/A')} on {property_details.get('last_sale_date', 'N/A')}
 - **Owner**: {owner_info.get('name', 'N/A')}
 - **Owner Address**: {owner_info.get('mailing_address', 'N/A')}
-
-## Analysis Sections Needed:
-
-### 1. Property Overview & AI Summary
-Provide a conversational summary highlighting investment appeal.
-
-### 2. Ownership Analysis & Motivation
-Analyze owner profile, absentee status, motivation to sell (1-10 score).
-
-### 3. Equity Analysis 
-Calculate equity position, compare tax vs AVM values.
-
-### 4. Investment Strategy Scoring
-Rate flip potential (A-F), BRRRR fit, buy-hold assessment, recommend primary strategy.
-
-### 5. Neighborhood Context
-Assess walkability, transit, schools, community type.
-
-### 6. Risk Flags
-Identify age/rehab risks, tax risks, structural concerns.
-
-### 7. Investor Action Plan
-Provide motivation assessment, outreach approach, suggested messaging.
-
-### 8. Bonus Analytics & Cold Script
-Give off-market probability, AI grade, ready-to-use cold outreach script.
-
-Provide mentor-level insights with specific tactical advice. Include confidence levels and reasoning behind assessments.
 """
         
         return prompt
@@ -608,20 +1119,22 @@ Provide mentor-level insights with specific tactical advice. Include confidence
         """Parse AI response into structured insights"""
         
         # Enhanced parsing logic for legendary insights
+        # The response is indexed once and shared by every field lookup
+        response_index = SectionIndex(ai_content)
         insights = {
-            "property_overview": self._extract_overview_insights(ai_content, property_data),
-            "ownership_analysis": self._extract_ownership_analysis(ai_content, property_data),
-            "equity_analysis": self._extract_equity_analysis(ai_content, property_data),
-            "investment_strategy": self._extract_strategy_analysis(ai_content, property_data),
-            "neighborhood_context": self._extract_neighborhood_analysis(ai_content, property_data),
-            "risk_assessment": self._extract_risk_analysis(ai_content, property_data),
-            "investor_action": self._extract_action_analysis(ai_content, property_data),
-            "bonus_analytics": self._extract_bonus_analysis(ai_content, property_data)
+            "property_overview": self._extract_overview_insights(response_index, property_data),
+            "ownership_analysis": self._extract_ownership_analysis(response_index, property_data),
+            "equity_analysis": self._extract_equity_analysis(response_index, property_data),
+            "investment_strategy": self._extract_strategy_analysis(response_index, property_data),
+            "neighborhood_context": self._extract_neighborhood_analysis(response_index, property_data),
+            "risk_assessment": self._extract_risk_analysis(response_index, property_data),
+            "investor_action": self._extract_action_analysis(response_index, property_data),
+            "bonus_analytics": self._extract_bonus_analysis(response_index, property_data)
         }
         
         return insights
 
-    def _extract_overview_insights(self, content: str, property_data: Dict[str, Any]) -> Dict[str, str]:
+    def _extract_overview_insights(self, content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, str]:
         """Extract property overview insights"""
         return {
             "ai_summary": self._extract_section_content(content, "property overview", "This property offers solid investment potential with its established location and fundamentals."),
@@ -629,7 +1142,7 @@ Provide mentor-level insights with specific tactical advice. Include confidence
             "property_highlights": self._extract_section_content(content, "highlights", "Good bones, established neighborhood, rental potential.")
         }
 
-    def _extract_ownership_analysis(self, content: str, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_ownership_analysis(self, content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract ownership motivation insights"""
         owner_info = property_data.get('owner', {})
         property_address = property_data.get('address', {}).get('formatted_address', '')
@@ -649,7 +1162,7 @@ Provide mentor-level insights with specific tactical advice. Include confidence
             "seller_profile": self._extract_section_content(content, "seller profile", "Long-term owner, likely looking for exit opportunity.")
         }
 
-    def _extract_equity_analysis(self, content: str, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_equity_analysis(self, content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract equity and valuation insights"""
         valuation = property_data.get('valuation', {})
         property_details = property_data.get('property', {})
@@ -664,7 +1177,7 @@ Provide mentor-level insights with specific tactical advice. Include confidence
             "valuation_confidence": self._extract_section_content(content, "valuation confidence", "Moderate confidence in AVM accuracy.")
         }
 
-    def _extract_strategy_analysis(self, content: str, property_data: Dict[str, Any]) -> Dict[str, str]:
+    def _extract_strategy_analysis(self, content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, str]:
         """Extract investment strategy insights"""
         return {
             "flip_potential_rating": self._extract_section_content(content, "flip potential", "B - Good flip potential"),
@@ -674,7 +1187,7 @@ Provide mentor-level insights with specific tactical advice. Include confidence
             "ownership_duration_logic": self._extract_section_content(content, "duration logic", "Long ownership suggests good market timing for approach.")
         }
 
-    def _extract_neighborhood_analysis(self, content: str, property_data: Dict[str, Any]) -> Dict[str, str]:
+    def _extract_neighborhood_analysis(self, content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, str]:
         """Extract neighborhood context insights"""
         address = property_data.get('address', {})
         
@@ -686,7 +1199,7 @@ Provide mentor-level insights with specific tactical advice. Include confidence
             "neighborhood_trend": self._extract_section_content(content, "trend", "Stable area with steady demand")
         }
 
-    def _extract_risk_analysis(self, content: str, property_data: Dict[str, Any]) -> Dict[str, str]:
+    def _extract_risk_analysis(self, content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, str]:
         """Extract risk assessment insights"""
         return {
             "age_rehab_risk": self._extract_section_content(content, "age risk", "Moderate rehab needs based on property age"),
@@ -696,7 +1209,7 @@ Provide mentor-level insights with specific tactical advice. Include confidence
             "risk_summary": self._extract_section_content(content, "risk summary", "Moderate risk profile typical for property type and age")
         }
 
-    def _extract_action_analysis(self, content: str, property_data: Dict[str, Any]) -> Dict[str, str]:
+    def _extract_action_analysis(self, content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, str]:
         """Extract investor action insights"""
         return {
             "motivation_to_sell": self._extract_section_content(content, "motivation sell", "Moderate motivation based on ownership profile"),
@@ -705,7 +1218,7 @@ Provide mentor-level insights with specific tactical advice. Include confidence
             "contact_timing": self._extract_section_content(content, "timing", "Good timing for owner outreach")
         }
 
-    def _extract_bonus_analysis(self, content: str, property_data: Dict[str, Any]) -> Dict[str, str]:
+    def _extract_bonus_analysis(self, content: ResponseText, property_data: Dict[str, Any]) -> Dict[str, str]:
         """Extract bonus analytics insights"""
         return {
             "off_market_probability": self._extract_section_content(content, "off market", "6/10 - Moderate off-market potential"),
@@ -735,68 +1248,41 @@ Best regards,
 [Your Phone]"""
 
     # Helper methods
-    def _extract_section_content(self, content: str, section_keyword: str, default: str) -> str:
+    def _extract_section_content(self, content: ResponseText, section_keyword: str, default: str) -> str:
         """Extract content from a specific section"""
-        lines = content.split('\n')
-        for i, line in enumerate(lines):
-            if section_keyword.lower() in line.lower():
-                # Look for content in next few lines
-                section_content = []
-                for j in range(i+1, min(i+4, len(lines))):
-                    if lines[j].strip() and not lines[j].startswith('#'):
-                        section_content.append(lines[j].strip())
-                
-                if section_content:
-                    return ' '.join(section_content)
-        
-        return default
+        # Look for content in the few lines after the keyword
+        return SectionIndex.of(content).following_lines(section_keyword, default)
 
-    def _extract_motivation_score(self, content: str) -> int:
+    def _extract_motivation_score(self, content: ResponseText) -> int:
         """Extract motivation score from content"""
-        import re
+        response_index = SectionIndex.of(content)
+        
         # Look for motivation score patterns
-        score_match = re.search(r'motivation.*?(\d+)/10', content, re.IGNORECASE)
+        score_match = _MOTIVATION_SCORE_PATTERN.search(response_index.content)
         if score_match:
             return int(score_match.group(1))
         
         # Default scoring logic based on keywords
-        if 'high motivation' in content.lower():
+        if response_index.contains('high motivation'):
             return 8
-        elif 'moderate motivation' in content.lower():
+        elif response_index.contains('moderate motivation'):
             return 6
-        elif 'low motivation' in content.lower():
+        elif response_index.contains('low motivation'):
             return 3
         
         return 5  # Default moderate score
 
     def _calculate_ownership_years(self, last_sale_date: Optional[str]) -> Optional[float]:
         """Calculate years of ownership"""
-        if not last_sale_date:
-            return None
-        
-        try:
-            from datetime import datetime
-            sale_date = datetime.strptime(last_sale_date, '%Y-%m-%d')
-            years = (datetime.now() - sale_date).days / 365.25
-            return round(years, 1)
-        except:
-            return None
+        return ownership_duration_years(last_sale_date)
 
     def _is_absentee_owner(self, property_address: str, owner_address: str) -> bool:
-        """Determine if owner is absentee"""
-        if not property_address or not owner_address:
-            return False
-        
-        # Simple comparison - in production, use proper address normalization
-        prop_parts = property_address.lower().split()
-        owner_parts = owner_address.lower().split()
-        
-        # Check if addresses share common elements
-        common_elements = set(prop_parts) & set(owner_parts)
-        return len(common_elements) < 2  # Rough heuristic
+        """Determine if owner is absentee (mailing address is not the property)"""
+        return is_absentee_owner(owner_address, property_address)
 
     def _generate_fallback_analysis(self, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate fallback analysis when AI is unavailable"""
+        AI_FALLBACKS.inc("legacy")
         return {
             "property_overview": {
                 "ai_summary": "Property analysis is temporarily unavailable. Please try again later.",
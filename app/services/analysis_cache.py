@@ -0,0 +1,231 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def analysis_fingerprint(prompt_fields: Dict[str, Any], model: str, prompt_version: str) -> str:
+    """Stable hash of everything that determines an AI analysis result"""
+    payload = json.dumps(
+        {"fields": prompt_fields, "model": model, "prompt_version": prompt_version},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedAnalysis:
+    """AI insights loaded from the analysis cache"""
+    insights: Dict[str, Any]
+    created_at: float
+    age_seconds: float
+    is_fresh: bool
+
+
+class AnalysisCache:
+    """
+    SQLite-backed cache of AI insight dicts keyed by property fingerprint
+
+    Entries younger than `ttl_seconds` are fresh. Entries up to
+    `ttl_seconds + stale_seconds` old are still served, but callers should
+    refresh them in the background (stale-while-revalidate). Entries also
+    record the property they describe, so when Claude is slow or down the
+    latest analysis of a property can be served whatever its inputs.
+
+    Rows are kept for `retention_seconds` (at least `ttl_seconds +
+    stale_seconds`) and deleted once every `prune_every` writes.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+        stale_seconds: Optional[float] = None,
+        retention_seconds: Optional[float] = None,
+        prune_every: Optional[int] = None
+    ):
+        self.path = path or settings.ANALYSIS_CACHE_PATH
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.ANALYSIS_CACHE_TTL_SECONDS
+        self.stale_seconds = stale_seconds if stale_seconds is not None else settings.ANALYSIS_CACHE_STALE_SECONDS
+        retention_seconds = (
+            retention_seconds if retention_seconds is not None else settings.ANALYSIS_CACHE_RETENTION_SECONDS
+        )
+        self.retention_seconds = max(retention_seconds, self.ttl_seconds + self.stale_seconds)
+        self.prune_every = prune_every or settings.ANALYSIS_CACHE_PRUNE_EVERY
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fallback_hits = 0
+        self.pruned = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database and create the schema if needed"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                fingerprint TEXT PRIMARY KEY,
+                insights TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                property_key TEXT
+            )
+            """
+        )
+        # Databases created before property keys were recorded
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(analysis_cache)")}
+        if "property_key" not in columns:
+            conn.execute("ALTER TABLE analysis_cache ADD COLUMN property_key TEXT")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS analysis_cache_property ON analysis_cache (property_key, created_at)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS analysis_cache_created ON analysis_cache (created_at)")
+        conn.commit()
+        return conn
+
+    def _get_sync(self, fingerprint: str) -> Optional[CachedAnalysis]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT insights, created_at FROM analysis_cache WHERE fingerprint = ?",
+                (fingerprint,)
+            ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        insights_json, created_at = row
+        age_seconds = max(0.0, time.time() - created_at)
+        if age_seconds > self.ttl_seconds + self.stale_seconds:
+            self.misses += 1
+            return None
+
+        is_fresh = age_seconds <= self.ttl_seconds
+        if is_fresh:
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+
+        return CachedAnalysis(
+            insights=json.loads(insights_json),
+            created_at=created_at,
+            age_seconds=age_seconds,
+            is_fresh=is_fresh
+        )
+
+    def _get_latest_sync(self, property_key: str) -> Optional[CachedAnalysis]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT insights, created_at FROM analysis_cache WHERE property_key = ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (property_key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        self.fallback_hits += 1
+        insights_json, created_at = row
+        age_seconds = max(0.0, time.time() - created_at)
+        return CachedAnalysis(
+            insights=json.loads(insights_json),
+            created_at=created_at,
+            age_seconds=age_seconds,
+            is_fresh=age_seconds <= self.ttl_seconds
+        )
+
+    def _set_sync(self, fingerprint: str, insights: Dict[str, Any], property_key: Optional[str]) -> None:
+        payload = json.dumps(insights, default=str)
+        with self._lock:
+            now = time.time()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (fingerprint, insights, created_at, property_key) "
+                "VALUES (?, ?, ?, ?)",
+                (fingerprint, payload, now, property_key)
+            )
+            self._writes += 1
+            pruned = self._prune_locked(now) if self._writes % self.prune_every == 0 else 0
+            self._conn.commit()
+        if pruned:
+            logger.info(f"Pruned {pruned} analysis cache entries older than {self.retention_seconds:g}s")
+
+    def _prune_locked(self, now: float) -> int:
+        """Delete rows past the retention window; the caller holds the lock and commits"""
+        pruned = self._conn.execute(
+            "DELETE FROM analysis_cache WHERE created_at < ?",
+            (now - self.retention_seconds,)
+        ).rowcount
+        self.pruned += pruned
+        return pruned
+
+    async def get(self, fingerprint: str) -> Optional[CachedAnalysis]:
+        """Load a fresh or stale-but-usable analysis, or None on miss/expiry"""
+        try:
+            return await asyncio.to_thread(self._get_sync, fingerprint)
+        except sqlite3.Error as e:
+            logger.error(f"Analysis cache read failed: {str(e)}")
+            return None
+
+    async def get_latest(self, property_key: str) -> Optional[CachedAnalysis]:
+        """
+        Most recent analysis stored for a property, whatever its fingerprint and up to
+        `retention_seconds` old
+
+        Only for degraded serving when a fresh analysis cannot be produced in time.
+        """
+        try:
+            return await asyncio.to_thread(self._get_latest_sync, property_key)
+        except sqlite3.Error as e:
+            logger.error(f"Analysis cache read failed: {str(e)}")
+            return None
+
+    async def set(self, fingerprint: str, insights: Dict[str, Any], property_key: Optional[str] = None) -> None:
+        """
+        Store an analysis result
+
+        Args:
+            fingerprint: Cache key from analysis_fingerprint()
+            insights: AI insights to store
+            property_key: Canonical address of the property, for get_latest()
+        """
+        try:
+            await asyncio.to_thread(self._set_sync, fingerprint, insights, property_key)
+        except sqlite3.Error as e:
+            logger.error(f"Analysis cache write failed: {str(e)}")
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for health reporting"""
+        return {
+            "path": self.path,
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+            "retention_seconds": self.retention_seconds,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "fallback_hits": self.fallback_hits,
+            "pruned": self.pruned
+        }
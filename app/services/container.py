@@ -0,0 +1,124 @@
+import logging
+from typing import List, Optional
+
+import anthropic
+
+from app.config import settings
+from app.services.ai_analyzer import AIAnalyzer, LegendaryAIAnalyzer, create_anthropic_client
+from app.services.analysis_cache import AnalysisCache
+from app.services.estated_client import EstatedClient, create_http_client
+from app.services.job_queue import ReportJobQueue
+from app.services.metrics import MetricFamily, stats_family
+from app.services.prompt_cache import prompt_cache_usage
+from app.services.property_cache import PropertyCache
+from app.services.rate_limiter import AnthropicGovernor
+from app.services.report_generator import LegendaryReportGenerator, ReportGenerator
+from app.services.resilience import CIRCUIT_CLOSED
+from app.services.rule_based import RuleBasedAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """
+    Process-wide service graph, built once at startup
+
+    Owns one pooled Estated client, one Anthropic client with its request
+    governor and one set of caches, and wires them into the analyzers and
+    generators so every endpoint (including the legacy `legendary_format=True`
+    path and background jobs) shares them.
+    """
+
+    def __init__(self, anthropic_client: Optional[anthropic.AsyncAnthropic] = None):
+        # Shared clients and caches
+        self.property_cache = PropertyCache()
+        self.estated_client = EstatedClient(http_client=create_http_client(), cache=self.property_cache)
+        self.anthropic_client = anthropic_client or create_anthropic_client()
+        self.anthropic_governor = AnthropicGovernor()
+        self.analysis_cache = AnalysisCache() if settings.ANALYSIS_CACHE_ENABLED else None
+
+        # Analyzers (rule-based insights double as the fallback when Claude is slow or down)
+        self.rule_based_analyzer = RuleBasedAnalyzer()
+        self.legendary_ai_analyzer = LegendaryAIAnalyzer(
+            client=self.anthropic_client,
+            analysis_cache=self.analysis_cache,
+            governor=self.anthropic_governor,
+            rule_based_analyzer=self.rule_based_analyzer
+        )
+        self.ai_analyzer = AIAnalyzer(client=self.anthropic_client, governor=self.anthropic_governor)
+
+        # Generators
+        self.legendary_generator = LegendaryReportGenerator(
+            estated_client=self.estated_client,
+            legendary_ai_analyzer=self.legendary_ai_analyzer,
+            rule_based_analyzer=self.rule_based_analyzer
+        )
+        self.report_generator = ReportGenerator(
+            estated_client=self.estated_client,
+            ai_analyzer=self.ai_analyzer,
+            legendary_generator=self.legendary_generator
+        )
+
+        # Background report jobs
+        self.job_queue = ReportJobQueue(self.legendary_generator)
+
+    async def start(self) -> None:
+        """Start background workers (resumes any jobs left unfinished by the last run)"""
+        await self.job_queue.start()
+
+    def metric_families(self) -> List[MetricFamily]:
+        """
+        Scrape-time metrics read from the counters the services already keep
+
+        Cache, token and queue counters are maintained by the services
+        themselves, so exporting them adds nothing to the request path.
+        """
+        property_cache = self.property_cache.stats()
+        usage = prompt_cache_usage.stats()
+        governor = self.anthropic_governor.stats()
+        cache_hits = {
+            (("cache", "property"),): property_cache["hits"],
+        }
+        cache_misses = {
+            (("cache", "property"),): property_cache["misses"],
+        }
+        if self.analysis_cache is not None:
+            analysis_cache = self.analysis_cache.stats()
+            cache_hits[(("cache", "analysis"),)] = (
+                analysis_cache["hits"] + analysis_cache["stale_hits"] + analysis_cache["fallback_hits"]
+            )
+            cache_misses[(("cache", "analysis"),)] = analysis_cache["misses"]
+
+        return [
+            stats_family("alyprop_cache_hits_total", "counter", "Cache lookups answered from the cache", cache_hits),
+            stats_family("alyprop_cache_misses_total", "counter", "Cache lookups that missed", cache_misses),
+            stats_family("alyprop_anthropic_tokens_total", "counter", "Claude tokens by kind", {
+                (("kind", "input"),): usage["input_tokens"],
+                (("kind", "output"),): usage["output_tokens"],
+                (("kind", "cache_creation_input"),): usage["cache_creation_input_tokens"],
+                (("kind", "cache_read_input"),): usage["cache_read_input_tokens"],
+            }),
+            stats_family("alyprop_anthropic_requests_in_flight", "gauge", "Claude requests holding a governor slot", {
+                (): governor["in_flight"],
+            }),
+            stats_family("alyprop_anthropic_queue_depth", "gauge", "Claude requests waiting for a governor slot", {
+                (): governor["queue_depth"],
+            }),
+            stats_family("alyprop_anthropic_rate_limited_total", "counter", "Claude 429 responses", {
+                (): governor["rate_limited"],
+            }),
+            stats_family("alyprop_report_jobs_queued", "gauge", "Background report jobs waiting for a worker", {
+                (): self.job_queue.stats()["queued"],
+            }),
+            stats_family("alyprop_estated_circuit_open", "gauge", "1 while the Estated circuit breaker is open", {
+                (): int(self.estated_client.circuit_breaker.state != CIRCUIT_CLOSED),
+            }),
+        ]
+
+    async def close(self) -> None:
+        """Stop workers and release connections and cache handles"""
+        await self.job_queue.stop()
+        await self.estated_client.close()
+        await self.anthropic_client.close()
+        if self.analysis_cache is not None:
+            self.analysis_cache.close()
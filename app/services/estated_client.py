@@ -1,59 +1,286 @@
+import asyncio
 import httpx
-from typing import Optional, Dict, Any
+import importlib.util
+from typing import Optional, Dict, Any, Iterable, AsyncIterator, List, Tuple
 import logging
 from app.config import settings
+from app.services.address import canonical_address_key
+from app.services.metrics import ESTATED_IN_FLIGHT, STAGE_SECONDS
+from app.services.property_cache import PropertyCache
+from app.services.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from app.services.tracing import span
 
 logger = logging.getLogger(__name__)
 
+# Responses worth retrying: rate limiting and server-side failures
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class EstatedUnavailableError(Exception):
+    """Raised when Estated cannot answer (transient failures, open circuit, rejected requests)"""
+
+
+class _RetryableStatusError(Exception):
+    """Internal marker for an Estated response with a retryable status code"""
+    
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"Estated API error: {response.status_code}")
+        self.response = response
+
+
+def _is_transient(error: Exception) -> bool:
+    return isinstance(error, (httpx.TransportError, _RetryableStatusError, asyncio.TimeoutError))
+
+
+def _present(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop empty values so readers' `.get(name, default)` fallbacks apply"""
+    return {name: value for name, value in fields.items() if value not in (None, "")}
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Build the pooled HTTP client used for all Estated requests
+    
+    Connection-pool limits, keep-alive and per-phase timeouts come from settings.
+    HTTP/2 needs the `h2` package (installed by `httpx[http2]`); without it the
+    client falls back to HTTP/1.1.
+    """
+    http2_enabled = settings.ESTATED_HTTP2
+    if http2_enabled and importlib.util.find_spec("h2") is None:
+        logger.warning("ESTATED_HTTP2=true but the h2 package is not installed; using HTTP/1.1 for Estated")
+        http2_enabled = False
+    
+    return httpx.AsyncClient(
+        http2=http2_enabled,
+        limits=httpx.Limits(
+            max_connections=settings.ESTATED_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.ESTATED_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.ESTATED_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.ESTATED_CONNECT_TIMEOUT,
+            read=settings.ESTATED_READ_TIMEOUT,
+            write=settings.ESTATED_WRITE_TIMEOUT,
+            pool=settings.ESTATED_POOL_TIMEOUT
+        )
+    )
+
 
 class EstatedClient:
     """Client for Estated API integration"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[PropertyCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
         self.base_url = settings.ESTATED_BASE_URL
         self.api_key = settings.ESTATED_API_KEY
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        self._http_client = http_client
+        self.cache = cache or PropertyCache()
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=settings.ESTATED_RETRY_ATTEMPTS,
+            base_delay=settings.ESTATED_RETRY_BASE_DELAY,
+            max_delay=settings.ESTATED_RETRY_MAX_DELAY,
+            deadline_seconds=settings.ESTATED_RETRY_DEADLINE_SECONDS
+        )
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            "Estated",
+            failure_threshold=settings.ESTATED_CIRCUIT_FAILURE_THRESHOLD,
+            reset_seconds=settings.ESTATED_CIRCUIT_RESET_SECONDS
+        )
+    
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Shared pooled HTTP client, created on first use if none was injected"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = create_http_client()
+        return self._http_client
+    
+    async def close(self) -> None:
+        """Close the pooled HTTP client and release its connections"""
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+        self._http_client = None
     
     async def get_property_data(self, address: str) -> Optional[Dict[str, Any]]:
         """
-        Fetch comprehensive property data from Estated API
+        Fetch comprehensive property data, served from the property cache when possible
         
         Args:
             address: Property address to lookup
             
+        Transient failures (timeouts, connection errors, 429/5xx) are retried with
+        jittered backoff within a total deadline. Repeated failures open a circuit
+        breaker so later lookups fail fast until Estated recovers.
+        
         Returns:
             Dictionary containing property data or None if not found
+            
+        Raises:
+            EstatedUnavailableError: If Estated is failing or the circuit is open
+        """
+        with span("estated.get_property_data", address=address) as current:
+            found, property_data = self.cache.get(address)
+            current.set_attribute("cache_hit", found)
+            if found:
+                return property_data
+            
+            return await self._fetch_property_data(address)
+    
+    async def get_property_data_bulk(
+        self,
+        addresses: Iterable[str],
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]], Optional[Exception]]]:
         """
+        Look up many addresses, yielding results as they arrive
+        
+        Addresses are deduplicated by canonical key, cached entries are yielded
+        first, and the rest are fetched through the pooled client with at most
+        `concurrency` requests in flight. Every input address is yielded once,
+        duplicates together with the lookup they share.
+        
+        Args:
+            addresses: Property addresses to look up
+            concurrency: Max concurrent Estated requests (defaults to BATCH_ESTATED_CONCURRENCY)
+            
+        Yields:
+            Tuples of (address, property data or None if not found, error or None)
+        """
+        concurrency = concurrency or settings.BATCH_ESTATED_CONCURRENCY
+        
+        # Group inputs by normalized key so each property is fetched once
+        groups: Dict[str, List[str]] = {}
+        for address in addresses:
+            groups.setdefault(canonical_address_key(address), []).append(address)
+        
+        to_fetch: List[List[str]] = []
+        for group in groups.values():
+            found, property_data = self.cache.get(group[0])
+            if not found:
+                to_fetch.append(group)
+                continue
+            for address in group:
+                yield address, property_data, None
+        
+        if not to_fetch:
+            return
+        
+        pending = iter(to_fetch)
+        worker_count = min(concurrency, len(to_fetch))
+        results: asyncio.Queue = asyncio.Queue(maxsize=worker_count)
+        done_marker = object()
+        
+        async def worker() -> None:
+            for group in pending:
+                try:
+                    outcome = (group, await self._fetch_property_data(group[0]), None)
+                except Exception as e:
+                    # Report any failure as this group's error: a dead worker would
+                    # never send its done marker and the consumer would wait forever
+                    if not isinstance(e, EstatedUnavailableError):
+                        logger.error(f"Bulk lookup failed for {group[0]}: {str(e) or type(e).__name__}")
+                    outcome = (group, None, e)
+                await results.put(outcome)
+            await results.put(done_marker)
+        
+        workers = [asyncio.create_task(worker()) for _ in range(worker_count)]
         try:
-            async with httpx.AsyncClient() as client:
-                # Use Estated's property search endpoint
-                response = await client.get(
-                    f"{self.base_url}/property",
-                    headers=self.headers,
-                    params={"address": address}
+            finished = 0
+            while finished < worker_count:
+                outcome = await results.get()
+                if outcome is done_marker:
+                    finished += 1
+                    continue
+                group, property_data, error = outcome
+                for address in group:
+                    yield address, property_data, error
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+    
+    async def _fetch_property_data(self, address: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch property data from Estated (bypassing the cache read) and cache the result
+        
+        Raises:
+            EstatedUnavailableError: If Estated is failing, the circuit is open or
+                the request was rejected (any status other than 200/404)
+        """
+        ESTATED_IN_FLIGHT.inc()
+        try:
+            with STAGE_SECONDS.time("estated_fetch"):
+                response = await self.circuit_breaker.call(
+                    lambda: self.retry_policy.run(lambda: self._request_property(address), _is_transient)
                 )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    return self._parse_property_response(data)
-                elif response.status_code == 404:
-                    logger.warning(f"Property not found for address: {address}")
-                    return None
-                else:
-                    logger.error(f"Estated API error: {response.status_code} - {response.text}")
-                    return None
-                    
+        except CircuitOpenError as e:
+            raise EstatedUnavailableError(str(e)) from e
         except Exception as e:
-            logger.error(f"Error fetching property data: {str(e)}")
+            if not _is_transient(e):
+                raise
+            logger.error(f"Estated unavailable for {address}: {str(e) or type(e).__name__}")
+            raise EstatedUnavailableError("Property data service is temporarily unavailable") from e
+        finally:
+            ESTATED_IN_FLIGHT.dec()
+        
+        if response.status_code == 404:
+            logger.warning(f"Property not found for address: {address}")
+            self.cache.set(address, None)
             return None
+        if response.status_code != 200:
+            # 400/401/403/422...: a rejected request or bad credentials, not a missing property
+            logger.error(f"Estated API error: {response.status_code} - {response.text}")
+            raise EstatedUnavailableError(f"Property data service rejected the request (HTTP {response.status_code})")
+        
+        try:
+            data = response.json()
+        except ValueError as e:
+            logger.error(f"Unreadable Estated response for {address}: {str(e)}")
+            raise EstatedUnavailableError("Property data service returned an unreadable response") from e
+        
+        property_data = self._parse_property_response(data)
+        if property_data:
+            # Analyses are keyed on the property's address; fall back to the one requested
+            property_data["address"].setdefault("formatted_address", address)
+            self.cache.set(address, property_data)
+        return property_data
+    
+    async def _request_property(self, address: str) -> httpx.Response:
+        """
+        One Estated property lookup (an idempotent GET, so safe to retry)
+        
+        Raises:
+            _RetryableStatusError: For 429/5xx responses
+            httpx.TransportError: On connection or timeout failures
+        """
+        # Use Estated's property search endpoint
+        response = await self.http_client.get(
+            f"{self.base_url}/property",
+            headers=self.headers,
+            params={"address": address}
+        )
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            raise _RetryableStatusError(response)
+        return response
     
     def _parse_property_response(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Parse and standardize Estated API response
         
+        The result is the one property shape the rest of the service reads:
+        `address` (formatted_address, street, city, state, zip, county),
+        `property` (structure, parcel and last-sale fields), `owner` (name,
+        mailing_address) and `valuation` (avm, tax_assessed_value,
+        property_tax_amount). Fields Estated leaves empty are omitted.
+        
         Args:
             data: Raw API response
             
@@ -69,34 +296,52 @@ class EstatedClient:
             else:
                 return {}
             
+            address = property_data.get("address") or {}
+            parcel = property_data.get("parcel") or {}
+            structure = property_data.get("structure") or {}
+            owner = property_data.get("owner") or {}
+            valuation = property_data.get("valuation") or {}
+            tax = property_data.get("tax") or {}
+            
             # Extract standardized fields
             parsed_data = {
-                # Basic property info
-                "full_address": property_data.get("address", {}).get("formatted_street_address", ""),
-                "parcel_id": property_data.get("parcel", {}).get("apn_original", ""),
-                "property_type": self._map_property_type(property_data.get("structure", {}).get("property_type", "")),
-                "year_built": property_data.get("structure", {}).get("year_built"),
-                "square_footage": property_data.get("structure", {}).get("total_area_sq_ft"),
-                "lot_size": property_data.get("parcel", {}).get("area_acres"),
-                "bedrooms": property_data.get("structure", {}).get("beds_count"),
-                "bathrooms": property_data.get("structure", {}).get("baths_total"),
-                "legal_description": property_data.get("parcel", {}).get("legal_description", ""),
-                
                 # Location info
-                "city": property_data.get("address", {}).get("city", ""),
-                "zip_code": property_data.get("address", {}).get("zip_code", ""),
-                "county": property_data.get("address", {}).get("county", ""),
+                "address": _present({
+                    "formatted_address": self._format_property_address(address),
+                    "street": address.get("formatted_street_address"),
+                    "city": address.get("city"),
+                    "state": address.get("state"),
+                    "zip": address.get("zip_code"),
+                    "county": address.get("county")
+                }),
+                
+                # Basic property info and sale history
+                "property": _present({
+                    "parcel_id": parcel.get("apn_original"),
+                    "apn": parcel.get("apn_original"),
+                    "property_type": self._map_property_type(structure.get("property_type") or ""),
+                    "year_built": structure.get("year_built"),
+                    "sqft": structure.get("total_area_sq_ft"),
+                    "lot_size": parcel.get("area_acres"),
+                    "bedrooms": structure.get("beds_count"),
+                    "bathrooms": structure.get("baths_total"),
+                    "legal_description": parcel.get("legal_description"),
+                    "last_sale_price": valuation.get("last_sale_price"),
+                    "last_sale_date": valuation.get("last_sale_date")
+                }),
                 
                 # Ownership info
-                "owner_name": property_data.get("owner", {}).get("name", ""),
-                "owner_mailing_address": self._format_owner_address(property_data.get("owner", {})),
+                "owner": _present({
+                    "name": owner.get("name"),
+                    "mailing_address": self._format_owner_address(owner)
+                }),
                 
                 # Financial info
-                "last_sale_price": property_data.get("valuation", {}).get("last_sale_price"),
-                "last_sale_date": property_data.get("valuation", {}).get("last_sale_date"),
-                "estimated_value": property_data.get("valuation", {}).get("estimate"),
-                "tax_assessed_value": property_data.get("tax", {}).get("assessed_value"),
-                "property_tax_amount": property_data.get("tax", {}).get("total_taxes"),
+                "valuation": _present({
+                    "avm": valuation.get("estimate"),
+                    "tax_assessed_value": tax.get("assessed_value"),
+                    "property_tax_amount": tax.get("total_taxes")
+                }),
                 
                 # Raw data for AI analysis
                 "raw_data": property_data
@@ -108,6 +353,16 @@ class EstatedClient:
             logger.error(f"Error parsing property response: {str(e)}")
             return {}
     
+    def _format_property_address(self, address_data: Dict[str, Any]) -> str:
+        """Format the property address as "street, city, state zip" from Estated data ("" without a street)"""
+        if not address_data.get("formatted_street_address"):
+            return ""
+        state_zip = " ".join(
+            part for part in (address_data.get("state"), address_data.get("zip_code")) if part
+        )
+        parts = [address_data.get("formatted_street_address"), address_data.get("city"), state_zip]
+        return ", ".join(part for part in parts if part)
+    
     def _map_property_type(self, estated_type: str) -> str:
         """Map Estated property types to our standard types"""
         type_mapping = {
@@ -144,12 +399,11 @@ class EstatedClient:
     async def health_check(self) -> bool:
         """Check if Estated API is accessible"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/health",
-                    headers=self.headers,
-                    timeout=10.0
-                )
-                return response.status_code == 200
+            response = await self.http_client.get(
+                f"{self.base_url}/health",
+                headers=self.headers,
+                timeout=10.0
+            )
+            return response.status_code == 200
         except Exception:
             return False
\ No newline at end of file
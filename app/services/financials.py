@@ -0,0 +1,174 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+from app.config import settings
+
+try:
+    import numpy as np
+except ImportError:  # Batch calculations are optional
+    np = None
+
+
+@dataclass(frozen=True)
+class FinancialAssumptions:
+    """
+    Market assumptions behind the computed financial metrics
+
+    Rates are annual fractions unless noted. Defaults come from the FINANCIAL_*
+    settings so deployments can tune them per market.
+    """
+    rent_to_value_monthly: float = settings.FINANCIAL_RENT_TO_VALUE_MONTHLY
+    vacancy_rate: float = settings.FINANCIAL_VACANCY_RATE
+    expense_ratio: float = settings.FINANCIAL_EXPENSE_RATIO
+    property_tax_rate: float = settings.FINANCIAL_PROPERTY_TAX_RATE
+    insurance_rate: float = settings.FINANCIAL_INSURANCE_RATE
+    maintenance_rate: float = settings.FINANCIAL_MAINTENANCE_RATE
+    mortgage_rate: float = settings.FINANCIAL_MORTGAGE_RATE
+    loan_term_years: int = settings.FINANCIAL_LOAN_TERM_YEARS
+    down_payment_ratio: float = settings.FINANCIAL_DOWN_PAYMENT_RATIO
+    closing_cost_ratio: float = settings.FINANCIAL_CLOSING_COST_RATIO
+
+
+# The formulas below use plain arithmetic only, so each accepts floats or
+# NumPy arrays (one element per property) interchangeably.
+
+def monthly_rent(value: Any, assumptions: FinancialAssumptions) -> Any:
+    """Market rent estimated from value with the rent-to-value ratio"""
+    return value * assumptions.rent_to_value_monthly
+
+
+def net_operating_income(rent: Any, assumptions: FinancialAssumptions) -> Any:
+    """Annual NOI: rent less vacancy, less operating expenses as a share of collected rent"""
+    return rent * 12 * (1 - assumptions.vacancy_rate) * (1 - assumptions.expense_ratio)
+
+
+def annual_debt_service(price: Any, assumptions: FinancialAssumptions) -> Any:
+    """Annual principal and interest on a fixed-rate loan for the financed share of `price`"""
+    loan = price * (1 - assumptions.down_payment_ratio)
+    payments = assumptions.loan_term_years * 12
+    monthly_rate = assumptions.mortgage_rate / 12
+    if monthly_rate == 0:
+        return loan / payments * 12
+    return loan * monthly_rate / (1 - (1 + monthly_rate) ** -payments) * 12
+
+
+def cash_on_cash_return(noi: Any, price: Any, assumptions: FinancialAssumptions) -> Any:
+    """Annual pre-tax cash flow after debt service over cash invested (down payment + closing)"""
+    cash_invested = price * (assumptions.down_payment_ratio + assumptions.closing_cost_ratio)
+    return (noi - annual_debt_service(price, assumptions)) / cash_invested
+
+
+def monthly_carrying_costs(value: Any, annual_tax: Any, assumptions: FinancialAssumptions) -> Any:
+    """Monthly property tax, insurance and maintenance"""
+    return (annual_tax + value * (assumptions.insurance_rate + assumptions.maintenance_rate)) / 12
+
+
+def _positive(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+def compute_financial_metrics(
+    property_data: Dict[str, Any],
+    assumptions: Optional[FinancialAssumptions] = None
+) -> Dict[str, Optional[float]]:
+    """
+    Deterministic valuation and income metrics for one property
+
+    Args:
+        property_data: Property record as parsed by EstatedClient (`property.sqft`,
+            `property.last_sale_price`, `valuation.avm`, `valuation.property_tax_amount`)
+        assumptions: Market assumptions (defaults from settings)
+
+    Returns:
+        Metrics keyed by name; a metric is None when its inputs are missing.
+        Rates (`cap_rate`, `cash_on_cash_return`) are percentages.
+    """
+    assumptions = assumptions or FinancialAssumptions()
+    property_details = property_data.get('property', {})
+    valuation = property_data.get('valuation', {})
+
+    avm = _positive(valuation.get('avm'))
+    last_sale = _positive(property_details.get('last_sale_price'))
+    sqft = _positive(property_details.get('sqft'))
+    annual_tax = _positive(valuation.get('property_tax_amount'))
+
+    metrics: Dict[str, Optional[float]] = {
+        "price_per_sqft_current": round(avm / sqft, 2) if avm and sqft else None,
+        "price_per_sqft_historical": round(last_sale / sqft, 2) if last_sale and sqft else None,
+        "estimated_equity": avm - last_sale if avm and last_sale else None,
+        "monthly_rent": None,
+        "noi": None,
+        "cap_rate": None,
+        "cash_on_cash_return": None,
+        "monthly_carrying_costs": None,
+    }
+    if not avm:
+        return metrics
+
+    if annual_tax is None:
+        annual_tax = avm * assumptions.property_tax_rate
+    rent = monthly_rent(avm, assumptions)
+    noi = net_operating_income(rent, assumptions)
+    metrics.update({
+        "monthly_rent": round(rent, 2),
+        "noi": round(noi, 2),
+        "cap_rate": round(noi / avm * 100, 2),
+        "cash_on_cash_return": round(cash_on_cash_return(noi, avm, assumptions) * 100, 2),
+        "monthly_carrying_costs": round(monthly_carrying_costs(avm, annual_tax, assumptions), 2),
+    })
+    return metrics
+
+
+def compute_financial_metrics_batch(
+    avm: Sequence[float],
+    last_sale_price: Sequence[float],
+    sqft: Sequence[float],
+    tax_amount: Sequence[float],
+    assumptions: Optional[FinancialAssumptions] = None
+) -> Dict[str, Any]:
+    """
+    Vectorized `compute_financial_metrics` over many properties
+
+    Args:
+        avm, last_sale_price, sqft, tax_amount: Equal-length inputs, one element
+            per property; missing or non-positive values (None/NaN/0) are allowed
+        assumptions: Market assumptions (defaults from settings)
+
+    Returns:
+        Float64 arrays keyed like `compute_financial_metrics`, NaN where the
+        scalar version returns None
+
+    Raises:
+        RuntimeError: If NumPy is not installed
+    """
+    if np is None:
+        raise RuntimeError("compute_financial_metrics_batch requires numpy (pip install numpy)")
+
+    assumptions = assumptions or FinancialAssumptions()
+
+    def column(values: Sequence[float]) -> "np.ndarray":
+        array = np.asarray([np.nan if v is None else v for v in values], dtype=np.float64)
+        return np.where(array > 0, array, np.nan)
+
+    avm_values = column(avm)
+    last_sale_values = column(last_sale_price)
+    sqft_values = column(sqft)
+    tax_values = column(tax_amount)
+    tax_values = np.where(np.isnan(tax_values), avm_values * assumptions.property_tax_rate, tax_values)
+
+    rent = monthly_rent(avm_values, assumptions)
+    noi = net_operating_income(rent, assumptions)
+    return {
+        "price_per_sqft_current": np.round(avm_values / sqft_values, 2),
+        "price_per_sqft_historical": np.round(last_sale_values / sqft_values, 2),
+        "estimated_equity": avm_values - last_sale_values,
+        "monthly_rent": np.round(rent, 2),
+        "noi": np.round(noi, 2),
+        "cap_rate": np.round(noi / avm_values * 100, 2),
+        "cash_on_cash_return": np.round(cash_on_cash_return(noi, avm_values, assumptions) * 100, 2),
+        "monthly_carrying_costs": np.round(monthly_carrying_costs(avm_values, tax_values, assumptions), 2),
+    }
@@ -0,0 +1,277 @@
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional, Dict, Any, List
+
+from app.config import settings
+from app.services.report_generator import LegendaryReportGenerator
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# Attempts at recording a finished job before giving up; a job left "running" is re-run on restart
+FINISH_ATTEMPTS = 3
+FINISH_RETRY_DELAY_SECONDS = 0.5
+
+
+class JobQueueFullError(Exception):
+    """Raised when the report job queue cannot accept more work"""
+
+
+class JobStore:
+    """
+    SQLite persistence for report jobs so queued work survives restarts
+
+    Finished (completed or failed) jobs are kept for `retention_seconds` after
+    their last update and pruned whenever a new job is created.
+    """
+
+    def __init__(self, path: Optional[str] = None, retention_seconds: Optional[float] = None):
+        self.path = path or settings.JOB_STORE_PATH
+        self.retention_seconds = (
+            retention_seconds if retention_seconds is not None else settings.JOB_RETENTION_HOURS * 3600
+        )
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the job database and create the schema if needed"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS report_jobs (
+                job_id TEXT PRIMARY KEY,
+                address TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_report_jobs_status ON report_jobs (status)")
+        conn.commit()
+        return conn
+
+    def _row_to_job(self, row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def _create_sync(self, job_id: str, address: str, priority: int) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            pruned = self._prune_locked(now) if self.retention_seconds > 0 else 0
+            self._conn.execute(
+                "INSERT INTO report_jobs (job_id, address, priority, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, address, priority, JOB_QUEUED, now, now)
+            )
+            self._conn.commit()
+        if pruned:
+            logger.info(f"Pruned {pruned} finished report jobs older than {self.retention_seconds / 3600:g}h")
+        return {
+            "job_id": job_id, "address": address, "priority": priority, "status": JOB_QUEUED,
+            "result": None, "error": None, "created_at": now, "updated_at": now
+        }
+
+    def _prune_locked(self, now: float) -> int:
+        """Delete finished jobs past the retention window; the caller holds the lock and commits"""
+        return self._conn.execute(
+            "DELETE FROM report_jobs WHERE status IN (?, ?) AND updated_at < ?",
+            (JOB_COMPLETED, JOB_FAILED, now - self.retention_seconds)
+        ).rowcount
+
+    def _update_sync(self, job_id: str, status: str, result: Optional[str], error: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE report_jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE job_id = ?",
+                (status, result, error, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def _get_sync(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM report_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def _list_unfinished_sync(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM report_jobs WHERE status IN (?, ?) ORDER BY priority, created_at",
+                (JOB_QUEUED, JOB_RUNNING)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    async def create(self, job_id: str, address: str, priority: int) -> Dict[str, Any]:
+        """Persist a newly queued job"""
+        return await asyncio.to_thread(self._create_sync, job_id, address, priority)
+
+    async def update(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[str] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """Record a job status change, with the serialized report or error message"""
+        await asyncio.to_thread(self._update_sync, job_id, status, result, error)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Load a job by id"""
+        return await asyncio.to_thread(self._get_sync, job_id)
+
+    async def list_unfinished(self) -> List[Dict[str, Any]]:
+        """Jobs that were queued or running when the process last stopped"""
+        return await asyncio.to_thread(self._list_unfinished_sync)
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class ReportJobQueue:
+    """
+    In-process priority queue and worker pool for legendary report jobs
+
+    Lower priority numbers run first; equal priorities run in submission order.
+    New submissions are rejected with JobQueueFullError once `max_queue_size`
+    jobs are waiting. Jobs left unfinished by a previous process are re-queued
+    on start.
+    """
+
+    def __init__(
+        self,
+        generator: LegendaryReportGenerator,
+        store: Optional[JobStore] = None,
+        worker_count: Optional[int] = None,
+        max_queue_size: Optional[int] = None
+    ):
+        self.generator = generator
+        self.store = store or JobStore()
+        self.worker_count = worker_count or settings.JOB_WORKERS
+        self.max_queue_size = max_queue_size or settings.JOB_QUEUE_MAX_SIZE
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._workers: List[asyncio.Task] = []
+        # Submissions past the size check but not yet enqueued (their job row is being written)
+        self._reserved = 0
+
+    async def start(self) -> None:
+        """Re-queue unfinished jobs and start the worker pool"""
+        recovered = await self.store.list_unfinished()
+        for job in recovered:
+            self._enqueue(job["job_id"], job["address"], job["priority"])
+        if recovered:
+            logger.info(f"Recovered {len(recovered)} unfinished report jobs")
+
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def stop(self) -> None:
+        """Stop the workers; jobs still queued or running are resumed on next start"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self.store.close()
+
+    async def submit(self, address: str, priority: int = 5) -> Dict[str, Any]:
+        """
+        Queue a legendary report job
+
+        Raises:
+            JobQueueFullError: If the queue is at capacity
+        """
+        # Reserve the slot before awaiting so concurrent submissions cannot overshoot the limit
+        if self._queue.qsize() + self._reserved >= self.max_queue_size:
+            raise JobQueueFullError(f"Report queue is full ({self.max_queue_size} jobs waiting)")
+        self._reserved += 1
+        try:
+            job = await self.store.create(uuid.uuid4().hex, address, priority)
+            self._enqueue(job["job_id"], address, priority)
+        finally:
+            self._reserved -= 1
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current job state, including the finished report when available"""
+        return await self.store.get(job_id)
+
+    def _enqueue(self, job_id: str, address: str, priority: int) -> None:
+        self._queue.put_nowait((priority, next(self._sequence), job_id, address))
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, job_id, address = await self._queue.get()
+            try:
+                await self._run_job(job_id, address)
+            except Exception as e:
+                # e.g. the job store failed to record a status; keep the worker alive for the next job
+                logger.error(f"Report job {job_id} could not be processed: {str(e) or type(e).__name__}")
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str, address: str) -> None:
+        await self.store.update(job_id, JOB_RUNNING)
+        try:
+            report = await self.generator.generate_legendary_report(address)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Report job {job_id} failed: {str(e)}")
+            await self._finish(job_id, JOB_FAILED, error=str(e))
+            return
+
+        await self._finish(job_id, JOB_COMPLETED, result=report.model_dump_json())
+
+    async def _finish(self, job_id: str, status: str, result: Optional[str] = None, error: Optional[str] = None) -> None:
+        """
+        Record a job's final status, retrying store errors
+
+        A job whose outcome cannot be recorded would stay "running" and be run
+        (and paid for) again after a restart, so if the report itself cannot be
+        stored the job is marked failed instead, as a last resort.
+        """
+        for attempt in range(1, FINISH_ATTEMPTS + 1):
+            try:
+                await self.store.update(job_id, status, result=result, error=error)
+                return
+            except Exception as e:
+                logger.warning(f"Recording {status} for report job {job_id} failed (attempt {attempt}): {str(e)}")
+                if attempt < FINISH_ATTEMPTS:
+                    await asyncio.sleep(FINISH_RETRY_DELAY_SECONDS * attempt)
+
+        if status != JOB_FAILED:
+            try:
+                await self.store.update(job_id, JOB_FAILED, error="Report was generated but could not be stored")
+                return
+            except Exception as e:
+                logger.error(f"Marking report job {job_id} failed also failed: {str(e)}")
+        logger.error(f"Report job {job_id} is still recorded as running and will run again after a restart")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue counters for health reporting"""
+        return {
+            "queued": self._queue.qsize(),
+            "max_queue_size": self.max_queue_size,
+            "workers": len(self._workers)
+        }
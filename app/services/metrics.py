@@ -0,0 +1,244 @@
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Text exposition format served at /metrics
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds; wide enough for both sub-millisecond assembly and multi-second Claude calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class MetricFamily(NamedTuple):
+    """One metric and its samples, as rendered in the exposition format"""
+    name: str
+    kind: str
+    help: str
+    samples: List[Tuple[str, Dict[str, str], float]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Labelled metric; children are keyed by the tuple of label values"""
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        if not labels and self.kind != "histogram":
+            # Unlabelled counters and gauges are exported as 0 before their first update
+            self._values[()] = 0
+        REGISTRY.append(self)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.label_names, key))
+
+    def collect(self) -> MetricFamily:
+        samples = [(self.name, self._labels(key), value) for key, value in self._values.items()]
+        return MetricFamily(self.name, self.kind, self.help, samples)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. requests in flight"""
+    kind = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values over fixed buckets
+
+    Each observation touches a single bucket (found by bisection); the
+    cumulative counts Prometheus expects are only computed when rendering.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        _record(self.buckets, self._series(labels), value)
+
+    def time(self, *labels: str) -> "_Timer":
+        """Context manager observing the duration of its block"""
+        return _Timer(self.buckets, self._series(labels))
+
+    def _series(self, labels: Tuple[str, ...]) -> List[Any]:
+        series = self._values.get(labels)
+        if series is None:
+            # [per-bucket counts (+Inf last), sum, count]
+            series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        return series
+
+    def collect(self) -> MetricFamily:
+        samples = []
+        for key, (counts, total, count) in self._values.items():
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return MetricFamily(self.name, self.kind, self.help, samples)
+
+
+def _record(buckets: Tuple[float, ...], series: List[Any], value: float) -> None:
+    series[0][bisect_left(buckets, value)] += 1
+    series[1] += value
+    series[2] += 1
+
+
+class _Timer:
+    __slots__ = ("buckets", "series", "started")
+
+    def __init__(self, buckets: Tuple[float, ...], series: List[Any]):
+        self.buckets = buckets
+        self.series = series
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _record(self.buckets, self.series, time.perf_counter() - self.started)
+
+
+REGISTRY: List[_Metric] = []
+
+
+def render_metrics(extra: Optional[Iterable[MetricFamily]] = None) -> str:
+    """
+    Every registered metric (plus `extra` families) in the Prometheus text format
+
+    Args:
+        extra: Families collected at scrape time, e.g. cache and queue counters
+            that services already keep
+    """
+    lines = []
+    for family in [metric.collect() for metric in REGISTRY] + list(extra or ()):
+        lines.append(f"# HELP {family.name} {_escape(family.help)}")
+        lines.append(f"# TYPE {family.name} {family.kind}")
+        for name, labels, value in family.samples:
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def stats_family(name: str, kind: str, help: str, values: Dict[Tuple[Tuple[str, str], ...], float]) -> MetricFamily:
+    """Scrape-time family from `{((label, value), ...): sample}` pairs"""
+    return MetricFamily(name, kind, help, [(name, dict(labels), value) for labels, value in values.items()])
+
+
+# Pipeline metrics, shared by every service instance in the process.
+# Updated from the event loop thread only, so no locking is needed.
+STAGE_SECONDS = Histogram(
+    "alyprop_stage_duration_seconds",
+    "Latency of each report pipeline stage",
+    labels=("stage",)
+)
+HTTP_REQUESTS = Counter(
+    "alyprop_http_requests_total",
+    "HTTP requests by route, method and status code",
+    labels=("route", "method", "status")
+)
+HTTP_ERRORS = Counter(
+    "alyprop_http_request_errors_total",
+    "HTTP requests that ended in a 5xx response or an unhandled exception",
+    labels=("route",)
+)
+HTTP_IN_FLIGHT = Gauge(
+    "alyprop_http_requests_in_flight",
+    "HTTP requests currently being handled"
+)
+HTTP_SECONDS = Histogram(
+    "alyprop_http_request_duration_seconds",
+    "End-to-end HTTP request latency (streaming responses included)",
+    labels=("route",)
+)
+AI_FALLBACKS = Counter(
+    "alyprop_ai_fallbacks_total",
+    "Analyses (or legendary sections) served from fallback insights after a Claude failure or missed deadline",
+    labels=("analysis",)
+)
+AI_DEADLINE_EXCEEDED = Counter(
+    "alyprop_ai_deadline_exceeded_total",
+    "Legendary analyses that missed AI_DEADLINE_SECONDS and were served from the cache or rules"
+)
+ESTATED_IN_FLIGHT = Gauge(
+    "alyprop_estated_requests_in_flight",
+    "Estated lookups currently waiting on the upstream API"
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting and timing HTTP requests per route template
+
+    Routes are labelled by their path template ("/property/legendary/jobs/{job_id}"),
+    never the raw path, so label cardinality stays bounded. The template is only
+    known once routing has run, so the in-flight gauge is a single total.
+
+    Implemented as plain ASGI rather than `BaseHTTPMiddleware` to keep the
+    per-request overhead to a few microseconds and leave streaming responses
+    untouched.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc()
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            route_label = route.path if route is not None else "unmatched"
+            HTTP_REQUESTS.inc(route_label, scope["method"], str(status))
+            if status >= 500:
+                HTTP_ERRORS.inc(route_label)
+            HTTP_SECONDS.observe(time.perf_counter() - started, route_label)
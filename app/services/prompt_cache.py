@@ -0,0 +1,70 @@
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+def cached_system(*blocks: str) -> List[Dict[str, Any]]:
+    """
+    System prompt blocks with the whole static prefix marked for prompt caching
+
+    Anthropic caches everything up to and including the block carrying
+    `cache_control` (tools, then system), so only the per-property user message
+    is processed from scratch on repeat calls. Prefixes shorter than the model's
+    minimum cacheable length are simply not cached.
+    """
+    system = [{"type": "text", "text": block} for block in blocks]
+    system[-1]["cache_control"] = {"type": "ephemeral"}
+    return system
+
+
+class PromptCacheUsage:
+    """Running totals of Claude token usage, split by prompt-cache reads and writes"""
+
+    def __init__(self):
+        self.requests = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_creation_input_tokens = 0
+        self.cache_read_input_tokens = 0
+        self._first_token_seconds = 0.0
+        self._first_token_samples = 0
+
+    def record(self, usage: Any) -> None:
+        """Add the `usage` block of a Claude response"""
+        if usage is None:
+            return
+
+        cache_creation = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        self.requests += 1
+        self.input_tokens += getattr(usage, "input_tokens", 0) or 0
+        self.output_tokens += getattr(usage, "output_tokens", 0) or 0
+        self.cache_creation_input_tokens += cache_creation
+        self.cache_read_input_tokens += cache_read
+        logger.debug(f"Claude usage: {cache_read} cached input tokens read, {cache_creation} written")
+
+    def record_first_token(self, seconds: float) -> None:
+        """Add a streamed response's time to first token"""
+        self._first_token_seconds += seconds
+        self._first_token_samples += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Usage counters for health reporting"""
+        total_input = self.input_tokens + self.cache_creation_input_tokens + self.cache_read_input_tokens
+        return {
+            "requests": self.requests,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_creation_input_tokens": self.cache_creation_input_tokens,
+            "cache_read_input_tokens": self.cache_read_input_tokens,
+            "cache_read_ratio": round(self.cache_read_input_tokens / total_input, 4) if total_input else 0.0,
+            "avg_time_to_first_token_ms": (
+                round(self._first_token_seconds / self._first_token_samples * 1000, 1)
+                if self._first_token_samples else None
+            )
+        }
+
+
+# Shared by every analyzer instance in the process
+prompt_cache_usage = PromptCacheUsage()
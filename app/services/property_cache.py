@@ -0,0 +1,82 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+from app.config import settings
+from app.services.address import canonical_address_key
+
+
+class PropertyCache:
+    """
+    In-memory TTL + LRU cache for parsed Estated property data
+
+    Entries are keyed on the canonical address key. A `None` value is stored as a
+    negative entry so repeated lookups for unknown addresses skip Estated too.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.PROPERTY_CACHE_TTL_SECONDS
+        self.max_entries = max_entries if max_entries is not None else settings.PROPERTY_CACHE_MAX_ENTRIES
+        self._entries: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, address: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Look up cached property data
+
+        Returns:
+            Tuple of (found, property_data). `found` is True for negative entries,
+            in which case property_data is None.
+        """
+        key = canonical_address_key(address)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        expires_at, property_data = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if property_data is None:
+            self.negative_hits += 1
+        return True, property_data
+
+    def set(self, address: str, property_data: Optional[Dict[str, Any]]) -> None:
+        """Store property data (or None for a not-found result) for an address"""
+        if self.max_entries <= 0:
+            return
+
+        key = canonical_address_key(address)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, property_data)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for health reporting"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,218 @@
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import anthropic
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio used to budget prompts before they are sent
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_request_tokens(request: Dict[str, Any]) -> int:
+    """Upper-bound token cost of a messages request: prompt size estimate plus max_tokens"""
+    prompt = json.dumps(
+        [request.get("system"), request.get("messages"), request.get("tools")],
+        ensure_ascii=False,
+        default=str
+    )
+    return len(prompt) // _CHARS_PER_TOKEN + request.get("max_tokens", 0)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `per_minute` tokens per minute
+
+    A rate of 0 disables the bucket. Callers must serialize `acquire` so waiting
+    reservations are granted in arrival order.
+    """
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.per_minute / 60)
+        self._updated_at = now
+
+    async def acquire(self, amount: float) -> None:
+        """Wait until `amount` tokens are available, then take them"""
+        if self.per_minute <= 0:
+            return
+
+        # A single request larger than the whole budget waits for a full bucket
+        amount = min(amount, self.capacity)
+        self._refill()
+        while self.tokens < amount:
+            await asyncio.sleep((amount - self.tokens) * 60 / self.per_minute)
+            self._refill()
+        self.tokens -= amount
+
+    def refund(self, amount: float) -> None:
+        """Return over-reserved tokens once the actual usage is known"""
+        if self.per_minute <= 0 or amount <= 0:
+            return
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class AnthropicGovernor:
+    """
+    Shared admission control for Claude requests
+
+    Callers queue in FIFO order for a requests-per-minute and a tokens-per-minute
+    budget, then for one of `max_concurrency` request slots. Token reservations
+    use an upper-bound estimate and are settled against the response's reported
+    usage. A 429 (or 529 overloaded) response pauses every caller until its
+    retry-after time and the request is retried up to `max_retries` times.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: Optional[int] = None
+    ):
+        self.max_concurrency = max_concurrency or settings.ANTHROPIC_MAX_CONCURRENCY
+        self.max_retries = max_retries if max_retries is not None else settings.ANTHROPIC_RATE_LIMIT_RETRIES
+        self._request_bucket = TokenBucket(
+            requests_per_minute if requests_per_minute is not None else settings.ANTHROPIC_REQUESTS_PER_MINUTE
+        )
+        self._token_bucket = TokenBucket(
+            tokens_per_minute if tokens_per_minute is not None else settings.ANTHROPIC_TOKENS_PER_MINUTE
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._queue_lock = asyncio.Lock()
+        self._paused_until = 0.0
+
+        # Metrics
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.rate_limited = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    @asynccontextmanager
+    async def _slot(self, estimated_tokens: int) -> AsyncIterator[None]:
+        """Wait for budget and a concurrency slot, in arrival order"""
+        enqueued_at = time.monotonic()
+        self.queue_depth += 1
+        try:
+            async with self._queue_lock:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                await self._request_bucket.acquire(1)
+                await self._token_bucket.acquire(estimated_tokens)
+            await self._semaphore.acquire()
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - enqueued_at
+        self.requests += 1
+        self._wait_seconds_total += waited
+        self._wait_seconds_max = max(self._wait_seconds_max, waited)
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def _is_rate_limited(self, error: Exception) -> bool:
+        return isinstance(error, anthropic.RateLimitError) or (
+            isinstance(error, anthropic.APIStatusError) and error.status_code == 529
+        )
+
+    def _pause_for(self, error: anthropic.APIStatusError, attempt: int) -> None:
+        """Hold every queued caller until the server's retry-after time"""
+        retry_after = error.response.headers.get("retry-after")
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = float(2 ** attempt)
+
+        self.rate_limited += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        logger.warning(f"Claude rate limited (HTTP {error.status_code}); pausing requests for {delay:.1f}s")
+
+    def _settle(self, estimated_tokens: int, usage: Any) -> None:
+        """Refund the part of the token reservation the request did not use"""
+        if usage is None:
+            return
+        used = (
+            (getattr(usage, "input_tokens", 0) or 0)
+            + (getattr(usage, "cache_creation_input_tokens", 0) or 0)
+            + (getattr(usage, "output_tokens", 0) or 0)
+        )
+        self._token_bucket.refund(estimated_tokens - used)
+
+    async def create_message(self, client: anthropic.AsyncAnthropic, **request: Any) -> Any:
+        """
+        Governed `client.messages.create`
+
+        Raises:
+            anthropic.APIError: On API failure, including rate limiting that
+                persists after `max_retries` retries
+        """
+        estimated_tokens = estimate_request_tokens(request)
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._slot(estimated_tokens):
+                    response = await client.messages.create(**request)
+            except anthropic.APIStatusError as e:
+                if not self._is_rate_limited(e) or attempt == self.max_retries:
+                    raise
+                self._pause_for(e, attempt)
+                continue
+
+            self._settle(estimated_tokens, getattr(response, "usage", None))
+            return response
+
+    @asynccontextmanager
+    async def stream_message(self, client: anthropic.AsyncAnthropic, **request: Any) -> AsyncIterator[Any]:
+        """
+        Governed `client.messages.stream`; the slot is held until the stream closes
+
+        Rate limiting is only retried while opening the stream, before any text
+        has been delivered.
+        """
+        estimated_tokens = estimate_request_tokens(request)
+        for attempt in range(self.max_retries + 1):
+            opened = False
+            try:
+                async with self._slot(estimated_tokens):
+                    async with client.messages.stream(**request) as stream:
+                        opened = True
+                        yield stream
+                return
+            except anthropic.APIStatusError as e:
+                if opened or not self._is_rate_limited(e) or attempt == self.max_retries:
+                    raise
+                self._pause_for(e, attempt)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue and wait-time counters for health reporting"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "requests_per_minute": self._request_bucket.per_minute,
+            "tokens_per_minute": self._token_bucket.per_minute,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "avg_wait_ms": round(self._wait_seconds_total / self.requests * 1000, 1) if self.requests else 0.0,
+            "max_wait_ms": round(self._wait_seconds_max * 1000, 1),
+            "paused_for_seconds": round(max(0.0, self._paused_until - time.monotonic()), 1)
+        }
@@ -0,0 +1,235 @@
+from typing import Any, Dict, Optional, Tuple, Union
+
+from pydantic import TypeAdapter
+
+from app.models import AnalysisSource, LegendaryPropertyReport, PropertyReport, ReportMode
+from app.services.metrics import STAGE_SECONDS
+
+# Validators compiled once at import instead of per report
+LEGENDARY_REPORT_ADAPTER = TypeAdapter(LegendaryPropertyReport)
+LEGACY_REPORT_ADAPTER = TypeAdapter(PropertyReport)
+
+# Placeholder for each AI field Claude did not provide, by legendary section
+LEGENDARY_AI_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "property_identity": {
+        "structure_condition": "Assessment pending",
+        "property_age_classification": "Classification pending",
+        "exterior_material_style": "Style analysis pending",
+        "zoning_compatibility_issues": "Analysis pending",
+        "human_readable_summary": "Summary generation pending",
+    },
+    "valuation_equity": {
+        "price_per_sqft_current": None,
+        "price_per_sqft_historical": None,
+        "estimated_equity": None,
+        "assessed_undervaluation_risk": "Risk assessment pending",
+        "tax_vs_avm_discrepancy": "Analysis pending",
+        "forecasted_appreciation": "Forecast pending",
+        "price_trend_comparison": "Comparison pending",
+    },
+    "deal_strategy": {
+        "flip_potential_score": "C - Analysis pending",
+        "brrrr_potential": "Assessment pending",
+        "buy_hold_rental_fit": "Analysis pending",
+        "wholesaling_viability": "Assessment pending",
+        "rebuild_vs_rehab_vs_leave": "Recommendation pending",
+        "income_property_conversion": "Analysis pending",
+        "top_strategy_recommendation": "Recommendation pending",
+        "suggested_purchase_price": None,
+        "holding_cost_estimate": "Estimate pending",
+        "roi_estimate": "Calculation pending",
+    },
+    "ownership_profile": {
+        "absentee_owner_flag": False,
+        "time_held_years": None,
+        "owner_occupancy_likelihood": "Assessment pending",
+        "long_term_hold_score": "Score pending",
+        "owner_type_inference": "Analysis pending",
+        "motivation_to_sell_score": 5,
+        "top_reason_might_sell": "Analysis pending",
+    },
+    "investor_action": {
+        "recommended_approach": "Approach pending",
+        "suggested_message_script": "Script generation pending",
+        "suggested_offer_range": "Range analysis pending",
+        "counter_offer_logic": "Logic pending",
+        "contact_urgency_estimate": "Assessment pending",
+    },
+    "neighborhood_infrastructure": {
+        "neighborhood_type": "Type analysis pending",
+        "school_zone_quality": "Quality assessment pending",
+        "transit_access_level": "Access analysis pending",
+        "walkability_estimate": "Estimate pending",
+        "distance_to_commercial": "Distance analysis pending",
+        "road_type": "Type assessment pending",
+        "parking_availability": "Assessment pending",
+        "development_trend": "Trend analysis pending",
+    },
+    "risk_flags": {
+        "age_no_remodel_flag": "Flag assessment pending",
+        "avm_vs_tax_flag": "Assessment pending",
+        "structure_age_risk": "Risk analysis pending",
+        "flip_speculation_warning": "Warning assessment pending",
+        "ownership_cluster_warning": "Cluster analysis pending",
+        "flood_zone_inference": "Zone assessment pending",
+        "tornado_risk_inference": "Risk analysis pending",
+        "earthquake_risk_inference": "Risk assessment pending",
+        "wildfire_proximity_inference": "Proximity analysis pending",
+        "historical_disaster_proximity": "History analysis pending",
+    },
+    "financial_breakdown": {
+        "estimated_rental_income": None,
+        "estimated_cap_rate": None,
+        "rehab_cost_estimate": "Estimate pending",
+        "total_project_budget": "Budget analysis pending",
+        "exit_price_scenarios": "Scenarios pending",
+        "profit_potential_per_strategy": "Analysis pending",
+        "monthly_carrying_costs": "Costs analysis pending",
+        "noi_estimate": None,
+        "cash_on_cash_return": "Return calculation pending",
+    },
+    "market_context": {
+        "city_appreciation_trend": "Trend analysis pending",
+        "median_home_price_vs_subject": "Comparison pending",
+        "average_holding_period_zip": "Analysis pending",
+        "investor_activity_score": "Score pending",
+        "neighborhood_appreciation_rate": "Rate analysis pending",
+        "gentrification_likelihood": "Assessment pending",
+    },
+    "executive_summary": {
+        "worth_it_verdict": "Verdict pending",
+        "top_3_strengths": ["Analysis", "In", "Progress"],
+        "top_3_weaknesses": ["Assessment", "Pending", "Review"],
+        "recommended_next_step": "Next step analysis pending",
+        "report_scorecard": "Scorecard pending",
+        "time_sensitive_insight": "Insight analysis pending",
+    },
+    "bonus_extras": {
+        "investor_pitch_deck_text": "Pitch deck generation pending",
+        "marketing_copy": "Marketing copy generation pending",
+        "shareable_summary": "Summary generation pending",
+        # custom_report_name defaults to "Property Report - <address>"
+    },
+}
+
+# Legacy report section -> (AI insight section, {report field: (insight field, default)})
+LEGACY_AI_FIELDS: Dict[str, Tuple[str, Dict[str, Tuple[str, Any]]]] = {
+    "property_overview": ("property_overview", {
+        "ai_summary": ("ai_summary", "Analysis pending"),
+    }),
+    "ownership_sale_history": ("ownership_analysis", {
+        "ownership_duration_years": ("ownership_duration_years", None),
+        "is_absentee_owner": ("is_absentee_owner", None),
+        "motivation_insight": ("motivation_insight", "Analysis pending"),
+    }),
+    "equity_position": ("equity_analysis", {
+        "equity_estimate": ("estimated_equity", None),
+        "tax_vs_avm_analysis": ("tax_vs_avm_analysis", "Analysis pending"),
+    }),
+    "investment_strategy": ("investment_strategy", {
+        "flip_potential_rating": ("flip_potential_rating", "C"),
+        "buy_hold_assessment": ("buy_hold_assessment", "Analysis pending"),
+        "brrrr_fit_score": ("brrrr_fit_score", "Analysis pending"),
+        "ownership_duration_logic": ("ownership_duration_logic", "Logic pending"),
+        "strategy_recommendation": ("strategy_recommendation", "Recommendation pending"),
+    }),
+    "neighborhood_context": ("neighborhood_context", {
+        "walkability_estimate": ("walkability_estimate", "Assessment pending"),
+        "transit_access": ("transit_access", "Assessment pending"),
+        "school_zone_quality": ("school_zone_quality", "Assessment pending"),
+        "community_description": ("community_description", "Description pending"),
+    }),
+    "risk_red_flags": ("risk_assessment", {
+        "age_rehab_risk": ("age_rehab_risk", "Risk assessment pending"),
+        "tax_underassessment_risk": ("tax_underassessment_risk", "Assessment pending"),
+        "absentee_owner_risk": ("absentee_owner_risk", "Risk analysis pending"),
+        "old_structure_risk": ("old_structure_risk", "Assessment pending"),
+        "risk_summary": ("risk_summary", "Summary pending"),
+    }),
+    "investor_snapshot": ("investor_action", {
+        "investor_summary": ("investor_summary", "Summary pending"),
+        "target_buyer_type": ("target_buyer_type", "Type analysis pending"),
+        "motivation_to_sell": ("motivation_to_sell", "Motivation pending"),
+        "outreach_approach": ("outreach_approach", "Approach pending"),
+    }),
+    "bonus_analytics": ("bonus_analytics", {
+        "off_market_probability": ("off_market_probability", "Probability pending"),
+        "ai_grade": ("ai_grade", "C"),
+        "rebuild_vs_rehab": ("rebuild_vs_rehab", "Recommendation pending"),
+        "cold_outreach_script": ("cold_outreach_script", "Script generation pending"),
+    }),
+}
+
+
+def assemble_legendary_report(
+    estated_fields: Dict[str, Dict[str, Any]],
+    ai_insights: Dict[str, Any],
+    address: str,
+    report_id: str,
+    generated_at: Any,
+    report_mode: ReportMode = ReportMode.FULL,
+    analysis_source: AnalysisSource = AnalysisSource.AI,
+    analysis_age_seconds: Optional[float] = None
+) -> LegendaryPropertyReport:
+    """
+    Merge Estated fields and AI insights into a validated legendary report
+
+    Each section dict is built once (defaults, then Claude's fields, then the
+    Estated-backed fields, which always win) and the whole report is validated
+    in a single pass by the precompiled adapter.
+
+    Raises:
+        pydantic.ValidationError: If a merged field has the wrong type
+    """
+    with STAGE_SECONDS.time("assembly"):
+        report: Dict[str, Any] = {
+            "report_id": report_id,
+            "generated_at": generated_at,
+            "address_analyzed": address,
+            "report_mode": report_mode,
+            "analysis_source": analysis_source,
+            "analysis_age_seconds": analysis_age_seconds,
+        }
+        for section_key, defaults in LEGENDARY_AI_DEFAULTS.items():
+            report[section_key] = {
+                **defaults,
+                **ai_insights.get(section_key, {}),
+                **estated_fields.get(section_key, {}),
+            }
+        report["bonus_extras"].setdefault("custom_report_name", f"Property Report - {address}")
+
+        return LEGENDARY_REPORT_ADAPTER.validate_python(report)
+
+
+def assemble_legacy_report(
+    estated_fields: Dict[str, Dict[str, Any]],
+    ai_insights: Dict[str, Any]
+) -> PropertyReport:
+    """
+    Merge Estated fields and legacy AI insights into a validated 8-section report
+
+    Raises:
+        pydantic.ValidationError: If a merged field has the wrong type
+    """
+    with STAGE_SECONDS.time("assembly"):
+        report: Dict[str, Any] = {}
+        for section_key, (insight_section, fields) in LEGACY_AI_FIELDS.items():
+            insights = ai_insights.get(insight_section, {})
+            report[section_key] = {
+                **{field: insights.get(insight_field, default) for field, (insight_field, default) in fields.items()},
+                **estated_fields.get(section_key, {}),
+            }
+
+        return LEGACY_REPORT_ADAPTER.validate_python(report)
+
+
+def report_json(report: Union[LegendaryPropertyReport, PropertyReport]) -> bytes:
+    """
+    Serialize an already-validated report with pydantic-core's JSON encoder
+
+    Endpoints return these bytes directly so FastAPI does not re-validate the
+    report against its `response_model` and re-encode it in Python.
+    """
+    adapter = LEGENDARY_REPORT_ADAPTER if isinstance(report, LegendaryPropertyReport) else LEGACY_REPORT_ADAPTER
+    with STAGE_SECONDS.time("serialization"):
+        return adapter.dump_json(report)
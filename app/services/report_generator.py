@@ -1,6 +1,7 @@
+import asyncio
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, Iterable, AsyncIterator
 import logging
 from app.models import (
     # Legacy Models
@@ -8,13 +9,17 @@ from app.models import (
     EquityPosition, InvestmentStrategy, NeighborhoodContext,
     RiskRedFlags, InvestorSnapshot, BonusAnalytics, PropertyType,
     # New Legendary Models
-    LegendaryPropertyReport, PropertyIdentityPhysical, ValuationEquityInsights,
-    DealTypeStrategyRecommendations, OwnershipProfileMotivation, InvestorActionSection,
-    NeighborhoodSchoolInfrastructure, RiskFlagsRegulatoryAlerts, FinancialBreakdownForecasting,
-    MarketContext, ExecutiveSummary, BonusExtras
+    LegendaryPropertyReport, ReportMode, AnalysisSource
 )
 from app.services.estated_client import EstatedClient
-from app.services.ai_analyzer import AIAnalyzer, LegendaryAIAnalyzer
+from app.services.ai_analyzer import AIAnalyzer, LegendaryAIAnalyzer, LegendaryAnalysis
+from app.services.address import canonical_address_key
+from app.services.metrics import STAGE_SECONDS
+from app.services.prompt_cache import prompt_cache_usage
+from app.services.report_assembly import assemble_legacy_report, assemble_legendary_report
+from app.services.rule_based import RuleBasedAnalyzer
+from app.services.singleflight import SingleFlight
+from app.services.tracing import span
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -23,223 +28,283 @@ logger = logging.getLogger(__name__)
 class LegendaryReportGenerator:
     """Enhanced service for generating comprehensive 10-section legendary property reports"""
     
-    def __init__(self):
-        self.estated_client = EstatedClient()
-        self.legendary_ai_analyzer = LegendaryAIAnalyzer()
+    def __init__(
+        self,
+        estated_client: Optional[EstatedClient] = None,
+        legendary_ai_analyzer: Optional[LegendaryAIAnalyzer] = None,
+        rule_based_analyzer: Optional[RuleBasedAnalyzer] = None
+    ):
+        self.estated_client = estated_client or EstatedClient()
+        self.legendary_ai_analyzer = legendary_ai_analyzer or LegendaryAIAnalyzer()
+        self.rule_based_analyzer = rule_based_analyzer or RuleBasedAnalyzer()
+        self._inflight = SingleFlight()
     
-    async def generate_legendary_report(self, address: str) -> LegendaryPropertyReport:
+    async def generate_legendary_report(self, address: str, lite: bool = False) -> LegendaryPropertyReport:
         """
         Generate complete 10-section Legendary Property Report
         
         Args:
             address: Property address to analyze
+            lite: If True, skip Claude and fill the sections from rule-based insights
             
         Returns:
             Complete LegendaryPropertyReport with all 10 sections + bonus extras
             
         Raises:
             ValueError: If property data cannot be found or processed
+            EstatedUnavailableError: If Estated is failing or its circuit is open
         """
-        try:
-            # Step 1: Fetch comprehensive property data from Estated
-            logger.info(f"Fetching property data for legendary report: {address}")
-            property_data = await self.estated_client.get_property_data(address)
-            
-            if not property_data:
-                raise ValueError(f"Property not found for address: {address}")
-            
-            # Step 2: Generate comprehensive AI analysis for all 10 sections
-            logger.info("Generating comprehensive AI analysis for legendary report...")
-            ai_insights = await self.legendary_ai_analyzer.analyze_property_legendary(property_data)
-            
-            # Step 3: Build complete legendary report
-            logger.info("Assembling legendary report with all 10 sections...")
-            legendary_report = await self._build_legendary_report(property_data, ai_insights, address)
-            
-            logger.info(f"Legendary report generated successfully: {legendary_report.report_id}")
-            return legendary_report
-            
-        except Exception as e:
-            logger.error(f"Failed to generate legendary report for {address}: {str(e)}")
-            raise
+        if lite:
+            return await self.generate_lite_report(address)
+        
+        with span("generate_legendary_report", address=address):
+            try:
+                # Steps 1-2 are shared by concurrent requests for the same address
+                property_data, analysis = await self._inflight.do(
+                    canonical_address_key(address),
+                    lambda: self._fetch_and_analyze(address)
+                )
+                
+                # Step 3: Build complete legendary report
+                logger.info("Assembling legendary report with all 10 sections...")
+                legendary_report = await self._build_legendary_report(
+                    property_data,
+                    analysis.insights,
+                    address,
+                    analysis_source=analysis.source,
+                    analysis_age_seconds=analysis.age_seconds
+                )
+                
+                logger.info(f"Legendary report generated successfully: {legendary_report.report_id}")
+                return legendary_report
+                
+            except Exception as e:
+                logger.error(f"Failed to generate legendary report for {address}: {str(e)}")
+                raise
     
-    async def _build_legendary_report(
-        self, 
-        property_data: Dict[str, Any], 
-        ai_insights: Dict[str, Any], 
-        address: str
-    ) -> LegendaryPropertyReport:
-        """Build the complete legendary report structure"""
-        
-        # Extract data sections
-        property_details = property_data.get('property', {})
-        address_info = property_data.get('address', {})
-        owner_info = property_data.get('owner', {})
-        valuation = property_data.get('valuation', {})
-        
-        # Section 1: Property Identity & Physical Overview
-        property_identity = PropertyIdentityPhysical(
-            full_address=address_info.get('formatted_address', address),
-            apn=property_details.get('apn'),
-            parcel_id=property_details.get('parcel_id'),
-            property_type=self._map_property_type(property_details.get('property_type')),
-            structure_sqft=property_details.get('sqft'),
-            lot_sqft=property_details.get('lot_sqft'),
-            lot_dimensions=property_details.get('lot_dimensions'),
-            bedrooms=property_details.get('bedrooms'),
-            bathrooms=property_details.get('bathrooms'),
-            year_built=property_details.get('year_built'),
-            stories=property_details.get('stories'),
-            garage_type=property_details.get('garage_type'),
-            legal_land_use=property_details.get('zoning'),
-            structure_condition=ai_insights.get('property_identity', {}).get('structure_condition', 'Assessment pending'),
-            property_age_classification=ai_insights.get('property_identity', {}).get('property_age_classification', 'Classification pending'),
-            exterior_material_style=ai_insights.get('property_identity', {}).get('exterior_material_style', 'Style analysis pending'),
-            zoning_compatibility_issues=ai_insights.get('property_identity', {}).get('zoning_compatibility_issues', 'Analysis pending'),
-            human_readable_summary=ai_insights.get('property_identity', {}).get('human_readable_summary', 'Summary generation pending')
-        )
+    async def generate_lite_report(self, address: str) -> LegendaryPropertyReport:
+        """
+        Generate a lite legendary report from Estated data and local rules only
         
-        # Section 2: Valuation & Equity Insights
-        valuation_equity = ValuationEquityInsights(
-            avm_value=valuation.get('avm'),
-            last_sale_price=property_details.get('last_sale_price'),
-            last_sale_date=property_details.get('last_sale_date'),
-            assessed_tax_value=valuation.get('tax_assessed_value'),
-            property_tax_amount=valuation.get('property_tax_amount'),
-            price_per_sqft_current=ai_insights.get('valuation_equity', {}).get('price_per_sqft_current'),
-            price_per_sqft_historical=ai_insights.get('valuation_equity', {}).get('price_per_sqft_historical'),
-            estimated_equity=ai_insights.get('valuation_equity', {}).get('estimated_equity'),
-            assessed_undervaluation_risk=ai_insights.get('valuation_equity', {}).get('assessed_undervaluation_risk', 'Risk assessment pending'),
-            tax_vs_avm_discrepancy=ai_insights.get('valuation_equity', {}).get('tax_vs_avm_discrepancy', 'Analysis pending'),
-            forecasted_appreciation=ai_insights.get('valuation_equity', {}).get('forecasted_appreciation', 'Forecast pending'),
-            price_trend_comparison=ai_insights.get('valuation_equity', {}).get('price_trend_comparison', 'Comparison pending')
-        )
+        No Claude request is made. Requesting the same address again without
+        `lite` upgrades to the full AI report; the Estated data is then served
+        from the property cache, so only the analysis is paid for.
         
-        # Section 3: Deal Type & Strategy Recommendations
-        deal_strategy = DealTypeStrategyRecommendations(
-            flip_potential_score=ai_insights.get('deal_strategy', {}).get('flip_potential_score', 'C - Analysis pending'),
-            brrrr_potential=ai_insights.get('deal_strategy', {}).get('brrrr_potential', 'Assessment pending'),
-            buy_hold_rental_fit=ai_insights.get('deal_strategy', {}).get('buy_hold_rental_fit', 'Analysis pending'),
-            wholesaling_viability=ai_insights.get('deal_strategy', {}).get('wholesaling_viability', 'Assessment pending'),
-            rebuild_vs_rehab_vs_leave=ai_insights.get('deal_strategy', {}).get('rebuild_vs_rehab_vs_leave', 'Recommendation pending'),
-            income_property_conversion=ai_insights.get('deal_strategy', {}).get('income_property_conversion', 'Analysis pending'),
-            top_strategy_recommendation=ai_insights.get('deal_strategy', {}).get('top_strategy_recommendation', 'Recommendation pending'),
-            suggested_purchase_price=ai_insights.get('deal_strategy', {}).get('suggested_purchase_price'),
-            holding_cost_estimate=ai_insights.get('deal_strategy', {}).get('holding_cost_estimate', 'Estimate pending'),
-            roi_estimate=ai_insights.get('deal_strategy', {}).get('roi_estimate', 'Calculation pending')
-        )
+        Raises:
+            ValueError: If property data cannot be found
+            EstatedUnavailableError: If Estated is failing or its circuit is open
+        """
+        with span("generate_lite_report", address=address):
+            property_data = await self.fetch_property_data(address)
+            with span("rule_based.analyze"):
+                insights = self.rule_based_analyzer.analyze_property_legendary(property_data)
+            report = await self._build_legendary_report(
+                property_data, insights, address, report_mode=ReportMode.LITE, analysis_source=AnalysisSource.RULES
+            )
+            logger.info(f"Lite report generated successfully: {report.report_id}")
+            return report
+    
+    async def fetch_property_data(self, address: str) -> Dict[str, Any]:
+        """
+        Fetch Estated property data for an address
         
-        # Section 4: Ownership Profile & Motivation to Sell
-        ownership_profile = OwnershipProfileMotivation(
-            owner_names=[owner_info.get('name')] if owner_info.get('name') else None,
-            owner_mailing_address=owner_info.get('mailing_address'),
-            absentee_owner_flag=ai_insights.get('ownership_profile', {}).get('absentee_owner_flag', False),
-            time_held_years=ai_insights.get('ownership_profile', {}).get('time_held_years'),
-            owner_occupancy_likelihood=ai_insights.get('ownership_profile', {}).get('owner_occupancy_likelihood', 'Assessment pending'),
-            long_term_hold_score=ai_insights.get('ownership_profile', {}).get('long_term_hold_score', 'Score pending'),
-            owner_type_inference=ai_insights.get('ownership_profile', {}).get('owner_type_inference', 'Analysis pending'),
-            motivation_to_sell_score=ai_insights.get('ownership_profile', {}).get('motivation_to_sell_score', 5),
-            top_reason_might_sell=ai_insights.get('ownership_profile', {}).get('top_reason_might_sell', 'Analysis pending')
-        )
+        Raises:
+            ValueError: If the property cannot be found
+            EstatedUnavailableError: If Estated is failing or its circuit is open
+        """
+        logger.info(f"Fetching property data for legendary report: {address}")
+        property_data = await self.estated_client.get_property_data(address)
         
-        # Section 5: Investor Action Section
-        investor_action = InvestorActionSection(
-            recommended_approach=ai_insights.get('investor_action', {}).get('recommended_approach', 'Approach pending'),
-            suggested_message_script=ai_insights.get('investor_action', {}).get('suggested_message_script', 'Script generation pending'),
-            suggested_offer_range=ai_insights.get('investor_action', {}).get('suggested_offer_range', 'Range analysis pending'),
-            counter_offer_logic=ai_insights.get('investor_action', {}).get('counter_offer_logic', 'Logic pending'),
-            contact_urgency_estimate=ai_insights.get('investor_action', {}).get('contact_urgency_estimate', 'Assessment pending')
-        )
+        if not property_data:
+            raise ValueError(f"Property not found for address: {address}")
         
-        # Section 6: Neighborhood, School & Infrastructure
-        neighborhood_infrastructure = NeighborhoodSchoolInfrastructure(
-            zip_code=address_info.get('zip'),
-            county=address_info.get('county'),
-            census_data_basic=address_info.get('census_data'),
-            neighborhood_type=ai_insights.get('neighborhood_infrastructure', {}).get('neighborhood_type', 'Type analysis pending'),
-            school_zone_quality=ai_insights.get('neighborhood_infrastructure', {}).get('school_zone_quality', 'Quality assessment pending'),
-            transit_access_level=ai_insights.get('neighborhood_infrastructure', {}).get('transit_access_level', 'Access analysis pending'),
-            walkability_estimate=ai_insights.get('neighborhood_infrastructure', {}).get('walkability_estimate', 'Estimate pending'),
-            distance_to_commercial=ai_insights.get('neighborhood_infrastructure', {}).get('distance_to_commercial', 'Distance analysis pending'),
-            road_type=ai_insights.get('neighborhood_infrastructure', {}).get('road_type', 'Type assessment pending'),
-            parking_availability=ai_insights.get('neighborhood_infrastructure', {}).get('parking_availability', 'Assessment pending'),
-            development_trend=ai_insights.get('neighborhood_infrastructure', {}).get('development_trend', 'Trend analysis pending')
-        )
+        return property_data
+    
+    async def stream_legendary_report(
+        self,
+        address: str,
+        property_data: Dict[str, Any],
+        lite: bool = False
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream a legendary report as (event, payload) pairs
         
-        # Section 7: Risk Flags & Regulatory Red Alerts
-        risk_flags = RiskFlagsRegulatoryAlerts(
-            age_no_remodel_flag=ai_insights.get('risk_flags', {}).get('age_no_remodel_flag', 'Flag assessment pending'),
-            avm_vs_tax_flag=ai_insights.get('risk_flags', {}).get('avm_vs_tax_flag', 'Assessment pending'),
-            structure_age_risk=ai_insights.get('risk_flags', {}).get('structure_age_risk', 'Risk analysis pending'),
-            flip_speculation_warning=ai_insights.get('risk_flags', {}).get('flip_speculation_warning', 'Warning assessment pending'),
-            ownership_cluster_warning=ai_insights.get('risk_flags', {}).get('ownership_cluster_warning', 'Cluster analysis pending'),
-            flood_zone_inference=ai_insights.get('risk_flags', {}).get('flood_zone_inference', 'Zone assessment pending'),
-            tornado_risk_inference=ai_insights.get('risk_flags', {}).get('tornado_risk_inference', 'Risk analysis pending'),
-            earthquake_risk_inference=ai_insights.get('risk_flags', {}).get('earthquake_risk_inference', 'Risk assessment pending'),
-            wildfire_proximity_inference=ai_insights.get('risk_flags', {}).get('wildfire_proximity_inference', 'Proximity analysis pending'),
-            historical_disaster_proximity=ai_insights.get('risk_flags', {}).get('historical_disaster_proximity', 'History analysis pending')
-        )
+        Emits a `property` event with the Estated-backed fields first, then one
+        `section` event per AI section as soon as Claude finishes writing it, and
+        finally a `report` event with the complete assembled report. Lite reports
+        have no AI sections, so `report` follows `property` directly.
         
-        # Section 8: Financial Breakdown + Forecasting
-        financial_breakdown = FinancialBreakdownForecasting(
-            estimated_rental_income=ai_insights.get('financial_breakdown', {}).get('estimated_rental_income'),
-            estimated_cap_rate=ai_insights.get('financial_breakdown', {}).get('estimated_cap_rate'),
-            rehab_cost_estimate=ai_insights.get('financial_breakdown', {}).get('rehab_cost_estimate', 'Estimate pending'),
-            total_project_budget=ai_insights.get('financial_breakdown', {}).get('total_project_budget', 'Budget analysis pending'),
-            exit_price_scenarios=ai_insights.get('financial_breakdown', {}).get('exit_price_scenarios', 'Scenarios pending'),
-            profit_potential_per_strategy=ai_insights.get('financial_breakdown', {}).get('profit_potential_per_strategy', 'Analysis pending'),
-            monthly_carrying_costs=ai_insights.get('financial_breakdown', {}).get('monthly_carrying_costs', 'Costs analysis pending'),
-            noi_estimate=ai_insights.get('financial_breakdown', {}).get('noi_estimate'),
-            cash_on_cash_return=ai_insights.get('financial_breakdown', {}).get('cash_on_cash_return', 'Return calculation pending')
-        )
+        Args:
+            address: Property address being analyzed
+            property_data: Estated data from fetch_property_data
+            lite: If True, skip Claude and use rule-based insights
+        """
+        yield "property", self._estated_fields(property_data, address)
+        
+        if lite:
+            insights = self.rule_based_analyzer.analyze_property_legendary(property_data)
+            legendary_report = await self._build_legendary_report(
+                property_data, insights, address, report_mode=ReportMode.LITE, analysis_source=AnalysisSource.RULES
+            )
+            yield "report", legendary_report.model_dump(mode="json")
+            return
+        
+        ai_insights: Dict[str, Any] = {}
+        async for section_key, section_insights in self.legendary_ai_analyzer.stream_property_legendary(property_data):
+            ai_insights[section_key] = section_insights
+            yield "section", {"section": section_key, "insights": section_insights}
+        
+        legendary_report = await self._build_legendary_report(property_data, ai_insights, address)
+        logger.info(f"Streamed legendary report generated successfully: {legendary_report.report_id}")
+        yield "report", legendary_report.model_dump(mode="json")
+    
+    async def generate_legendary_batch(
+        self,
+        addresses: Iterable[str],
+        estated_concurrency: Optional[int] = None,
+        ai_concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate legendary reports for many addresses, yielding results in completion order
         
-        # Section 9: Market Context
-        market_context = MarketContext(
-            city_appreciation_trend=ai_insights.get('market_context', {}).get('city_appreciation_trend', 'Trend analysis pending'),
-            median_home_price_vs_subject=ai_insights.get('market_context', {}).get('median_home_price_vs_subject', 'Comparison pending'),
-            average_holding_period_zip=ai_insights.get('market_context', {}).get('average_holding_period_zip', 'Analysis pending'),
-            investor_activity_score=ai_insights.get('market_context', {}).get('investor_activity_score', 'Score pending'),
-            neighborhood_appreciation_rate=ai_insights.get('market_context', {}).get('neighborhood_appreciation_rate', 'Rate analysis pending'),
-            gentrification_likelihood=ai_insights.get('market_context', {}).get('gentrification_likelihood', 'Assessment pending')
-        )
+        The Estated and Claude stages run under separate concurrency limits. Only
+        in-flight work and a small result buffer are held in memory at any time.
         
-        # Section 10: Executive Summary
-        executive_summary = ExecutiveSummary(
-            worth_it_verdict=ai_insights.get('executive_summary', {}).get('worth_it_verdict', 'Verdict pending'),
-            top_3_strengths=ai_insights.get('executive_summary', {}).get('top_3_strengths', ['Analysis', 'In', 'Progress']),
-            top_3_weaknesses=ai_insights.get('executive_summary', {}).get('top_3_weaknesses', ['Assessment', 'Pending', 'Review']),
-            recommended_next_step=ai_insights.get('executive_summary', {}).get('recommended_next_step', 'Next step analysis pending'),
-            report_scorecard=ai_insights.get('executive_summary', {}).get('report_scorecard', 'Scorecard pending'),
-            time_sensitive_insight=ai_insights.get('executive_summary', {}).get('time_sensitive_insight', 'Insight analysis pending')
-        )
+        Args:
+            addresses: Property addresses to analyze
+            estated_concurrency: Max concurrent Estated lookups (defaults to settings)
+            ai_concurrency: Max concurrent AI analyses (defaults to settings)
+            
+        Yields:
+            Per-address dicts with index, address, status and either report or error
+        """
+        estated_concurrency = estated_concurrency or settings.BATCH_ESTATED_CONCURRENCY
+        ai_concurrency = ai_concurrency or settings.BATCH_AI_CONCURRENCY
+        estated_semaphore = asyncio.Semaphore(estated_concurrency)
+        ai_semaphore = asyncio.Semaphore(ai_concurrency)
+        
+        # Enough workers to keep both stages saturated at the same time
+        worker_count = estated_concurrency + ai_concurrency
+        pending = iter(enumerate(addresses))
+        results: asyncio.Queue = asyncio.Queue(maxsize=worker_count)
+        done_marker = object()
+        
+        async def process(index: int, address: str) -> Dict[str, Any]:
+            try:
+                async with estated_semaphore:
+                    property_data = await self.estated_client.get_property_data(address)
+                if not property_data:
+                    raise ValueError(f"Property not found for address: {address}")
+                
+                async with ai_semaphore:
+                    analysis = await self.legendary_ai_analyzer.analyze_property_legendary(property_data)
+                
+                report = await self._build_legendary_report(
+                    property_data,
+                    analysis.insights,
+                    address,
+                    analysis_source=analysis.source,
+                    analysis_age_seconds=analysis.age_seconds
+                )
+                return {"index": index, "address": address, "status": "ok", "report": report}
+                
+            except Exception as e:
+                logger.warning(f"Batch report failed for {address}: {str(e)}")
+                return {"index": index, "address": address, "status": "error", "error": str(e)}
+        
+        async def worker() -> None:
+            # process() never raises, so each worker always reports completion
+            for index, address in pending:
+                await results.put(await process(index, address))
+            await results.put(done_marker)
+        
+        workers = [asyncio.create_task(worker()) for _ in range(worker_count)]
+        try:
+            finished = 0
+            while finished < worker_count:
+                result = await results.get()
+                if result is done_marker:
+                    finished += 1
+                else:
+                    yield result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+    
+    async def _fetch_and_analyze(self, address: str) -> Tuple[Dict[str, Any], LegendaryAnalysis]:
+        """Fetch Estated data and run the legendary AI analysis for one address"""
+        # Step 1: Fetch comprehensive property data from Estated
+        property_data = await self.fetch_property_data(address)
         
-        # Bonus Extras
-        bonus_extras = BonusExtras(
-            investor_pitch_deck_text=ai_insights.get('bonus_extras', {}).get('investor_pitch_deck_text', 'Pitch deck generation pending'),
-            marketing_copy=ai_insights.get('bonus_extras', {}).get('marketing_copy', 'Marketing copy generation pending'),
-            shareable_summary=ai_insights.get('bonus_extras', {}).get('shareable_summary', 'Summary generation pending'),
-            custom_report_name=ai_insights.get('bonus_extras', {}).get('custom_report_name', f"Property Report - {address}")
-        )
+        # Step 2: Generate comprehensive AI analysis for all 10 sections
+        logger.info("Generating comprehensive AI analysis for legendary report...")
+        analysis = await self.legendary_ai_analyzer.analyze_property_legendary(property_data)
         
-        # Build complete legendary report
-        legendary_report = LegendaryPropertyReport(
-            report_id=str(uuid.uuid4()),
-            generated_at=datetime.now(),
-            address_analyzed=address,
-            property_identity=property_identity,
-            valuation_equity=valuation_equity,
-            deal_strategy=deal_strategy,
-            ownership_profile=ownership_profile,
-            investor_action=investor_action,
-            neighborhood_infrastructure=neighborhood_infrastructure,
-            risk_flags=risk_flags,
-            financial_breakdown=financial_breakdown,
-            market_context=market_context,
-            executive_summary=executive_summary,
-            bonus_extras=bonus_extras
-        )
+        return property_data, analysis
+    
+    async def _build_legendary_report(
+        self, 
+        property_data: Dict[str, Any], 
+        ai_insights: Dict[str, Any], 
+        address: str,
+        report_mode: ReportMode = ReportMode.FULL,
+        analysis_source: AnalysisSource = AnalysisSource.AI,
+        analysis_age_seconds: Optional[float] = None
+    ) -> LegendaryPropertyReport:
+        """Build the complete legendary report structure"""
+        with span("report.assemble", format="legendary"):
+            return assemble_legendary_report(
+                self._estated_fields(property_data, address),
+                ai_insights,
+                address=address,
+                report_id=str(uuid.uuid4()),
+                generated_at=datetime.now(),
+                report_mode=report_mode,
+                analysis_source=analysis_source,
+                analysis_age_seconds=analysis_age_seconds
+            )
+    
+    def _estated_fields(self, property_data: Dict[str, Any], address: str) -> Dict[str, Dict[str, Any]]:
+        """Estated-backed report fields, grouped by legendary section"""
+        property_details = property_data.get('property', {})
+        address_info = property_data.get('address', {})
+        owner_info = property_data.get('owner', {})
+        valuation = property_data.get('valuation', {})
         
-        return legendary_report
+        return {
+            "property_identity": {
+                "full_address": address_info.get('formatted_address', address),
+                "apn": property_details.get('apn'),
+                "parcel_id": property_details.get('parcel_id'),
+                "property_type": self._map_property_type(property_details.get('property_type')),
+                "structure_sqft": property_details.get('sqft'),
+                "lot_sqft": property_details.get('lot_sqft'),
+                "lot_dimensions": property_details.get('lot_dimensions'),
+                "bedrooms": property_details.get('bedrooms'),
+                "bathrooms": property_details.get('bathrooms'),
+                "year_built": property_details.get('year_built'),
+                "stories": property_details.get('stories'),
+                "garage_type": property_details.get('garage_type'),
+                "legal_land_use": property_details.get('zoning')
+            },
+            "valuation_equity": {
+                "avm_value": valuation.get('avm'),
+                "last_sale_price": property_details.get('last_sale_price'),
+                "last_sale_date": property_details.get('last_sale_date'),
+                "assessed_tax_value": valuation.get('tax_assessed_value'),
+                "property_tax_amount": valuation.get('property_tax_amount')
+            },
+            "ownership_profile": {
+                "owner_names": [owner_info.get('name')] if owner_info.get('name') else None,
+                "owner_mailing_address": owner_info.get('mailing_address')
+            },
+            "neighborhood_infrastructure": {
+                "zip_code": address_info.get('zip'),
+                "county": address_info.get('county'),
+                "census_data_basic": address_info.get('census_data')
+            }
+        }
     
     def _map_property_type(self, property_type_str: Optional[str]) -> Optional[PropertyType]:
         """Map string property type to enum"""
@@ -268,26 +333,42 @@ class LegendaryReportGenerator:
 class ReportGenerator:
     """Legacy service for generating $5 AI Property Reports (8 sections)"""
     
-    def __init__(self):
-        self.estated_client = EstatedClient()
-        self.ai_analyzer = AIAnalyzer()
-        self.legendary_generator = LegendaryReportGenerator()
+    def __init__(
+        self,
+        estated_client: Optional[EstatedClient] = None,
+        ai_analyzer: Optional[AIAnalyzer] = None,
+        legendary_generator: Optional[LegendaryReportGenerator] = None
+    ):
+        self.estated_client = estated_client or EstatedClient()
+        self.ai_analyzer = ai_analyzer or AIAnalyzer()
+        self.legendary_generator = legendary_generator or LegendaryReportGenerator(estated_client=self.estated_client)
+        self._inflight = SingleFlight()
     
-    async def generate_report(self, address: str, legendary_format: bool = False) -> PropertyReport:
+    async def generate_report(self, address: str, legendary_format: bool = False, lite: bool = False) -> PropertyReport:
         """
         Generate Property Report - either legacy 8-section or legendary 10-section format
         
+        With DERIVE_LEGACY_FROM_LEGENDARY enabled, legacy reports are always converted
+        from the legendary analysis, so one cached Claude generation per property
+        serves both report formats.
+        
         Args:
             address: Property address to analyze
             legendary_format: If True, generates 10-section legendary format; if False, generates legacy 8-section
+            lite: If True, skip Claude and derive the report from Estated data and rule-based insights
             
         Returns:
             Complete PropertyReport with specified format
             
         Raises:
             ValueError: If property data cannot be found or processed
+            EstatedUnavailableError: If Estated is failing or its circuit is open
         """
-        if legendary_format:
+        if lite:
+            legendary_report = await self.legendary_generator.generate_lite_report(address)
+            return self._convert_legendary_to_legacy(legendary_report)
+        
+        if legendary_format or settings.DERIVE_LEGACY_FROM_LEGENDARY:
             # Generate legendary 10-section report and convert to legacy format for compatibility
             legendary_report = await self.legendary_generator.generate_legendary_report(address)
             return self._convert_legendary_to_legacy(legendary_report)
@@ -297,133 +378,88 @@ class ReportGenerator:
     
     async def _generate_legacy_report(self, address: str) -> PropertyReport:
         """Generate legacy 8-section report"""
-        try:
-            # Step 1: Fetch property data from Estated
-            logger.info(f"Fetching property data for: {address}")
-            property_data = await self.estated_client.get_property_data(address)
-            
-            if not property_data:
-                raise ValueError(f"Property not found for address: {address}")
-            
-            # Step 2: Generate AI analysis
-            logger.info("Generating AI analysis...")
+        with span("generate_legacy_report", address=address):
+            try:
+                # Steps 1-2 are shared by concurrent requests for the same address
+                property_data, ai_insights = await self._inflight.do(
+                    canonical_address_key(address),
+                    lambda: self._fetch_and_analyze(address)
+                )
+                
+                # Step 3: Build complete report
+                logger.info("Assembling final report...")
+                report = await self._build_legacy_report(property_data, ai_insights)
+                
+                logger.info(f"Report generated successfully: {report.report_id}")
+                return report
+                
+            except Exception as e:
+                logger.error(f"Failed to generate report for {address}: {str(e)}")
+                raise
+    
+    async def _fetch_and_analyze(self, address: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Fetch Estated data and run the legacy AI analysis for one address"""
+        # Step 1: Fetch property data from Estated
+        logger.info(f"Fetching property data for: {address}")
+        property_data = await self.estated_client.get_property_data(address)
+        
+        if not property_data:
+            raise ValueError(f"Property not found for address: {address}")
+        
+        # Step 2: Generate AI analysis
+        logger.info("Generating AI analysis...")
+        with span("ai.analyze_legacy"):
             ai_insights = await self.ai_analyzer.analyze_property(property_data)
-            
-            # Step 3: Build complete report
-            logger.info("Assembling final report...")
-            report = await self._build_legacy_report(property_data, ai_insights)
-            
-            logger.info(f"Report generated successfully: {report.report_id}")
-            return report
-            
-        except Exception as e:
-            logger.error(f"Failed to generate report for {address}: {str(e)}")
-            raise
+        
+        return property_data, ai_insights
     
     async def _build_legacy_report(self, property_data: Dict[str, Any], ai_insights: Dict[str, Any]) -> PropertyReport:
         """Build the legacy 8-section report structure"""
-        
-        # Extract data sections for legacy format
         property_details = property_data.get('property', {})
         address_info = property_data.get('address', {})
         owner_info = property_data.get('owner', {})
         valuation = property_data.get('valuation', {})
         
-        # Section 1: Property Overview
-        property_overview = PropertyOverview(
-            full_address=address_info.get('formatted_address', ''),
-            parcel_id=property_details.get('parcel_id'),
-            property_type=self._map_property_type(property_details.get('property_type')),
-            year_built=property_details.get('year_built'),
-            square_footage=property_details.get('sqft'),
-            lot_size=property_details.get('lot_size'),
-            bedrooms=property_details.get('bedrooms'),
-            bathrooms=property_details.get('bathrooms'),
-            legal_description=property_details.get('zoning'),
-            ai_summary=ai_insights.get('property_overview', {}).get('ai_summary', 'Analysis pending')
-        )
-        
-        # Section 2: Ownership & Sale History
-        ownership_sale_history = OwnershipSaleHistory(
-            owner_name=owner_info.get('name'),
-            owner_mailing_address=owner_info.get('mailing_address'),
-            last_sale_price=property_details.get('last_sale_price'),
-            last_sale_date=property_details.get('last_sale_date'),
-            ownership_duration_years=ai_insights.get('ownership_analysis', {}).get('ownership_duration_years'),
-            is_absentee_owner=ai_insights.get('ownership_analysis', {}).get('is_absentee_owner'),
-            motivation_insight=ai_insights.get('ownership_analysis', {}).get('motivation_insight', 'Analysis pending')
-        )
-        
-        # Section 3: Equity Position
-        equity_position = EquityPosition(
-            estimated_value=valuation.get('avm'),
-            tax_assessed_value=valuation.get('tax_assessed_value'),
-            property_tax_amount=valuation.get('property_tax_amount'),
-            equity_estimate=ai_insights.get('equity_analysis', {}).get('estimated_equity'),
-            tax_vs_avm_analysis=ai_insights.get('equity_analysis', {}).get('tax_vs_avm_analysis', 'Analysis pending')
-        )
-        
-        # Section 4: Investment Strategy
-        investment_strategy = InvestmentStrategy(
-            flip_potential_rating=ai_insights.get('investment_strategy', {}).get('flip_potential_rating', 'C'),
-            buy_hold_assessment=ai_insights.get('investment_strategy', {}).get('buy_hold_assessment', 'Analysis pending'),
-            brrrr_fit_score=ai_insights.get('investment_strategy', {}).get('brrrr_fit_score', 'Analysis pending'),
-            ownership_duration_logic=ai_insights.get('investment_strategy', {}).get('ownership_duration_logic', 'Logic pending'),
-            strategy_recommendation=ai_insights.get('investment_strategy', {}).get('strategy_recommendation', 'Recommendation pending')
-        )
-        
-        # Section 5: Neighborhood Context
-        neighborhood_context = NeighborhoodContext(
-            city=address_info.get('city'),
-            zip_code=address_info.get('zip'),
-            county=address_info.get('county'),
-            walkability_estimate=ai_insights.get('neighborhood_context', {}).get('walkability_estimate', 'Assessment pending'),
-            transit_access=ai_insights.get('neighborhood_context', {}).get('transit_access', 'Assessment pending'),
-            school_zone_quality=ai_insights.get('neighborhood_context', {}).get('school_zone_quality', 'Assessment pending'),
-            community_description=ai_insights.get('neighborhood_context', {}).get('community_description', 'Description pending')
-        )
-        
-        # Section 6: Risk & Red Flags
-        risk_red_flags = RiskRedFlags(
-            age_rehab_risk=ai_insights.get('risk_assessment', {}).get('age_rehab_risk', 'Risk assessment pending'),
-            tax_underassessment_risk=ai_insights.get('risk_assessment', {}).get('tax_underassessment_risk', 'Assessment pending'),
-            absentee_owner_risk=ai_insights.get('risk_assessment', {}).get('absentee_owner_risk', 'Risk analysis pending'),
-            old_structure_risk=ai_insights.get('risk_assessment', {}).get('old_structure_risk', 'Assessment pending'),
-            risk_summary=ai_insights.get('risk_assessment', {}).get('risk_summary', 'Summary pending')
-        )
-        
-        # Section 7: Investor Snapshot
-        investor_snapshot = InvestorSnapshot(
-            investor_summary=ai_insights.get('investor_action', {}).get('investor_summary', 'Summary pending'),
-            target_buyer_type=ai_insights.get('investor_action', {}).get('target_buyer_type', 'Type analysis pending'),
-            motivation_to_sell=ai_insights.get('investor_action', {}).get('motivation_to_sell', 'Motivation pending'),
-            outreach_approach=ai_insights.get('investor_action', {}).get('outreach_approach', 'Approach pending')
-        )
-        
-        # Section 8: Bonus Analytics
-        bonus_analytics = BonusAnalytics(
-            off_market_probability=ai_insights.get('bonus_analytics', {}).get('off_market_probability', 'Probability pending'),
-            ai_grade=ai_insights.get('bonus_analytics', {}).get('ai_grade', 'C'),
-            rebuild_vs_rehab=ai_insights.get('bonus_analytics', {}).get('rebuild_vs_rehab', 'Recommendation pending'),
-            cold_outreach_script=ai_insights.get('bonus_analytics', {}).get('cold_outreach_script', 'Script generation pending')
-        )
-        
-        # Build complete legacy report
-        report = PropertyReport(
-            property_overview=property_overview,
-            ownership_sale_history=ownership_sale_history,
-            equity_position=equity_position,
-            investment_strategy=investment_strategy,
-            neighborhood_context=neighborhood_context,
-            risk_red_flags=risk_red_flags,
-            investor_snapshot=investor_snapshot,
-            bonus_analytics=bonus_analytics
-        )
+        # Estated-backed fields for each section; AI fields are merged in by the assembler
+        estated = {
+            "property_overview": {
+                "full_address": address_info.get('formatted_address', ''),
+                "parcel_id": property_details.get('parcel_id'),
+                "property_type": self._map_property_type(property_details.get('property_type')),
+                "year_built": property_details.get('year_built'),
+                "square_footage": property_details.get('sqft'),
+                "lot_size": property_details.get('lot_size'),
+                "bedrooms": property_details.get('bedrooms'),
+                "bathrooms": property_details.get('bathrooms'),
+                "legal_description": property_details.get('zoning')
+            },
+            "ownership_sale_history": {
+                "owner_name": owner_info.get('name'),
+                "owner_mailing_address": owner_info.get('mailing_address'),
+                "last_sale_price": property_details.get('last_sale_price'),
+                "last_sale_date": property_details.get('last_sale_date')
+            },
+            "equity_position": {
+                "estimated_value": valuation.get('avm'),
+                "tax_assessed_value": valuation.get('tax_assessed_value'),
+                "property_tax_amount": valuation.get('property_tax_amount')
+            },
+            "neighborhood_context": {
+                "city": address_info.get('city'),
+                "zip_code": address_info.get('zip'),
+                "county": address_info.get('county')
+            }
+        }
         
-        return report
+        with span("report.assemble", format="legacy"):
+            return assemble_legacy_report(estated, ai_insights)
     
     def _convert_legendary_to_legacy(self, legendary_report: LegendaryPropertyReport) -> PropertyReport:
         """Convert legendary 10-section report to legacy 8-section format"""
+        with span("report.convert_to_legacy"), STAGE_SECONDS.time("assembly"):
+            return self._legendary_to_legacy(legendary_report)
+    
+    def _legendary_to_legacy(self, legendary_report: LegendaryPropertyReport) -> PropertyReport:
         
         # Map legendary sections to legacy format
         property_overview = PropertyOverview(
@@ -500,6 +536,7 @@ class ReportGenerator:
         return PropertyReport(
             report_id=legendary_report.report_id,
             generated_at=legendary_report.generated_at,
+            report_mode=legendary_report.report_mode,
             property_overview=property_overview,
             ownership_sale_history=ownership_sale_history,
             equity_position=equity_position,
@@ -515,12 +552,18 @@ class ReportGenerator:
         try:
             estated_status = await self.estated_client.health_check()
             api_keys_valid = settings.validate_api_keys()
+            analysis_cache = self.legendary_generator.legendary_ai_analyzer.analysis_cache
             
             return {
                 "status": "healthy" if estated_status and api_keys_valid else "degraded",
                 "estated_api": "connected" if estated_status else "disconnected",
                 "api_keys": "valid" if api_keys_valid else "missing",
                 "report_cost": settings.REPORT_COST,
+                "property_cache": self.estated_client.cache.stats(),
+                "estated_circuit": self.estated_client.circuit_breaker.stats(),
+                "analysis_cache": analysis_cache.stats() if analysis_cache else None,
+                "prompt_cache": prompt_cache_usage.stats(),
+                "anthropic_governor": self.ai_analyzer.governor.stats(),
                 "timestamp": datetime.now().isoformat()
             }
         except Exception as e:
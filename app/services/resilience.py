@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit breaker is open"""
+
+
+class RetryPolicy:
+    """
+    Retry an idempotent operation with full-jitter exponential backoff
+
+    Attempt n (from 0) sleeps a random time in [0, min(max_delay, base_delay * 2**n)]
+    before the next try. The whole operation, sleeps included, is bounded by
+    `deadline_seconds`; a retry that could not start before the deadline is
+    not attempted.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        deadline_seconds: float
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline_seconds = deadline_seconds
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered delay before retrying after failed attempt number `attempt`"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def run(
+        self,
+        operation: Callable[[], Awaitable[T]],
+        is_retryable: Callable[[Exception], bool]
+    ) -> T:
+        """
+        Run `operation`, retrying failures that `is_retryable` accepts
+
+        Raises:
+            Exception: The last failure once attempts or the deadline run out,
+                or the first non-retryable failure
+            asyncio.TimeoutError: If an attempt is still running at the deadline
+        """
+        deadline = time.monotonic() + self.deadline_seconds
+        attempt = 0
+
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                return await asyncio.wait_for(operation(), timeout=max(remaining, 0))
+            except Exception as e:
+                if not is_retryable(e) or attempt + 1 >= self.max_attempts:
+                    raise
+
+                delay = self.backoff(attempt)
+                if time.monotonic() + delay >= deadline:
+                    raise
+                logger.info(f"Retrying after {type(e).__name__} (attempt {attempt + 1}/{self.max_attempts}, {delay:.2f}s)")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a dependency keeps failing
+
+    Opens after `failure_threshold` consecutive failures. While open, calls raise
+    CircuitOpenError without touching the dependency. After `reset_seconds` a
+    single trial call is let through (half-open): success closes the circuit,
+    failure re-opens it for another `reset_seconds`.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def _before_call(self) -> None:
+        if self.state == CIRCUIT_OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+            self.state = CIRCUIT_HALF_OPEN
+
+        if self.state == CIRCUIT_OPEN or (self.state == CIRCUIT_HALF_OPEN and self._trial_in_flight):
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.name} circuit is open; failing fast")
+
+        if self.state == CIRCUIT_HALF_OPEN:
+            self._trial_in_flight = True
+
+    def _on_success(self) -> None:
+        if self.state != CIRCUIT_CLOSED:
+            logger.info(f"{self.name} circuit closed")
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def _on_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == CIRCUIT_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != CIRCUIT_OPEN:
+                logger.warning(f"{self.name} circuit opened after {self.consecutive_failures} consecutive failures")
+            self.state = CIRCUIT_OPEN
+            self._opened_at = time.monotonic()
+
+    async def call(self, operation: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `operation` through the breaker
+
+        Any exception from `operation` counts as a failure, so callers should
+        only raise for dependency failures (not e.g. "not found").
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        self._before_call()
+        try:
+            result = await operation()
+        except asyncio.CancelledError:
+            self._trial_in_flight = False
+            raise
+        except Exception:
+            self._on_failure()
+            raise
+        self._on_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Breaker state for health reporting"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected": self.rejected
+        }
@@ -0,0 +1,109 @@
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Iterator, List, Optional, Union
+
+
+# Precompiled once instead of on every field lookup
+_NUMBER_PATTERN = re.compile(r'\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)')
+_LIST_ITEM_PATTERN = re.compile(r'[•\-\*]\s*([^\n]+)')
+
+
+class SectionIndex:
+    """
+    Single-pass keyword index over an AI response
+
+    The response is case-folded and split into lines once. Each keyword lookup is
+    then a C-level substring search over the folded text plus a binary search to
+    map the hit back to its line, memoized per keyword. Lookups return exactly
+    what a line-by-line `keyword in line.lower()` scan would.
+    """
+
+    __slots__ = ("content", "lines", "_folded", "_line_starts", "_first_line")
+
+    def __init__(self, content: str):
+        self.content = content
+        self.lines = content.split('\n')
+        self._folded = content.lower()
+        # Offsets are taken from the folded text, whose line lengths can differ
+        # from the original for a few non-ASCII characters
+        folded_lengths = (len(line) + 1 for line in self._folded.split('\n'))
+        self._line_starts: List[int] = [0, *accumulate(folded_lengths)][:-1]
+        self._first_line: Dict[str, Optional[int]] = {}
+
+    @classmethod
+    def of(cls, content: Union[str, "SectionIndex"]) -> "SectionIndex":
+        """Return `content` if it is already indexed, otherwise index it"""
+        return content if isinstance(content, SectionIndex) else cls(content)
+
+    def _line_at(self, offset: int) -> int:
+        return bisect_right(self._line_starts, offset) - 1
+
+    def find_line(self, keyword: str) -> Optional[int]:
+        """Index of the first line containing `keyword` (case-insensitive), or None"""
+        folded_keyword = keyword.lower()
+        if folded_keyword in self._first_line:
+            return self._first_line[folded_keyword]
+
+        offset = self._folded.find(folded_keyword)
+        line_number = self._line_at(offset) if offset >= 0 else None
+        self._first_line[folded_keyword] = line_number
+        return line_number
+
+    def iter_lines(self, keyword: str) -> Iterator[int]:
+        """Indexes of every line containing `keyword` (case-insensitive), in order"""
+        folded_keyword = keyword.lower()
+        line_count = len(self._line_starts)
+        offset = self._folded.find(folded_keyword)
+
+        while offset >= 0:
+            line_number = self._line_at(offset)
+            yield line_number
+            if line_number + 1 >= line_count:
+                return
+            offset = self._folded.find(folded_keyword, self._line_starts[line_number + 1])
+
+    def section(self, keyword: str, default: str) -> str:
+        """The matching line and the two lines after it, joined, or `default`"""
+        line_number = self.find_line(keyword)
+        if line_number is None:
+            return default
+        return ' '.join(self.lines[line_number:line_number + 3]).strip()
+
+    def following_lines(self, keyword: str, default: str, count: int = 3) -> str:
+        """
+        Non-blank, non-heading lines among the `count` lines after a keyword match
+
+        Tries each matching line in order until one has content after it.
+        """
+        for line_number in self.iter_lines(keyword):
+            section_content = [
+                line.strip()
+                for line in self.lines[line_number + 1:line_number + 1 + count]
+                if line.strip() and not line.startswith('#')
+            ]
+            if section_content:
+                return ' '.join(section_content)
+        return default
+
+    def contains(self, keyword: str) -> bool:
+        """Whether `keyword` appears anywhere in the response (case-insensitive)"""
+        return self.find_line(keyword) is not None
+
+    def number(self, keyword: str, default: Optional[float] = None) -> Optional[float]:
+        """First number (e.g. `$1,250.00`) in the keyword's section, or `default`"""
+        numbers = _NUMBER_PATTERN.findall(self.section(keyword, ""))
+        if numbers:
+            try:
+                return float(numbers[0].replace(',', ''))
+            except ValueError:
+                pass
+        return default
+
+    def list_items(self, keyword: str, default: List[str], limit: int = 3) -> List[str]:
+        """Bullet items in the keyword's section, or `default` if there are none"""
+        items = _LIST_ITEM_PATTERN.findall(self.section(keyword, ""))
+        return items[:limit] if items else default
+
+
+ResponseText = Union[str, SectionIndex]
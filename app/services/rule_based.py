@@ -0,0 +1,436 @@
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.services.address import is_same_address
+from app.services.financials import FinancialAssumptions, annual_debt_service, compute_financial_metrics
+
+# Placeholder for fields only the full AI analysis fills in
+NOT_ASSESSED = "Not assessed in lite report (upgrade to the full AI report)"
+
+_ENTITY_PATTERN = re.compile(r"\b(LLC|L\.L\.C|INC|CORP|CORPORATION|COMPANY|CO|LP|LLP|HOLDINGS|PROPERTIES)\b", re.IGNORECASE)
+_TRUST_PATTERN = re.compile(r"\b(TRUST|TRUSTEE|ESTATE)\b", re.IGNORECASE)
+
+
+def classify_property_age(year_built: Optional[int]) -> str:
+    """Classify property age"""
+    if not year_built:
+        return "Age unknown"
+
+    age = datetime.now().year - year_built
+
+    if age < 10:
+        return "New (0-10 years)"
+    elif age < 30:
+        return "Mature (10-30 years)"
+    elif age < 50:
+        return "Vintage (30-50 years)"
+    else:
+        return "Antique (50+ years)"
+
+
+def ownership_duration_years(last_sale_date: Optional[str]) -> Optional[float]:
+    """Years since the last sale (YYYY-MM-DD), or None if unknown"""
+    if not last_sale_date:
+        return None
+
+    try:
+        sale_date = datetime.strptime(last_sale_date, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        return None
+    return round((datetime.now() - sale_date).days / 365.25, 1)
+
+
+def is_absentee_owner(owner_mailing_address: Optional[str], property_address: Optional[str]) -> bool:
+    """Whether the owner's mailing address is somewhere other than the property"""
+    if not owner_mailing_address or not property_address:
+        return False
+    return not is_same_address(owner_mailing_address, property_address)
+
+
+def computed_section_fields(
+    property_data: Dict[str, Any],
+    assumptions: Optional[FinancialAssumptions] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Insight fields calculated from the property data rather than inferred by Claude
+
+    Shared by the AI analyzers (which merge them into Claude's sections) and
+    the rule-based lite analysis. Reads the property record as parsed by
+    EstatedClient (`property.year_built`, `property.last_sale_date`,
+    `owner.mailing_address`, `address.formatted_address`).
+    """
+    property_details = property_data.get('property', {})
+    owner_info = property_data.get('owner', {})
+    metrics = compute_financial_metrics(property_data, assumptions)
+
+    return {
+        "property_identity": {
+            "property_age_classification": classify_property_age(property_details.get('year_built'))
+        },
+        "valuation_equity": {
+            "price_per_sqft_current": metrics["price_per_sqft_current"],
+            "price_per_sqft_historical": metrics["price_per_sqft_historical"],
+            "estimated_equity": metrics["estimated_equity"]
+        },
+        "ownership_profile": {
+            "absentee_owner_flag": is_absentee_owner(
+                owner_info.get('mailing_address'),
+                property_data.get('address', {}).get('formatted_address')
+            ),
+            "time_held_years": ownership_duration_years(property_details.get('last_sale_date'))
+        },
+        "financial_breakdown": {
+            "estimated_rental_income": metrics["monthly_rent"],
+            "estimated_cap_rate": metrics["cap_rate"],
+            "noi_estimate": metrics["noi"],
+            "monthly_carrying_costs": (
+                f"${metrics['monthly_carrying_costs']:,.0f}/month (tax, insurance, maintenance)"
+                if metrics["monthly_carrying_costs"] is not None else "Costs analysis pending"
+            ),
+            "cash_on_cash_return": (
+                f"{metrics['cash_on_cash_return']:.1f}% annually (financed at current assumptions)"
+                if metrics["cash_on_cash_return"] is not None else "Return calculation pending"
+            )
+        }
+    }
+
+
+def _money(value: Optional[float]) -> str:
+    if value is None:
+        return "unknown"
+    return f"-${-value:,.0f}" if value < 0 else f"${value:,.0f}"
+
+
+class RuleBasedAnalyzer:
+    """
+    Deterministic legendary insights from Estated data and local rules only
+
+    Produces every legendary section without calling Claude: computed metrics
+    and flags where the data supports them, simple rule-based ratings for
+    strategy, motivation and risk, and NOT_ASSESSED for narrative fields that
+    need the full AI analysis (neighborhood, market context, marketing copy).
+    Used for lite reports and as the fallback when Claude is unavailable.
+    """
+
+    def __init__(self, assumptions: Optional[FinancialAssumptions] = None):
+        self.assumptions = assumptions or FinancialAssumptions()
+
+    def analyze_property_legendary(self, property_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build legendary insights for a property without AI
+
+        Args:
+            property_data: Property record from EstatedClient
+
+        Returns:
+            Insight dicts keyed by legendary section, in the shape the AI analyzer returns
+        """
+        computed = computed_section_fields(property_data, self.assumptions)
+        facts = self._facts(property_data, computed)
+
+        return {
+            "property_identity": {**computed["property_identity"], **self._property_identity(facts)},
+            "valuation_equity": {**computed["valuation_equity"], **self._valuation_equity(facts)},
+            "deal_strategy": self._deal_strategy(facts),
+            "ownership_profile": {**computed["ownership_profile"], **self._ownership_profile(facts)},
+            "investor_action": self._investor_action(facts),
+            "neighborhood_infrastructure": {
+                field: NOT_ASSESSED for field in (
+                    "neighborhood_type", "school_zone_quality", "transit_access_level", "walkability_estimate",
+                    "distance_to_commercial", "road_type", "parking_availability", "development_trend"
+                )
+            },
+            "risk_flags": self._risk_flags(facts),
+            "financial_breakdown": {**computed["financial_breakdown"], **self._financial_breakdown(facts)},
+            "market_context": {
+                field: NOT_ASSESSED for field in (
+                    "city_appreciation_trend", "median_home_price_vs_subject", "average_holding_period_zip",
+                    "investor_activity_score", "neighborhood_appreciation_rate", "gentrification_likelihood"
+                )
+            },
+            "executive_summary": self._executive_summary(facts),
+            "bonus_extras": self._bonus_extras(facts)
+        }
+
+    def _facts(self, property_data: Dict[str, Any], computed: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Flatten the inputs every rule reads from the parsed Estated record"""
+        property_details = property_data.get('property', {})
+        valuation = property_data.get('valuation', {})
+        address = property_data.get('address', {})
+        owner = property_data.get('owner', {})
+        metrics = compute_financial_metrics(property_data, self.assumptions)
+
+        year_built = property_details.get('year_built')
+        avm = valuation.get('avm') or None
+        last_sale = property_details.get('last_sale_price') or None
+        assessed = valuation.get('tax_assessed_value') or None
+        equity = computed["valuation_equity"]["estimated_equity"]
+        years_held = computed["ownership_profile"]["time_held_years"]
+        absentee = computed["ownership_profile"]["absentee_owner_flag"]
+
+        return {
+            "address": address.get('formatted_address') or "this property",
+            "city": address.get('city'),
+            "property_type": property_details.get('property_type') or "Property",
+            "bedrooms": property_details.get('bedrooms'),
+            "bathrooms": property_details.get('bathrooms'),
+            "sqft": property_details.get('sqft'),
+            "year_built": year_built,
+            "age": datetime.now().year - year_built if year_built else None,
+            "age_class": computed["property_identity"]["property_age_classification"],
+            "avm": avm,
+            "last_sale": last_sale,
+            "assessed_ratio": assessed / avm if assessed and avm else None,
+            "equity": equity,
+            "equity_ratio": equity / avm if equity is not None and avm else None,
+            "years_held": years_held,
+            "absentee": absentee,
+            "owner_name": owner.get('name') or "",
+            "metrics": metrics,
+            "motivation": self._motivation_score(absentee, years_held, equity / avm if equity is not None and avm else None)
+        }
+
+    def _motivation_score(self, absentee: bool, years_held: Optional[float], equity_ratio: Optional[float]) -> int:
+        """1-10 likelihood the owner would sell, from absentee status, tenure and equity"""
+        score = 5
+        if absentee:
+            score += 2
+        if years_held is not None:
+            score += 1 if years_held >= 10 else -1 if years_held < 2 else 0
+        if equity_ratio is not None and equity_ratio >= 0.5:
+            score += 1
+        return max(1, min(10, score))
+
+    def _property_identity(self, facts: Dict[str, Any]) -> Dict[str, Any]:
+        beds_baths = (
+            f"{facts['bedrooms']}bd/{facts['bathrooms']}ba "
+            if facts['bedrooms'] is not None and facts['bathrooms'] is not None else ""
+        )
+        size = f", {facts['sqft']:,} sq ft" if facts['sqft'] else ""
+        built = f", built {facts['year_built']}" if facts['year_built'] else ""
+        age = facts['age']
+        if age is None:
+            condition = "Condition unknown (no year built on record)"
+        elif age >= 50:
+            condition = "Original systems likely at end of life; inspect roof, electrical, plumbing and foundation"
+        elif age >= 30:
+            condition = "Major systems likely replaced or due; inspect roof and HVAC"
+        else:
+            condition = "Likely good condition for its age"
+
+        return {
+            "structure_condition": condition,
+            "exterior_material_style": NOT_ASSESSED,
+            "zoning_compatibility_issues": NOT_ASSESSED,
+            "human_readable_summary": f"{beds_baths}{facts['property_type']} at {facts['address']}{size}{built}."
+        }
+
+    def _valuation_equity(self, facts: Dict[str, Any]) -> Dict[str, Any]:
+        ratio = facts['assessed_ratio']
+        if ratio is None:
+            discrepancy = undervaluation = "Assessed value or AVM unavailable"
+        else:
+            discrepancy = f"Assessed value is {ratio:.0%} of AVM"
+            if ratio < 0.7:
+                undervaluation = "High - assessment well below market value; reassessment could raise taxes"
+            elif ratio < 0.9:
+                undervaluation = "Moderate - assessment somewhat below market value"
+            else:
+                undervaluation = "Low - assessment close to market value"
+
+        years = facts['years_held']
+        if facts['avm'] and facts['last_sale'] and years and years >= 1:
+            annual = (facts['avm'] / facts['last_sale']) ** (1 / years) - 1
+            appreciation = f"{annual:.1%} per year since the last sale (historical, not a forecast)"
+        else:
+            appreciation = NOT_ASSESSED
+
+        return {
+            "assessed_undervaluation_risk": undervaluation,
+            "tax_vs_avm_discrepancy": discrepancy,
+            "forecasted_appreciation": appreciation,
+            "price_trend_comparison": NOT_ASSESSED
+        }
+
+    def _deal_strategy(self, facts: Dict[str, Any]) -> Dict[str, Any]:
+        metrics = facts['metrics']
+        equity_ratio = facts['equity_ratio']
+        cap_rate = metrics['cap_rate']
+        age = facts['age'] or 0
+
+        if equity_ratio is None:
+            flip_grade = "C - Insufficient valuation data"
+        elif equity_ratio >= 0.5 and age >= 30:
+            flip_grade = "A - Deep equity on an older home suits a value-add flip"
+        elif equity_ratio >= 0.3:
+            flip_grade = "B - Solid equity cushion"
+        elif equity_ratio >= 0.1:
+            flip_grade = "C - Thin margin for a flip"
+        else:
+            flip_grade = "D - Little or no equity"
+
+        if cap_rate is None:
+            rental_fit = "Unknown (no AVM)"
+        elif cap_rate >= 7:
+            rental_fit = f"Strong - {cap_rate:.1f}% cap rate"
+        elif cap_rate >= 5:
+            rental_fit = f"Moderate - {cap_rate:.1f}% cap rate"
+        else:
+            rental_fit = f"Weak - {cap_rate:.1f}% cap rate"
+
+        if cap_rate is not None and cap_rate >= 7:
+            top_strategy = "Buy and hold for rental income"
+        elif flip_grade.startswith(("A", "B")):
+            top_strategy = "Value-add purchase below AVM, then flip or refinance"
+        else:
+            top_strategy = "Wholesale or pass unless the full analysis finds an angle"
+
+        if age >= 60:
+            rehab = "Evaluate rebuild vs heavy rehab"
+        elif age >= 30:
+            rehab = "Moderate rehab likely (systems and finishes)"
+        else:
+            rehab = "Light cosmetic rehab or leave as is"
+
+        return {
+            "flip_potential_score": flip_grade,
+            "brrrr_potential": rental_fit,
+            "buy_hold_rental_fit": rental_fit,
+            "wholesaling_viability": "Viable - equity and motivation support a discount" if facts['motivation'] >= 7 else NOT_ASSESSED,
+            "rebuild_vs_rehab_vs_leave": rehab,
+            "income_property_conversion": NOT_ASSESSED,
+            "top_strategy_recommendation": top_strategy,
+            "suggested_purchase_price": round(facts['avm'] * 0.8, -3) if facts['avm'] else None,
+            "holding_cost_estimate": (
+                f"{_money(metrics['monthly_carrying_costs'])}/month before financing"
+                if metrics['monthly_carrying_costs'] is not None else NOT_ASSESSED
+            ),
+            "roi_estimate": (
+                f"{metrics['cash_on_cash_return']:.1f}% cash-on-cash at current assumptions"
+                if metrics['cash_on_cash_return'] is not None else NOT_ASSESSED
+            )
+        }
+
+    def _ownership_profile(self, facts: Dict[str, Any]) -> Dict[str, Any]:
+        years = facts['years_held']
+        if _ENTITY_PATTERN.search(facts['owner_name']):
+            owner_type = "Entity (LLC or corporation) - likely investor"
+        elif _TRUST_PATTERN.search(facts['owner_name']):
+            owner_type = "Trust or estate"
+        elif facts['owner_name']:
+            owner_type = "Individual"
+        else:
+            owner_type = "Unknown"
+
+        if facts['absentee']:
+            reason = "Absentee owner managing a property from elsewhere"
+        elif years is not None and years >= 15:
+            reason = "Long tenure - possible downsizing or retirement"
+        else:
+            reason = "No strong signal from public records"
+
+        return {
+            "owner_occupancy_likelihood": "Likely not owner-occupied (mailing address differs)" if facts['absentee'] else "Likely owner-occupied",
+            "long_term_hold_score": f"{min(10, max(1, round(years / 2)))}/10" if years is not None else "Unknown",
+            "owner_type_inference": owner_type,
+            "motivation_to_sell_score": facts['motivation'],
+            "top_reason_might_sell": reason
+        }
+
+    def _investor_action(self, facts: Dict[str, Any]) -> Dict[str, Any]:
+        avm = facts['avm']
+        motivation = facts['motivation']
+        return {
+            "recommended_approach": "Direct mail to the owner's mailing address" if facts['absentee'] else "Door knock or direct mail to the property",
+            "suggested_message_script": (
+                f"Hi, I'm a local investor interested in {facts['address']}. "
+                "Would you consider a cash offer with a quick, flexible closing?"
+            ),
+            "suggested_offer_range": f"{_money(avm * 0.7)} - {_money(avm * 0.85)} (70-85% of AVM)" if avm else NOT_ASSESSED,
+            "counter_offer_logic": "Anchor counters to AVM, repair needs and carrying costs",
+            "contact_urgency_estimate": "High - contact this week" if motivation >= 8 else "Medium - contact within 2 weeks" if motivation >= 6 else "Low - add to nurture list"
+        }
+
+    def _risk_flags(self, facts: Dict[str, Any]) -> Dict[str, Any]:
+        age = facts['age']
+        ratio = facts['assessed_ratio']
+        years = facts['years_held']
+        return {
+            "age_no_remodel_flag": f"Flag - {age} years old; verify remodel history" if age is not None and age >= 40 else "No flag",
+            "avm_vs_tax_flag": f"Flag - assessed at {ratio:.0%} of AVM" if ratio is not None and ratio < 0.7 else "No flag",
+            "structure_age_risk": facts['age_class'],
+            "flip_speculation_warning": "Warning - sold within the last 2 years" if years is not None and years < 2 else "No flag",
+            "ownership_cluster_warning": NOT_ASSESSED,
+            "flood_zone_inference": NOT_ASSESSED,
+            "tornado_risk_inference": NOT_ASSESSED,
+            "earthquake_risk_inference": NOT_ASSESSED,
+            "wildfire_proximity_inference": NOT_ASSESSED,
+            "historical_disaster_proximity": NOT_ASSESSED
+        }
+
+    def _financial_breakdown(self, facts: Dict[str, Any]) -> Dict[str, Any]:
+        avm, sqft, age = facts['avm'], facts['sqft'], facts['age']
+        metrics = facts['metrics']
+        if not avm:
+            return {field: NOT_ASSESSED for field in (
+                "rehab_cost_estimate", "total_project_budget", "exit_price_scenarios", "profit_potential_per_strategy"
+            )}
+
+        # Rehab cost per sq ft by age bracket
+        low, high = (5, 15) if (age or 0) < 10 else (15, 30) if (age or 0) < 30 else (30, 50) if (age or 0) < 50 else (45, 75)
+        rehab_low, rehab_high = (low * sqft, high * sqft) if sqft else (None, None)
+        purchase = avm * 0.8
+        monthly_cash_flow = (metrics['noi'] - annual_debt_service(avm, self.assumptions)) / 12
+
+        return {
+            "rehab_cost_estimate": f"{_money(rehab_low)} - {_money(rehab_high)} (${low}-${high}/sq ft for its age)" if sqft else NOT_ASSESSED,
+            "total_project_budget": (
+                f"{_money(purchase + rehab_low)} - {_money(purchase + rehab_high)} (80% of AVM purchase + rehab)"
+                if sqft else NOT_ASSESSED
+            ),
+            "exit_price_scenarios": f"Pessimistic: {_money(avm * 0.95)}, Realistic: {_money(avm)}, Aggressive: {_money(avm * 1.08)}",
+            "profit_potential_per_strategy": (
+                f"Rental: {_money(monthly_cash_flow)}/month cash flow after debt service; "
+                f"Flip: {_money(avm - purchase - (rehab_high or 0))} - {_money(avm - purchase - (rehab_low or 0))} before selling costs"
+            )
+        }
+
+    def _executive_summary(self, facts: Dict[str, Any]) -> Dict[str, Any]:
+        strengths: List[str] = []
+        weaknesses: List[str] = []
+        metrics = facts['metrics']
+        if facts['equity_ratio'] is not None:
+            (strengths if facts['equity_ratio'] >= 0.3 else weaknesses).append(f"Equity {facts['equity_ratio']:.0%} of AVM")
+        if metrics['cap_rate'] is not None:
+            (strengths if metrics['cap_rate'] >= 6 else weaknesses).append(f"{metrics['cap_rate']:.1f}% cap rate")
+        if facts['absentee']:
+            strengths.append("Absentee owner")
+        if facts['age'] is not None and facts['age'] >= 40:
+            weaknesses.append(f"{facts['age']}-year-old structure")
+        if facts['years_held'] is not None and facts['years_held'] < 2:
+            weaknesses.append("Recently sold")
+
+        score = len(strengths) - len(weaknesses)
+        verdict = "Worth a closer look" if score > 0 else "Marginal - run the full analysis first" if score == 0 else "Likely pass"
+        return {
+            "worth_it_verdict": f"{verdict} (rule-based lite assessment)",
+            "top_3_strengths": strengths[:3] or ["None identified from public records"],
+            "top_3_weaknesses": weaknesses[:3] or ["None identified from public records"],
+            "recommended_next_step": "Upgrade to the full AI report for market, neighborhood and strategy analysis",
+            "report_scorecard": "Lite report - Estated data and rules only",
+            "time_sensitive_insight": "Motivated-seller signals present" if facts['motivation'] >= 7 else NOT_ASSESSED
+        }
+
+    def _bonus_extras(self, facts: Dict[str, Any]) -> Dict[str, Any]:
+        metrics = facts['metrics']
+        return {
+            "investor_pitch_deck_text": NOT_ASSESSED,
+            "marketing_copy": NOT_ASSESSED,
+            "shareable_summary": (
+                f"**{facts['address']}** - AVM {_money(facts['avm'])}, equity {_money(facts['equity'])}, "
+                f"cap rate {metrics['cap_rate'] if metrics['cap_rate'] is not None else 'unknown'}%, "
+                f"motivation {facts['motivation']}/10"
+            ),
+            "custom_report_name": f"Lite Report - {facts['address']}"
+        }
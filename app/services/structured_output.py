@@ -0,0 +1,102 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple, Type
+
+from pydantic import BaseModel, create_model
+
+from app.models import LegendaryPropertyReport
+
+LEGENDARY_ANALYSIS_TOOL_NAME = "record_legendary_analysis"
+
+# Report fields filled from Estated data or computed locally rather than by Claude
+LEGENDARY_NON_AI_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "property_identity": (
+        "full_address", "apn", "parcel_id", "property_type", "structure_sqft", "lot_sqft",
+        "lot_dimensions", "bedrooms", "bathrooms", "year_built", "stories", "garage_type",
+        "legal_land_use", "property_age_classification"
+    ),
+    "valuation_equity": (
+        "avm_value", "last_sale_price", "last_sale_date", "assessed_tax_value", "property_tax_amount",
+        "price_per_sqft_current", "price_per_sqft_historical", "estimated_equity"
+    ),
+    "ownership_profile": ("owner_names", "owner_mailing_address", "absentee_owner_flag", "time_held_years"),
+    "neighborhood_infrastructure": ("zip_code", "county", "census_data_basic"),
+    "financial_breakdown": (
+        "estimated_rental_income", "estimated_cap_rate", "monthly_carrying_costs", "noi_estimate",
+        "cash_on_cash_return"
+    ),
+}
+
+
+def _legendary_section_models() -> Dict[str, Type[BaseModel]]:
+    """Section model for each legendary report section, in report order"""
+    return {
+        name: field.annotation
+        for name, field in LegendaryPropertyReport.model_fields.items()
+        if isinstance(field.annotation, type) and issubclass(field.annotation, BaseModel)
+    }
+
+
+@lru_cache(maxsize=None)
+def _ai_section_model(section_key: str) -> Type[BaseModel]:
+    """The section model restricted to the fields Claude is asked to fill"""
+    section_model = _legendary_section_models()[section_key]
+    excluded = LEGENDARY_NON_AI_FIELDS.get(section_key, ())
+    fields = {
+        name: (field.annotation, field)
+        for name, field in section_model.model_fields.items()
+        if name not in excluded
+    }
+    return create_model(f"{section_model.__name__}Analysis", __doc__=section_model.__doc__, **fields)
+
+
+@lru_cache(maxsize=None)
+def legendary_output_model(section_keys: Tuple[str, ...]) -> Type[BaseModel]:
+    """Model for Claude's structured output covering the given sections"""
+    fields = {section_key: (_ai_section_model(section_key), ...) for section_key in section_keys}
+    return create_model("LegendaryAnalysis", **fields)
+
+
+def legendary_analysis_tool(section_keys: Sequence[str]) -> Dict[str, Any]:
+    """Tool definition whose input schema is the AI-filled part of the given sections"""
+    output_model = legendary_output_model(tuple(section_keys))
+    return {
+        "name": LEGENDARY_ANALYSIS_TOOL_NAME,
+        "description": "Record the property analysis. Each field description says what the field must contain.",
+        "input_schema": output_model.model_json_schema()
+    }
+
+
+def parse_legendary_tool_output(
+    response: Any,
+    section_keys: Sequence[str]
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    Validate the analysis tool call in a Claude response
+
+    Fields Claude left out validate with their model defaults (None for optional
+    fields), so they are reported back: an analysis with missing fields should be
+    served but not cached.
+
+    Args:
+        response: Anthropic message returned for a request using `legendary_analysis_tool`
+        section_keys: Sections the tool was asked to fill
+
+    Returns:
+        Tuple of (AI insights keyed by section, "section.field" names missing from the tool input)
+
+    Raises:
+        ValueError: If the response has no analysis tool call
+        pydantic.ValidationError: If the tool input does not match the schema
+    """
+    for block in response.content or []:
+        if getattr(block, "type", None) == "tool_use" and block.name == LEGENDARY_ANALYSIS_TOOL_NAME:
+            analysis = legendary_output_model(tuple(section_keys)).model_validate(block.input)
+            missing_fields = [
+                f"{section_key}.{name}"
+                for section_key in section_keys
+                for name in _ai_section_model(section_key).model_fields
+                if name not in getattr(analysis, section_key).model_fields_set
+            ]
+            return analysis.model_dump(), missing_fields
+
+    raise ValueError(f"Claude response did not call {LEGENDARY_ANALYSIS_TOOL_NAME}")
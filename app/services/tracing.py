@@ -0,0 +1,270 @@
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # OpenTelemetry export is optional
+    otel_trace = None
+
+logger = logging.getLogger(__name__)
+
+# Response header carrying the request's trace id
+TRACE_ID_HEADER = "X-Trace-Id"
+
+_trace_id: ContextVar[Optional[str]] = ContextVar("alyprop_trace_id", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("alyprop_span", default=None)
+
+
+def new_trace_id() -> str:
+    """Random 128-bit trace id in the W3C / OpenTelemetry hex form"""
+    return os.urandom(16).hex()
+
+
+def current_trace_id() -> Optional[str]:
+    """Trace id of the request being handled, if any"""
+    return _trace_id.get()
+
+
+class Span:
+    """
+    One timed step of a request, recorded by the in-memory tracer
+
+    Attributes:
+        name: Step name, e.g. "estated.get_property_data"
+        trace_id: Id shared by every span of the request
+        span_id: Id of this span
+        parent_id: span_id of the enclosing span, None for the root
+        attributes: Key/value details (address, cache outcome, token counts, ...)
+        error: Exception type name if the step raised
+    """
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes", "error", "start_ns", "end_ns", "_token")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return (self.end_ns - self.start_ns) / 1e6 if self.end_ns is not None else None
+
+
+class _NoopSpan:
+    """Span stand-in when tracing is off; entering and leaving it costs one method call each"""
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class InMemorySpanExporter:
+    """Keeps finished spans in a list so tests can inspect span trees without a collector"""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+    def find(self, name: str) -> List[Span]:
+        """Finished spans with the given name, in completion order"""
+        return [span for span in self.spans if span.name == name]
+
+    def span_tree(self, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Finished spans of one trace (default: the most recent) as nested dicts
+
+        Returns:
+            Root spans, each {"name", "attributes", "error", "duration_ms", "children"}
+            with children ordered by start time
+        """
+        if trace_id is None and self.spans:
+            trace_id = self.spans[-1].trace_id
+        spans = sorted((span for span in self.spans if span.trace_id == trace_id), key=lambda span: span.start_ns)
+
+        nodes = {
+            span.span_id: {
+                "name": span.name,
+                "attributes": span.attributes,
+                "error": span.error,
+                "duration_ms": span.duration_ms,
+                "children": []
+            }
+            for span in spans
+        }
+        roots = []
+        for span in spans:
+            parent = nodes.get(span.parent_id)
+            (parent["children"] if parent is not None else roots).append(nodes[span.span_id])
+        return roots
+
+
+class _RecordingSpan:
+    """Context manager that times a Span, makes it current and exports it on exit"""
+    __slots__ = ("exporter", "name", "attributes", "span")
+
+    def __init__(self, exporter: InMemorySpanExporter, name: str, attributes: Dict[str, Any]):
+        self.exporter = exporter
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self) -> Span:
+        parent = _current_span.get()
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            trace_id, parent_id = _trace_id.get() or new_trace_id(), None
+        span = self.span = Span(self.name, trace_id, parent_id, self.attributes)
+        span._token = _current_span.set(span)
+        return span
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        span = self.span
+        span.end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            span.error = exc_type.__name__
+        _current_span.reset(span._token)
+        self.exporter.export(span)
+
+
+class _OpenTelemetrySpan:
+    """Context manager around an OpenTelemetry span that also publishes its trace id"""
+    __slots__ = ("context", "token")
+
+    def __init__(self, tracer: Any, name: str, attributes: Dict[str, Any]):
+        self.context = tracer.start_as_current_span(name, attributes=attributes)
+
+    def __enter__(self) -> Any:
+        span = self.context.__enter__()
+        trace_id = span.get_span_context().trace_id
+        self.token = _trace_id.set(format(trace_id, "032x")) if trace_id else None
+        return span
+
+    def __exit__(self, *exc_info: Any) -> Any:
+        if self.token is not None:
+            _trace_id.reset(self.token)
+        return self.context.__exit__(*exc_info)
+
+
+class Tracer:
+    """
+    Opens spans with the configured backend
+
+    - `none` (default): spans are no-ops; requests still get a trace id for logs
+      and the `X-Trace-Id` header.
+    - `memory`: finished spans go to `exporter` (an InMemorySpanExporter).
+    - `otel`: spans are created through the OpenTelemetry API, so whatever SDK,
+      exporter and sampler the host process configured receives them.
+    """
+
+    def __init__(self, backend: str = "none", exporter: Optional[InMemorySpanExporter] = None):
+        self.backend = backend
+        self.exporter = exporter
+        self._otel_tracer = otel_trace.get_tracer("alyprop") if backend == "otel" else None
+
+    def span(self, name: str, **attributes: Any) -> Any:
+        """Context manager for one pipeline step; yields an object with `set_attribute`"""
+        if self.exporter is not None:
+            return _RecordingSpan(self.exporter, name, attributes)
+        if self._otel_tracer is not None:
+            return _OpenTelemetrySpan(self._otel_tracer, name, attributes)
+        return _NOOP_SPAN
+
+
+def _build_tracer(backend: str) -> Tracer:
+    if backend == "memory":
+        return Tracer(backend, exporter=InMemorySpanExporter())
+    if backend == "otel":
+        if otel_trace is not None:
+            return Tracer(backend)
+        logger.warning("TRACING_EXPORTER=otel but opentelemetry-api is not installed; tracing disabled")
+    elif backend != "none":
+        logger.warning(f"Unknown TRACING_EXPORTER '{backend}'; tracing disabled")
+    return Tracer("none")
+
+
+# Shared by every service in the process; replaced by configure_tracing()
+tracer = _build_tracer(settings.TRACING_EXPORTER)
+
+
+def configure_tracing(backend: str) -> Tracer:
+    """
+    Switch the process-wide tracer, e.g. `configure_tracing("memory")` in tests
+
+    Returns:
+        The new tracer; with the memory backend, read spans from `tracer.exporter`
+    """
+    global tracer
+    tracer = _build_tracer(backend)
+    return tracer
+
+
+def span(name: str, **attributes: Any) -> Any:
+    """Open a span on the current process-wide tracer"""
+    return tracer.span(name, **attributes)
+
+
+class TraceIdLogFilter(logging.Filter):
+    """Adds `trace_id` to log records ("-" outside a request) for use in log formats"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = _trace_id.get() or "-"
+        return True
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware giving each HTTP request a trace id and a root span
+
+    The id is set before the app runs so every log line of the request carries
+    it, and is returned in the `X-Trace-Id` response header. With the OpenTelemetry
+    backend the id is the OpenTelemetry trace id, so logs and traces line up.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _trace_id.set(new_trace_id())
+        try:
+            with span(f"{scope['method']} {scope['path']}", http_method=scope["method"], http_path=scope["path"]) as root:
+                header = (TRACE_ID_HEADER.lower().encode(), _trace_id.get().encode())
+
+                async def send_with_trace_id(message: Dict[str, Any]) -> None:
+                    if message["type"] == "http.response.start":
+                        message["headers"] = [*message.get("headers", []), header]
+                        root.set_attribute("http_status", message["status"])
+                    await send(message)
+
+                await self.app(scope, receive, send_with_trace_id)
+        finally:
+            _trace_id.reset(token)
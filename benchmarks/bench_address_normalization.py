@@ -0,0 +1,101 @@
+"""
+Address normalization: throughput and dedupe rate over synthetic addresses
+
+Generates 100k addresses drawn from a smaller set of parcels, each written with
+a random mix of spellings ("Street"/"St."/"ST", "North"/"N", "Apt 4"/"#4",
+ZIP vs ZIP+4, case and spacing), then checks every spelling of a parcel maps to
+one canonical key and prints cold (unmemoized) and warm (LRU hit) timings.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_address_normalization.py [--addresses 100000] [--parcels 20000]
+"""
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+from app.services.address import canonical_address_key, normalize_address
+
+_STREET_NAMES = ["Main", "Oak", "Maple", "Cedar", "Elm", "Washington", "Lake", "Hill", "Park", "Pine",
+                 "Sunset", "Ridge", "Church", "Mill", "River", "Highland", "Walnut", "Cherry", "Lincoln"]
+_SUFFIXES = [("Street", "St"), ("Avenue", "Ave"), ("Boulevard", "Blvd"), ("Drive", "Dr"), ("Road", "Rd"),
+             ("Lane", "Ln"), ("Court", "Ct"), ("Place", "Pl"), ("Parkway", "Pkwy"), ("Terrace", "Ter")]
+_DIRECTIONALS = [("North", "N"), ("South", "S"), ("East", "E"), ("West", "W"), ("Northeast", "NE")]
+_UNIT_FORMS = ["Apt {}", "Apartment {}", "#{}", "Unit {}", "Ste {}", "Suite # {}"]
+_CITIES = [("Austin", "TX", "78701"), ("Springfield", "IL", "62704"), ("Denver", "CO", "80202"),
+           ("Portland", "OR", "97205"), ("Columbus", "OH", "43215"), ("Raleigh", "NC", "27601")]
+
+
+def _parcel(rng: random.Random) -> Tuple:
+    number = rng.randint(1, 9999)
+    directional = rng.choice(_DIRECTIONALS) if rng.random() < 0.3 else None
+    unit = rng.randint(1, 40) if rng.random() < 0.25 else None
+    return number, directional, rng.choice(_STREET_NAMES), rng.choice(_SUFFIXES), unit, rng.choice(_CITIES)
+
+
+def _spell(parcel: Tuple, rng: random.Random) -> str:
+    number, directional, name, suffix, unit, (city, state, zip_code) = parcel
+    parts = [str(number)]
+    if directional:
+        parts.append(rng.choice(directional) + rng.choice(["", "."]))
+    parts.append(name)
+    parts.append(rng.choice([suffix[0], suffix[1], suffix[1] + "."]))
+    street = " ".join(parts)
+    if unit:
+        street += rng.choice([" ", ", "]) + rng.choice(_UNIT_FORMS).format(unit)
+    zip_text = zip_code + (f"-{rng.randint(0, 9999):04d}" if rng.random() < 0.3 else "")
+    address = f"{street}, {city}{rng.choice([', ', ' '])}{state} {zip_text}"
+    if rng.random() < 0.2:
+        address += ", USA"
+    address = rng.choice([str.upper, str.lower, lambda text: text])(address)
+    return address.replace(" ", "  ") if rng.random() < 0.1 else address
+
+
+def synthetic_addresses(count: int, parcels: int, seed: int = 11) -> Tuple[List[str], List[int]]:
+    """`count` spellings and, for each, the index of the parcel it refers to"""
+    rng = random.Random(seed)
+    distinct = {}
+    while len(distinct) < parcels:
+        parcel = _parcel(rng)
+        distinct.setdefault(parcel, len(distinct))
+    parcel_list = list(distinct)
+    owners = [rng.randrange(parcels) for _ in range(count)]
+    return [_spell(parcel_list[owner], rng) for owner in owners], owners
+
+
+def _time(label: str, addresses: List[str]) -> float:
+    started = time.perf_counter()
+    for address in addresses:
+        canonical_address_key(address)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<22} {elapsed * 1000:9.1f} ms   {elapsed / len(addresses) * 1e6:6.2f} us/address")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--addresses", type=int, default=100_000)
+    parser.add_argument("--parcels", type=int, default=20_000)
+    args = parser.parse_args()
+
+    addresses, owners = synthetic_addresses(args.addresses, args.parcels)
+    unique_spellings = len(set(addresses))
+
+    normalize_address.cache_clear()
+    keys = [canonical_address_key(address) for address in addresses]
+    keys_by_parcel = {}
+    for owner, key in zip(owners, keys):
+        keys_by_parcel.setdefault(owner, set()).add(key)
+    split = sum(1 for parcel_keys in keys_by_parcel.values() if len(parcel_keys) > 1)
+    assert split == 0, f"{split} parcels normalized to more than one key"
+    assert len(set(keys)) == len(keys_by_parcel), "distinct parcels collapsed onto one key"
+
+    print(f"Addresses: {len(addresses):,} ({unique_spellings:,} distinct spellings of {len(keys_by_parcel):,} parcels)")
+    normalize_address.cache_clear()
+    _time("cold (unmemoized)", addresses)
+    _time("warm (LRU hits)", addresses)
+    print(f"LRU: {normalize_address.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Financial metrics: scalar loop vs NumPy batch over synthetic properties
+
+Builds property records like the ones EstatedClient returns (with some AVMs,
+sale prices, areas and tax amounts missing), then computes the metrics once per
+property with `compute_financial_metrics` and once for all of them with
+`compute_financial_metrics_batch`. Checks that both agree (None vs NaN for
+missing inputs) and prints the timings. Requires numpy (in the dev requirements).
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_financials.py [--properties 100000] [--missing-rate 0.05]
+"""
+import argparse
+import math
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from app.services.financials import FinancialAssumptions, compute_financial_metrics, compute_financial_metrics_batch
+
+
+def synthetic_properties(count: int, missing_rate: float, seed: int = 5) -> List[Dict[str, Any]]:
+    """Parsed-shape property records; each input is left out with probability `missing_rate`"""
+    rng = random.Random(seed)
+
+    def maybe(value: int) -> Optional[int]:
+        return None if rng.random() < missing_rate else value
+
+    properties = []
+    for _ in range(count):
+        avm = rng.randrange(90_000, 2_500_000, 1_000)
+        property_details = {
+            "last_sale_price": maybe(int(avm * rng.uniform(0.3, 1.0))),
+            "sqft": maybe(rng.randrange(600, 6000, 10)),
+        }
+        valuation = {
+            "avm": maybe(avm),
+            "property_tax_amount": maybe(int(avm * rng.uniform(0.008, 0.025))),
+        }
+        # Empty fields are omitted, as in EstatedClient's parsed records
+        properties.append({
+            "property": {name: value for name, value in property_details.items() if value is not None},
+            "valuation": {name: value for name, value in valuation.items() if value is not None},
+        })
+    return properties
+
+
+def batch_inputs(properties: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Columns for compute_financial_metrics_batch, None where a record lacks the field"""
+    return {
+        "avm": [p["valuation"].get("avm") for p in properties],
+        "last_sale_price": [p["property"].get("last_sale_price") for p in properties],
+        "sqft": [p["property"].get("sqft") for p in properties],
+        "tax_amount": [p["valuation"].get("property_tax_amount") for p in properties],
+    }
+
+
+def _same(scalar: Any, batch: float) -> bool:
+    if scalar is None:
+        return math.isnan(batch)
+    return math.isclose(scalar, batch, rel_tol=1e-9, abs_tol=0.011)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--properties", type=int, default=100_000)
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    args = parser.parse_args()
+
+    assumptions = FinancialAssumptions()
+    properties = synthetic_properties(args.properties, args.missing_rate)
+    columns = batch_inputs(properties)
+
+    started = time.perf_counter()
+    scalar = [compute_financial_metrics(property_data, assumptions) for property_data in properties]
+    scalar_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = compute_financial_metrics_batch(assumptions=assumptions, **columns)
+    batch_seconds = time.perf_counter() - started
+
+    mismatches = sum(
+        1
+        for index, metrics in enumerate(scalar)
+        for name, value in metrics.items()
+        if not _same(value, float(batch[name][index]))
+    )
+    assert mismatches == 0, f"{mismatches} metric values differ between scalar and batch"
+
+    print(f"Properties: {len(properties):,} ({args.missing_rate:.0%} of inputs missing)")
+    for label, seconds in (("scalar loop", scalar_seconds), ("numpy batch", batch_seconds)):
+        print(f"{label:<14} {seconds * 1000:9.1f} ms   {seconds / len(properties) * 1e6:6.2f} us/property")
+    print(f"Speedup: {scalar_seconds / batch_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+"""
+End-to-end load test against local Estated and Anthropic stand-ins
+
+Starts the fake Estated and Anthropic servers from `fake_services.py` and the
+service itself (uvicorn, one worker) as subprocesses, points the service at
+the fakes, then drives each endpoint with a fixed number of concurrent clients.
+Every request uses a distinct address unless `--unique-addresses` is lower, so
+the property cache and request coalescing only help when asked to. The
+analysis cache is off unless `--analysis-cache` is given. The service's job
+store and analysis cache live in a temporary directory that is removed
+afterwards, so a run never touches the real ones.
+
+Reports per endpoint: throughput, p50/p95/p99/max latency, error counts by
+status, the Estated and Claude calls and failures the fake servers saw, and the
+service process's resident memory before the run and its peak afterwards (read
+from /proc, so Linux only). `--output` writes the same numbers as JSON for
+comparing runs.
+
+Each endpoint is then checked against pass/fail limits and the script exits
+with status 1 if any is exceeded:
+
+- `--max-error-rate`: errors (as counted below) per request, default 1%.
+- `--max-p95-ms`: p95 latency; off unless given, since it depends on the fake
+  latencies and the concurrency.
+- `--max-estated-calls-per-address`: successful Estated calls per unique
+  address, default 1 (the property cache and request coalescing should fetch
+  each address once). Calls that hit an injected failure are not counted.
+- `--max-claude-calls-per-address`: successful Claude calls per unique address.
+  By default, the calls one report needs (one per section in sectioned mode,
+  none for lite reports), checked only when every request uses its own address
+  or the analysis cache is on; otherwise repeat requests legitimately call
+  Claude again.
+
+A 200 only counts as a success when the report says its analysis came from
+where it should: `analysis_source` "ai" for legendary reports and streams
+(whose final `report` event must arrive), or "cache" with `--analysis-cache`,
+and "rules" for lite ones. Degraded
+responses are counted by source. Legacy reports and streamed sections fall back
+without saying so, so for those endpoints every Claude failure, and every
+request left without a successful Claude call, also counts as an error.
+
+Other service settings (e.g. ANTHROPIC_MAX_CONCURRENCY, LEGENDARY_ANALYSIS_MODE)
+are passed through from the environment.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_load.py [--requests 200 --concurrency 20]
+        [--endpoints legendary report] [--estated-latency-ms 150 --anthropic-latency-ms 2000]
+        [--anthropic-error-rate 0.02] [--analysis-cache] [--output results.json]
+        [--max-error-rate 0.01 --max-p95-ms 5000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+from app.services.ai_analyzer import LEGENDARY_SECTION_KEYS
+
+ENDPOINTS = {
+    "legendary": "/property/legendary",
+    "report": "/property/report",
+    "stream": "/property/legendary/stream",
+    "lite": "/property/legendary",
+}
+# analysis_source a successful report must carry; the legacy report has none
+EXPECTED_SOURCES = {
+    "legendary": {"ai"},
+    "report": None,
+    "stream": {"ai"},
+    "lite": {"rules"},
+}
+# Endpoints whose responses can hide a fallback to rule-based insights
+SILENT_FALLBACK_ENDPOINTS = {"report", "stream"}
+STARTUP_TIMEOUT_SECONDS = 30.0
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _spawn(args: List[str], env: Dict[str, str], log: Any) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, *args], env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+async def _wait_until_ready(client: httpx.AsyncClient, url: str, process: subprocess.Popen) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with status {process.returncode} during startup")
+        try:
+            if (await client.get(url)).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} did not become ready within {STARTUP_TIMEOUT_SECONDS:.0f}s")
+
+
+def _memory_kb(pid: int) -> Dict[str, Optional[int]]:
+    """Current (VmRSS) and peak (VmHWM) resident set size of `pid` in KiB"""
+    memory: Dict[str, Optional[int]] = {"rss_kb": None, "peak_rss_kb": None}
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    memory["rss_kb"] = int(line.split()[1])
+                elif line.startswith("VmHWM:"):
+                    memory["peak_rss_kb"] = int(line.split()[1])
+    except OSError:
+        pass
+    return memory
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def _stream_report(body: str) -> Optional[Dict[str, Any]]:
+    """The final `report` event of a legendary stream, None if it never arrived"""
+    for event in body.split("\n\n"):
+        if event.startswith("event: report\n"):
+            return json.loads(event.split("data: ", 1)[1])
+    return None
+
+
+async def _send(client: httpx.AsyncClient, endpoint: str, address: str) -> Tuple[int, Optional[str]]:
+    """Status code and the report's analysis_source (None when absent)"""
+    body = {"address": address, "lite": endpoint == "lite"}
+    if endpoint == "stream":
+        async with client.stream("POST", ENDPOINTS[endpoint], json=body) as response:
+            report = _stream_report((await response.aread()).decode()) if response.status_code == 200 else None
+            return response.status_code, report.get("analysis_source") if report else None
+    response = await client.post(ENDPOINTS[endpoint], json=body)
+    if response.status_code != 200:
+        return response.status_code, None
+    return response.status_code, response.json().get("analysis_source")
+
+
+async def _upstream_stats(client: httpx.AsyncClient, fake_url: str) -> Dict[str, int]:
+    """Request and injected failure counts of a fake Estated or Anthropic server"""
+    return (await client.get(f"{fake_url}/stats")).json()
+
+
+def _claude_calls_per_report(endpoint: str) -> int:
+    """Claude calls one report from `endpoint` needs, given the service settings"""
+    if endpoint == "lite":
+        return 0
+    if endpoint == "report" and not settings.DERIVE_LEGACY_FROM_LEGENDARY:
+        return 1
+    return len(LEGENDARY_SECTION_KEYS) if settings.LEGENDARY_ANALYSIS_MODE == "sectioned" else 1
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    requests: int,
+    concurrency: int,
+    unique_addresses: int,
+    address_offset: int,
+    analysis_cache: bool = False
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    degraded: Counter = Counter()
+    expected = EXPECTED_SOURCES[endpoint]
+    if expected is not None and analysis_cache and "ai" in expected:
+        expected = expected | {"cache"}
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            address = f"{address_offset + index % unique_addresses} Oak Street, Austin, TX 78701"
+            started = time.perf_counter()
+            source = None
+            try:
+                status, source = await _send(client, endpoint, address)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[str(status)] += 1
+            if status == 200 and expected is not None and source not in expected:
+                degraded[source or "missing"] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "throughput_rps": requests / elapsed,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        "errors": requests - statuses.get("200", 0) + sum(degraded.values()),
+        "statuses": dict(statuses),
+        "degraded": dict(degraded),
+    }
+
+
+def _silent_fallbacks(result: Dict[str, Any], distinct_addresses: bool) -> int:
+    """
+    Reports that fell back without saying so, estimated from the fake Anthropic counts
+
+    Every report needs at least one successful Claude call. Reports for the same
+    address can share one call, so the shortfall is only counted when every
+    request used its own address.
+    """
+    failures = result["claude"]["failures"]
+    if not distinct_addresses:
+        return failures
+    successes = result["claude"]["requests"] - failures
+    return max(failures, result["statuses"].get("200", 0) - successes)
+
+
+def _check_limits(endpoint: str, result: Dict[str, Any], args: argparse.Namespace) -> List[str]:
+    """Descriptions of the limits `result` exceeds, empty when the endpoint passes"""
+    failures = []
+    error_rate = result["errors"] / result["requests"] if result["requests"] else 0.0
+    if error_rate > args.max_error_rate:
+        failures.append(f"error rate {error_rate:.1%} > {args.max_error_rate:.1%}")
+    if args.max_p95_ms is not None and result["p95_ms"] > args.max_p95_ms:
+        failures.append(f"p95 {result['p95_ms']:.1f} ms > {args.max_p95_ms:.1f} ms")
+
+    addresses = result["addresses"]
+    estated_calls = (result["estated"]["requests"] - result["estated"]["failures"]) / addresses
+    if estated_calls > args.max_estated_calls_per_address:
+        failures.append(f"{estated_calls:.2f} Estated calls per address > {args.max_estated_calls_per_address:g}")
+
+    max_claude_calls = args.max_claude_calls_per_address
+    if max_claude_calls is None and (not args.unique_addresses or args.analysis_cache):
+        max_claude_calls = _claude_calls_per_report(endpoint)
+    claude_calls = (result["claude"]["requests"] - result["claude"]["failures"]) / addresses
+    if max_claude_calls is not None and claude_calls > max_claude_calls:
+        failures.append(f"{claude_calls:.2f} Claude calls per address > {max_claude_calls:g}")
+    return failures
+
+
+def _print_result(endpoint: str, result: Dict[str, Any]) -> None:
+    memory = result["memory"]
+    rss = f"{memory['rss_before_kb'] / 1024:.1f} MiB" if memory["rss_before_kb"] is not None else "n/a"
+    peak = f"{memory['peak_rss_kb'] / 1024:.1f} MiB" if memory["peak_rss_kb"] is not None else "n/a"
+    print(f"{endpoint} ({ENDPOINTS[endpoint]}), {result['requests']} requests at concurrency {result['concurrency']}")
+    print(f"  throughput: {result['throughput_rps']:8.1f} req/s ({result['elapsed_s']:.2f} s)")
+    print(f"  latency:    p50 {result['p50_ms']:.1f} ms | p95 {result['p95_ms']:.1f} ms | "
+          f"p99 {result['p99_ms']:.1f} ms | max {result['max_ms']:.1f} ms")
+    print(f"  errors:     {result['errors']} {result['statuses']} degraded {result['degraded']}")
+    print(f"  estated:    {result['estated']['requests']} calls, {result['estated']['failures']} failed")
+    print(f"  claude:     {result['claude']['requests']} calls, {result['claude']['failures']} failed")
+    print(f"  memory:     RSS {rss} before, peak {peak}")
+    print(f"  limits:     {'FAIL: ' + '; '.join(result['limit_failures']) if result['limit_failures'] else 'pass'}")
+
+
+async def _run(
+    args: argparse.Namespace,
+    app_url: str,
+    estated_url: str,
+    anthropic_url: str,
+    app_pid: int
+) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results: Dict[str, Any] = {}
+    async with httpx.AsyncClient(base_url=app_url, limits=limits, timeout=args.timeout) as client:
+        offset = 0
+        for endpoint in args.endpoints:
+            if args.warmup:
+                await _drive(
+                    client, endpoint, args.warmup, min(args.warmup, args.concurrency), args.warmup, offset,
+                    args.analysis_cache
+                )
+                offset += args.warmup
+            rss_before = _memory_kb(app_pid)["rss_kb"]
+            unique_addresses = args.unique_addresses or args.requests
+            estated_before = await _upstream_stats(client, estated_url)
+            claude_before = await _upstream_stats(client, anthropic_url)
+            result = await _drive(
+                client, endpoint, args.requests, args.concurrency, unique_addresses, offset, args.analysis_cache
+            )
+            offset += args.requests
+            estated_after = await _upstream_stats(client, estated_url)
+            claude_after = await _upstream_stats(client, anthropic_url)
+            result["addresses"] = min(unique_addresses, args.requests)
+            result["estated"] = {name: estated_after[name] - estated_before[name] for name in estated_after}
+            result["claude"] = {name: claude_after[name] - claude_before[name] for name in claude_after}
+            if endpoint in SILENT_FALLBACK_ENDPOINTS:
+                result["errors"] += _silent_fallbacks(result, distinct_addresses=not args.unique_addresses)
+            result["memory"] = {"rss_before_kb": rss_before, "peak_rss_kb": _memory_kb(app_pid)["peak_rss_kb"]}
+            result["limit_failures"] = _check_limits(endpoint, result, args)
+            _print_result(endpoint, result)
+            results[endpoint] = result
+    return results
+
+
+async def _start_and_run(args: argparse.Namespace) -> Dict[str, Any]:
+    estated_port, anthropic_port, app_port = _free_port(), _free_port(), _free_port()
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")]))}
+    fake = "benchmarks/fake_services.py"
+    # Job store and analysis cache are per run and thrown away afterwards
+    state_dir = tempfile.TemporaryDirectory(prefix="bench_load_")
+    app_env = {
+        **env,
+        "ESTATED_BASE_URL": f"http://127.0.0.1:{estated_port}",
+        "ANTHROPIC_BASE_URL": f"http://127.0.0.1:{anthropic_port}",
+        "ESTATED_API_KEY": "bench",
+        "ANTHROPIC_API_KEY": "bench",
+        "ANALYSIS_CACHE_ENABLED": "true" if args.analysis_cache else "false",
+        "ANALYSIS_CACHE_PATH": os.path.join(state_dir.name, "analysis_cache.sqlite3"),
+        "JOB_STORE_PATH": os.path.join(state_dir.name, "report_jobs.sqlite3"),
+    }
+
+    # Service and fake server logs would drown the report; keep them in a file instead
+    log = tempfile.NamedTemporaryFile("w", prefix="bench_load_", suffix=".log", delete=False)
+    print(f"Service logs: {log.name}")
+    processes = [
+        _spawn([fake, "estated", "--port", str(estated_port), "--latency-ms", str(args.estated_latency_ms),
+                "--jitter-ms", str(args.estated_jitter_ms), "--error-rate", str(args.estated_error_rate)], env, log),
+        _spawn([fake, "anthropic", "--port", str(anthropic_port), "--latency-ms", str(args.anthropic_latency_ms),
+                "--jitter-ms", str(args.anthropic_jitter_ms), "--error-rate", str(args.anthropic_error_rate)], env, log),
+        _spawn(["-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(app_port),
+                "--log-level", "warning", "--no-access-log"], app_env, log),
+    ]
+    urls = [
+        f"http://127.0.0.1:{estated_port}/health",
+        f"http://127.0.0.1:{anthropic_port}/health",
+        f"http://127.0.0.1:{app_port}/",
+    ]
+    try:
+        async with httpx.AsyncClient(timeout=2.0) as client:
+            for url, process in zip(urls, processes):
+                await _wait_until_ready(client, url, process)
+        return await _run(
+            args, f"http://127.0.0.1:{app_port}", f"http://127.0.0.1:{estated_port}",
+            f"http://127.0.0.1:{anthropic_port}", processes[2].pid
+        )
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        log.close()
+        state_dir.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", nargs="+", choices=sorted(ENDPOINTS), default=["legendary", "report"])
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per endpoint before the run")
+    parser.add_argument("--unique-addresses", type=int, default=0,
+                        help="Cycle through this many addresses (default: one per request)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Client timeout per request in seconds")
+    parser.add_argument("--analysis-cache", action="store_true",
+                        help="Enable the service's analysis cache (a fresh one per run)")
+    parser.add_argument("--estated-latency-ms", type=float, default=150.0)
+    parser.add_argument("--estated-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--estated-error-rate", type=float, default=0.0)
+    parser.add_argument("--anthropic-latency-ms", type=float, default=2000.0)
+    parser.add_argument("--anthropic-jitter-ms", type=float, default=500.0)
+    parser.add_argument("--anthropic-error-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Fail above this fraction of errors")
+    parser.add_argument("--max-p95-ms", type=float, help="Fail above this p95 latency (default: no limit)")
+    parser.add_argument("--max-estated-calls-per-address", type=float, default=1.0,
+                        help="Fail above this many successful Estated calls per unique address")
+    parser.add_argument("--max-claude-calls-per-address", type=float,
+                        help="Fail above this many successful Claude calls per unique address "
+                             "(default: the calls one report needs)")
+    args = parser.parse_args()
+
+    results = asyncio.run(_start_and_run(args))
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump({"settings": vars(args), "results": results}, output, indent=2)
+
+    failed = [endpoint for endpoint, result in results.items() if result["limit_failures"]]
+    if failed:
+        print(f"FAILED: {', '.join(failed)} exceeded their limits")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Metrics instrumentation overhead per request
+
+Times the pieces a full report request touches: the ASGI middleware around a
+no-op app, plus one stage timer per pipeline stage (estated_fetch, prompt_build,
+claude_call, parse, assembly, serialization) and a fallback counter increment,
+and checks the total stays under the 50us budget. Also times a /metrics render.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_metrics_overhead.py [--requests 100000]
+"""
+import argparse
+import asyncio
+import time
+
+from app.services.metrics import AI_FALLBACKS, STAGE_SECONDS, MetricsMiddleware, render_metrics
+
+STAGES = ("estated_fetch", "prompt_build", "claude_call", "parse", "assembly", "serialization")
+BUDGET_US = 50.0
+
+
+class _Route:
+    path = "/property/legendary"
+
+
+async def _noop_app(scope, receive, send) -> None:
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _send(message) -> None:
+    pass
+
+
+async def _receive() -> dict:
+    return {"type": "http.request"}
+
+
+async def _requests(count: int, app) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        await app({"type": "http", "method": "POST", "path": "/property/legendary"}, _receive, _send)
+    return time.perf_counter() - started
+
+
+def _stage_timers(count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        for stage in STAGES:
+            with STAGE_SECONDS.time(stage):
+                pass
+        AI_FALLBACKS.inc("legendary")
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100_000)
+    args = parser.parse_args()
+
+    bare = asyncio.run(_requests(args.requests, _noop_app))
+    wrapped = asyncio.run(_requests(args.requests, MetricsMiddleware(_noop_app)))
+    middleware_us = (wrapped - bare) / args.requests * 1e6
+    stages_us = _stage_timers(args.requests) / args.requests * 1e6
+
+    started = time.perf_counter()
+    body = render_metrics()
+    render_ms = (time.perf_counter() - started) * 1000
+
+    total_us = middleware_us + stages_us
+    print(f"middleware:         {middleware_us:6.2f} us/request")
+    print(f"stage timers (x{len(STAGES)}): {stages_us:6.2f} us/request")
+    print(f"total:              {total_us:6.2f} us/request (budget {BUDGET_US:.0f} us)")
+    print(f"/metrics render:    {render_ms:6.2f} ms ({len(body):,} bytes)")
+    assert total_us < BUDGET_US, f"instrumentation costs {total_us:.1f} us per request"
+
+
+if __name__ == "__main__":
+    main()
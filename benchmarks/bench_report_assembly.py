@@ -0,0 +1,104 @@
+"""
+Report assembly + serialization: reports/sec with no network or AI calls
+
+Compares the previous path (one Pydantic model per section, then FastAPI's
+`response_model` re-validation, `jsonable_encoder` and `json.dumps`) against
+the fast path in `app.services.report_assembly` (section dicts merged once,
+validated in one pass by a precompiled TypeAdapter, dumped by pydantic-core),
+after checking both produce the same JSON.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_report_assembly.py [--reports 5000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+# Assembly never touches the cache; keep the benchmark from creating one
+os.environ.setdefault("ANALYSIS_CACHE_ENABLED", "false")
+
+from app.models import LegendaryPropertyReport  # noqa: E402
+from app.services.report_assembly import LEGENDARY_AI_DEFAULTS, assemble_legendary_report, report_json  # noqa: E402
+from app.services.report_generator import LegendaryReportGenerator  # noqa: E402
+from app.services.rule_based import RuleBasedAnalyzer  # noqa: E402
+from benchmarks.fixtures import SAMPLE_ADDRESS, sample_property_data  # noqa: E402
+
+ADDRESS = SAMPLE_ADDRESS
+
+_RESPONSE_FIELD = create_response_field(name="Response_generate_legendary", type_=LegendaryPropertyReport)
+_LOOP = asyncio.new_event_loop()
+
+
+def _reference_build(estated: Dict[str, Dict[str, Any]], ai_insights: Dict[str, Any]) -> LegendaryPropertyReport:
+    """Previous builder: construct and validate each section model separately"""
+    sections = {}
+    for section_key, defaults in LEGENDARY_AI_DEFAULTS.items():
+        model = LegendaryPropertyReport.model_fields[section_key].annotation
+        ai_section = ai_insights.get(section_key, {})
+        fields = {name: ai_section.get(name, default) for name, default in defaults.items()}
+        if section_key == "bonus_extras":
+            fields["custom_report_name"] = ai_section.get("custom_report_name", f"Property Report - {ADDRESS}")
+        sections[section_key] = model(**estated.get(section_key, {}), **fields)
+    return LegendaryPropertyReport(
+        report_id="bench", generated_at=datetime(2026, 1, 1), address_analyzed=ADDRESS, **sections
+    )
+
+
+def _reference_serialize(report: LegendaryPropertyReport) -> bytes:
+    """What FastAPI does with a returned model: re-validate, encode to primitives, json.dumps"""
+    content = _LOOP.run_until_complete(serialize_response(field=_RESPONSE_FIELD, response_content=report))
+    return JSONResponse(content).body
+
+
+def _fast_build(estated: Dict[str, Dict[str, Any]], ai_insights: Dict[str, Any]) -> LegendaryPropertyReport:
+    return assemble_legendary_report(
+        estated, ai_insights, address=ADDRESS, report_id="bench", generated_at=datetime(2026, 1, 1)
+    )
+
+
+def _time(label: str, reports: int, run: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    for _ in range(reports):
+        run()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<34} {reports / elapsed:10,.0f} reports/s   {elapsed / reports * 1e6:8.1f} us/report")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=5000)
+    args = parser.parse_args()
+
+    generator = LegendaryReportGenerator.__new__(LegendaryReportGenerator)
+    property_data = sample_property_data()
+    estated = generator._estated_fields(property_data, ADDRESS)
+    ai_insights = RuleBasedAnalyzer().analyze_property_legendary(property_data)
+
+    reference = _reference_build(estated, ai_insights)
+    fast = _fast_build(estated, ai_insights)
+    assert reference == fast, "fast path built a different report"
+    assert json.loads(_reference_serialize(reference)) == json.loads(report_json(fast)), "JSON differs"
+    print(f"Report JSON: {len(report_json(fast)):,} bytes\n")
+
+    build_before = _time("assembly: per-section models", args.reports, lambda: _reference_build(estated, ai_insights))
+    build_after = _time("assembly: TypeAdapter", args.reports, lambda: _fast_build(estated, ai_insights))
+    dump_before = _time("serialize: FastAPI response_model", args.reports, lambda: _reference_serialize(reference))
+    dump_after = _time("serialize: dump_json", args.reports, lambda: report_json(fast))
+
+    before = build_before + dump_before
+    after = build_after + dump_after
+    print(f"\nassembly + serialization: {args.reports / before:,.0f} -> {args.reports / after:,.0f} reports/s "
+          f"({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Legendary response parsing: per-lookup line scans vs. the single-pass SectionIndex
+
+Runs the full `_parse_legendary_analysis` over a synthetic ~8k-token response,
+once with the original linear `_extract_section` (kept here as the reference)
+and once with the indexed parser, checks both produce identical insights and
+prints per-parse timings.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_response_parser.py [--iterations 200]
+"""
+import argparse
+import os
+import re
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+# The parser never touches the cache; keep the benchmark from creating one
+os.environ.setdefault("ANALYSIS_CACHE_ENABLED", "false")
+
+from app.services.ai_analyzer import LegendaryAIAnalyzer  # noqa: E402
+from benchmarks.fixtures import sample_legendary_response, sample_property_data  # noqa: E402
+
+
+class LinearScanAnalyzer(LegendaryAIAnalyzer):
+    """The parser as it was before indexing: every lookup re-splits and re-lowers the response"""
+
+    def _parse_legendary_analysis(self, ai_content: str, property_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            section_key: extract(ai_content, property_data)
+            for section_key, extract in self._section_extractors().items()
+        }
+
+    def _extract_section(self, content: str, section_key: str, default: str = "Analysis not available") -> str:
+        lines = content.split('\n')
+        for i, line in enumerate(lines):
+            if section_key.lower() in line.lower():
+                return ' '.join(lines[i:i+3]).strip()
+        return default
+
+    def _extract_numeric_section(self, content: str, section_key: str, default: Optional[float] = None) -> Optional[float]:
+        section_text = self._extract_section(content, section_key, "")
+        numbers = re.findall(r'\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', section_text)
+        if numbers:
+            try:
+                return float(numbers[0].replace(',', ''))
+            except ValueError:
+                pass
+        return default
+
+    def _extract_list_section(self, content: str, section_key: str, default: List[str]) -> List[str]:
+        section_text = self._extract_section(content, section_key, "")
+        items = re.findall(r'[•\-\*]\s*([^\n]+)', section_text)
+        return items[:3] if items else default
+
+
+def _time_parse(analyzer: LegendaryAIAnalyzer, content: str, property_data: Dict[str, Any], iterations: int) -> List[float]:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        analyzer._parse_legendary_analysis(content, property_data)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _summarize(label: str, timings: List[float]) -> float:
+    median_ms = statistics.median(timings) * 1000
+    p95_ms = sorted(timings)[int(len(timings) * 0.95) - 1] * 1000
+    print(f"{label:<14} median {median_ms:8.3f} ms   p95 {p95_ms:8.3f} ms")
+    return median_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    content = sample_legendary_response()
+    property_data = sample_property_data()
+    indexed = LegendaryAIAnalyzer(analysis_cache=None)
+    linear = LinearScanAnalyzer(analysis_cache=None)
+
+    expected = linear._parse_legendary_analysis(content, property_data)
+    actual = indexed._parse_legendary_analysis(content, property_data)
+    assert actual == expected, "indexed parser output differs from the linear reference"
+
+    print(f"Response: {len(content):,} chars, {content.count(chr(10)) + 1:,} lines (~{len(content) // 4:,} tokens)")
+    linear_ms = _summarize("linear scan", _time_parse(linear, content, property_data, args.iterations))
+    indexed_ms = _summarize("section index", _time_parse(indexed, content, property_data, args.iterations))
+    print(f"Speedup: {linear_ms / indexed_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
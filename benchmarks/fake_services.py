@@ -0,0 +1,192 @@
+"""
+Local stand-ins for the Estated and Anthropic APIs, for offline load tests
+
+Both servers answer with canned payloads after a configurable latency (plus
+uniform jitter) and fail a configurable fraction of requests, so the service
+can be driven at high concurrency without API keys, quota or cost:
+
+- Estated: `GET /property?address=...` returns a property record in the shape
+  `EstatedClient._parse_property_response` reads (values vary per address);
+  failures are 503s, which the client retries. `GET /stats` counts the
+  requests and injected failures so far.
+- Anthropic: `POST /v1/messages` returns the ~8k-token legendary analysis from
+  `benchmarks.fixtures`, as a JSON message or, with `"stream": true`, as
+  server-sent events; failures are 500 `api_error`s. `GET /stats` counts the
+  requests and injected failures so far.
+
+Point the service at them with `ESTATED_BASE_URL=http://127.0.0.1:<port>` and
+`ANTHROPIC_BASE_URL=http://127.0.0.1:<port>`. `bench_load.py` starts both
+automatically.
+
+Usage:
+    PYTHONPATH=. python benchmarks/fake_services.py estated --port 9101 [--latency-ms 150 --jitter-ms 50 --error-rate 0.01]
+    PYTHONPATH=. python benchmarks/fake_services.py anthropic --port 9102 [--latency-ms 20000 --jitter-ms 5000]
+"""
+import argparse
+import asyncio
+import json
+import random
+from typing import Any, AsyncIterator, Dict
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from benchmarks.fixtures import estated_property_record, sample_legendary_response
+
+# Characters per token used to report plausible usage numbers
+CHARS_PER_TOKEN = 4
+# Text deltas per streamed response; the whole body is sent once the latency has elapsed
+STREAM_CHUNKS = 200
+
+
+class FaultInjector:
+    """
+    Latency and failure schedule shared by the fake endpoints
+
+    Args:
+        latency_ms: Mean response delay
+        jitter_ms: Delay varies uniformly within +/- this much (never below zero)
+        error_rate: Fraction of requests (0-1) answered with an error
+        seed: Seed for reproducible runs
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0, seed: int = 7):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+
+    async def delay(self) -> None:
+        delay_ms = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+
+def create_fake_estated_app(faults: FaultInjector) -> FastAPI:
+    """Fake Estated API: `GET /property`, `GET /stats` and `GET /health`"""
+    app = FastAPI(title="Fake Estated")
+    stats = {"requests": 0, "failures": 0}
+
+    @app.get("/property")
+    async def get_property(address: str) -> Response:
+        stats["requests"] += 1
+        await faults.delay()
+        if faults.should_fail():
+            stats["failures"] += 1
+            return JSONResponse({"error": {"code": "SERVICE_UNAVAILABLE"}}, status_code=503)
+        return JSONResponse(estated_property_record(address))
+
+    @app.get("/stats")
+    async def get_stats() -> Dict[str, int]:
+        return stats
+
+    @app.get("/health")
+    async def health() -> Dict[str, str]:
+        return {"status": "ok"}
+
+    return app
+
+
+def _sse(event: str, data: Dict[str, Any]) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+def create_fake_anthropic_app(faults: FaultInjector, response_text: str = "") -> FastAPI:
+    """
+    Fake Anthropic Messages API: `POST /v1/messages` (JSON or streamed), `GET /stats` and `GET /health`
+
+    Args:
+        faults: Latency and error schedule
+        response_text: Canned assistant reply; defaults to the benchmark legendary analysis
+    """
+    app = FastAPI(title="Fake Anthropic")
+    text = response_text or sample_legendary_response()
+    output_tokens = len(text) // CHARS_PER_TOKEN
+    chunk_size = max(1, len(text) // STREAM_CHUNKS)
+    text_deltas = [text[start:start + chunk_size] for start in range(0, len(text), chunk_size)]
+    stats = {"requests": 0, "failures": 0}
+
+    def message(model: str, input_tokens: int, content: list, stop_reason: Any, output: int) -> Dict[str, Any]:
+        return {
+            "id": f"msg_fake_{random.getrandbits(48):012x}",
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": content,
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": input_tokens,
+                "output_tokens": output,
+                "cache_creation_input_tokens": 0,
+                "cache_read_input_tokens": 0,
+            },
+        }
+
+    async def stream_events(model: str, input_tokens: int) -> AsyncIterator[bytes]:
+        yield _sse("message_start", {"type": "message_start", "message": message(model, input_tokens, [], None, 1)})
+        yield _sse("content_block_start", {"type": "content_block_start", "index": 0,
+                                           "content_block": {"type": "text", "text": ""}})
+        for delta in text_deltas:
+            yield _sse("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                               "delta": {"type": "text_delta", "text": delta}})
+        yield _sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+        yield _sse("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                     "usage": {"output_tokens": output_tokens}})
+        yield _sse("message_stop", {"type": "message_stop"})
+
+    @app.post("/v1/messages")
+    async def create_message(request: Request) -> Response:
+        body = await request.body()
+        payload = json.loads(body)
+        model = payload.get("model", "claude-fake")
+        input_tokens = len(body) // CHARS_PER_TOKEN
+        stats["requests"] += 1
+
+        await faults.delay()
+        if faults.should_fail():
+            stats["failures"] += 1
+            return JSONResponse(
+                {"type": "error", "error": {"type": "api_error", "message": "Injected failure"}},
+                status_code=500
+            )
+        if payload.get("stream"):
+            return StreamingResponse(stream_events(model, input_tokens), media_type="text/event-stream")
+        return JSONResponse(message(model, input_tokens, [{"type": "text", "text": text}], "end_turn", output_tokens))
+
+    @app.get("/stats")
+    async def get_stats() -> Dict[str, int]:
+        return stats
+
+    @app.get("/health")
+    async def health() -> Dict[str, str]:
+        return {"status": "ok"}
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("service", choices=["estated", "anthropic"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    faults = FaultInjector(args.latency_ms, args.jitter_ms, args.error_rate, args.seed)
+    if args.service == "estated":
+        app = create_fake_estated_app(faults)
+    else:
+        app = create_fake_anthropic_app(faults)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Shared inputs for the benchmarks: a realistic Estated property record and a
+synthetic legendary AI response about the size of a full 8000-token Claude reply.
+"""
+import random
+import zlib
+from typing import Any, Dict
+
+from app.services.ai_analyzer import LEGENDARY_SECTION_KEYS, LEGENDARY_SECTION_PROMPTS
+from app.services.estated_client import EstatedClient
+
+SAMPLE_ADDRESS = "1234 Oak Street, Austin, TX 78701"
+
+# Keywords the legendary extractors look up, keyed by the section they belong to
+SECTION_KEYWORDS = {
+    "property_identity": ["structure condition", "exterior material", "zoning", "property summary"],
+    "valuation_equity": ["undervaluation", "tax vs avm", "appreciation", "price trend"],
+    "deal_strategy": ["flip potential", "brrrr", "rental fit", "wholesale", "rehab vs rebuild", "conversion",
+                      "top strategy", "purchase price", "holding costs", "roi", "occupancy", "hold score"],
+    "ownership_profile": ["owner type", "motivation", "sell reason"],
+    "investor_action": ["approach", "script", "offer range", "counter offer", "urgency"],
+    "neighborhood_infrastructure": ["neighborhood type", "school quality", "transit", "walkability", "commercial",
+                                    "road type", "parking", "development"],
+    "risk_flags": ["age remodel", "avm tax", "age risk", "speculation", "cluster", "flood", "tornado",
+                   "earthquake", "wildfire", "disaster"],
+    "financial_breakdown": ["rehab cost", "project budget", "exit price", "profit potential"],
+    "market_context": ["appreciation trend", "median price", "holding period", "investor activity",
+                       "neighborhood appreciation", "gentrification"],
+    "executive_summary": ["verdict", "strengths", "weaknesses", "next step", "scorecard", "time sensitive"],
+    "bonus_extras": ["pitch deck", "marketing copy", "summary"],
+}
+
+_FILLER_WORDS = (
+    "the property sits on a corner lot with mature landscaping and a detached garage while "
+    "comparable sales within half a mile closed between four and five hundred thousand dollars "
+    "over the trailing twelve months and days on market continue to shorten as inventory tightens"
+).split()
+
+
+def estated_property_record(address: str) -> Dict[str, Any]:
+    """Raw Estated property record for `address`; numbers are derived from the address so lookups differ"""
+    rng = random.Random(zlib.crc32(address.encode()))
+    value = rng.randrange(180_000, 1_200_000, 1_000)
+    return {
+        "address": {
+            "formatted_street_address": address.split(",")[0].upper(),
+            "city": "AUSTIN",
+            "state": "TX",
+            "zip_code": "78701",
+            "county": "TRAVIS",
+        },
+        "parcel": {
+            "apn_original": f"{rng.randrange(10**9):09d}",
+            "area_acres": round(rng.uniform(0.08, 0.6), 3),
+            "legal_description": f"LOT {rng.randint(1, 40)} BLK {rng.choice('ABCDEF')} OAK HILLS SUBDIVISION",
+        },
+        "structure": {
+            "property_type": rng.choice(["single_family", "single_family", "townhouse", "condominium", "multi_family"]),
+            "year_built": rng.randint(1925, 2020),
+            "total_area_sq_ft": rng.randrange(900, 4200, 10),
+            "beds_count": rng.randint(1, 5),
+            "baths_total": rng.choice([1, 1.5, 2, 2.5, 3, 3.5]),
+        },
+        "owner": {
+            "name": rng.choice(["JANE DOE", "JOHN SMITH", "OAK HILLS HOLDINGS LLC", "SMITH FAMILY TRUST"]),
+            "mailing_address": {"street": "PO BOX 4410", "city": "DALLAS", "state": "TX", "zip_code": "75201"},
+        },
+        "valuation": {
+            "estimate": value,
+            "last_sale_price": int(value * rng.uniform(0.4, 0.95)),
+            "last_sale_date": f"{rng.randint(1995, 2022)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        },
+        "tax": {
+            "assessed_value": int(value * rng.uniform(0.7, 1.0)),
+            "total_taxes": int(value * 0.021),
+        },
+    }
+
+
+def sample_property_data(address: str = SAMPLE_ADDRESS) -> Dict[str, Any]:
+    """Property data for `address` exactly as EstatedClient hands it to the analyzers"""
+    return EstatedClient()._parse_property_response(estated_property_record(address))
+
+
+def _filler_sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(_FILLER_WORDS) for _ in range(rng.randint(14, 26))).capitalize() + "."
+
+
+def sample_legendary_response(seed: int = 7, paragraphs_per_keyword: int = 1) -> str:
+    """
+    Markdown response shaped like a full legendary analysis
+
+    Every section heading from the prompt appears once, followed by a labelled
+    paragraph and a few bullets per extractor keyword, padded with filler prose.
+    """
+    rng = random.Random(seed)
+    lines = ["# LEGENDARY PROPERTY ANALYSIS", ""]
+
+    for section_key in LEGENDARY_SECTION_KEYS:
+        lines.append(LEGENDARY_SECTION_PROMPTS[section_key].split("\n", 1)[0])
+        lines.append("")
+        for keyword in SECTION_KEYWORDS[section_key]:
+            lines.append(f"**{keyword.title()}:** ${rng.randint(1, 999)},{rng.randint(100, 999)} — {_filler_sentence(rng)}")
+            for _ in range(3):
+                lines.append(f"- {_filler_sentence(rng)}")
+            for _ in range(paragraphs_per_keyword):
+                lines.append(_filler_sentence(rng))
+            lines.append("")
+
+    return "\n".join(lines)
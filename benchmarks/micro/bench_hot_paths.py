@@ -0,0 +1,176 @@
+"""
+Micro-benchmarks for the CPU-bound steps of every report (pytest-benchmark)
+
+Covers Estated response parsing, legendary response parsing (~70 section
+lookups over an ~8k-token reply, plus a longer reply), legendary report
+assembly, conversion to the legacy format and report serialization, using the
+shared fixtures in `benchmarks/fixtures.py`.
+
+The services are built through their constructors with offline stub clients,
+so a benchmark that reaches Estated or Claude fails instead of going out.
+
+Usage:
+    pytest benchmarks/micro --benchmark-autosave
+    pytest benchmarks/micro --benchmark-compare
+        (fails on a mean slowdown over 20% against the last saved run; override with
+        --benchmark-compare-fail=mean:10%)
+"""
+import asyncio
+from typing import Any, Dict, Iterator
+
+import httpx
+import pytest
+
+from app.models import LegendaryPropertyReport
+from app.services.ai_analyzer import AIAnalyzer, LegendaryAIAnalyzer
+from app.services.estated_client import EstatedClient
+from app.services.property_cache import PropertyCache
+from app.services.rate_limiter import AnthropicGovernor
+from app.services.report_assembly import report_json
+from app.services.report_generator import LegendaryReportGenerator, ReportGenerator
+from app.services.rule_based import RuleBasedAnalyzer
+from benchmarks.fixtures import SAMPLE_ADDRESS, estated_property_record, sample_legendary_response, sample_property_data
+
+
+class OfflineMessages:
+    """`messages` API of the stub Anthropic client; no benchmark should call Claude"""
+
+    async def create(self, **kwargs: Any) -> Any:
+        raise RuntimeError("Micro-benchmarks must not call Claude")
+
+
+class OfflineAnthropicClient:
+    """Stand-in for `anthropic.AsyncAnthropic` that refuses every request"""
+
+    def __init__(self):
+        self.messages = OfflineMessages()
+
+    async def close(self) -> None:
+        pass
+
+
+def _refuse_request(request: httpx.Request) -> httpx.Response:
+    raise RuntimeError(f"Micro-benchmarks must not call Estated: {request.url}")
+
+
+@pytest.fixture(scope="module")
+def event_loop_runner():
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def estated_client(event_loop_runner: Any) -> Iterator[EstatedClient]:
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(_refuse_request))
+    yield EstatedClient(http_client=http_client, cache=PropertyCache())
+    event_loop_runner(http_client.aclose())
+
+
+@pytest.fixture(scope="module")
+def governor() -> AnthropicGovernor:
+    return AnthropicGovernor()
+
+
+@pytest.fixture(scope="module")
+def property_data() -> Dict[str, Any]:
+    return sample_property_data()
+
+
+@pytest.fixture(scope="module")
+def estated_payload() -> Dict[str, Any]:
+    return estated_property_record(SAMPLE_ADDRESS)
+
+
+@pytest.fixture(scope="module")
+def legendary_analyzer(governor: AnthropicGovernor) -> LegendaryAIAnalyzer:
+    return LegendaryAIAnalyzer(client=OfflineAnthropicClient(), analysis_cache=None, governor=governor)
+
+
+@pytest.fixture(scope="module")
+def ai_insights(legendary_analyzer: LegendaryAIAnalyzer, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    return legendary_analyzer._parse_legendary_analysis(sample_legendary_response(), property_data)
+
+
+@pytest.fixture(scope="module")
+def legendary_generator(
+    estated_client: EstatedClient,
+    legendary_analyzer: LegendaryAIAnalyzer
+) -> LegendaryReportGenerator:
+    return LegendaryReportGenerator(estated_client=estated_client, legendary_ai_analyzer=legendary_analyzer)
+
+
+@pytest.fixture(scope="module")
+def report_generator(
+    estated_client: EstatedClient,
+    governor: AnthropicGovernor,
+    legendary_generator: LegendaryReportGenerator
+) -> ReportGenerator:
+    return ReportGenerator(
+        estated_client=estated_client,
+        ai_analyzer=AIAnalyzer(client=OfflineAnthropicClient(), governor=governor),
+        legendary_generator=legendary_generator
+    )
+
+
+@pytest.fixture(scope="module")
+def legendary_report(
+    event_loop_runner: Any,
+    legendary_generator: LegendaryReportGenerator,
+    property_data: Dict[str, Any],
+    ai_insights: Dict[str, Any]
+) -> LegendaryPropertyReport:
+    return event_loop_runner(legendary_generator._build_legendary_report(property_data, ai_insights, SAMPLE_ADDRESS))
+
+
+def test_parse_estated_response(
+    benchmark: Any,
+    estated_client: EstatedClient,
+    estated_payload: Dict[str, Any]
+) -> None:
+    parsed = benchmark(estated_client._parse_property_response, estated_payload)
+    assert parsed["address"]["formatted_address"]
+
+
+@pytest.mark.parametrize("paragraphs_per_keyword", [1, 4], ids=["8k-tokens", "16k-tokens"])
+def test_parse_legendary_analysis(
+    benchmark: Any,
+    legendary_analyzer: LegendaryAIAnalyzer,
+    property_data: Dict[str, Any],
+    paragraphs_per_keyword: int
+) -> None:
+    content = sample_legendary_response(paragraphs_per_keyword=paragraphs_per_keyword)
+    insights = benchmark(legendary_analyzer._parse_legendary_analysis, content, property_data)
+    assert insights["executive_summary"]["worth_it_verdict"]
+
+
+def test_build_legendary_report(
+    benchmark: Any,
+    event_loop_runner: Any,
+    legendary_generator: LegendaryReportGenerator,
+    property_data: Dict[str, Any],
+    ai_insights: Dict[str, Any]
+) -> None:
+    report = benchmark(
+        lambda: event_loop_runner(legendary_generator._build_legendary_report(property_data, ai_insights, SAMPLE_ADDRESS))
+    )
+    assert report.address_analyzed == SAMPLE_ADDRESS
+
+
+def test_build_lite_insights(benchmark: Any, property_data: Dict[str, Any]) -> None:
+    insights = benchmark(RuleBasedAnalyzer().analyze_property_legendary, property_data)
+    assert insights
+
+
+def test_convert_legendary_to_legacy(
+    benchmark: Any,
+    report_generator: ReportGenerator,
+    legendary_report: LegendaryPropertyReport
+) -> None:
+    legacy = benchmark(report_generator._convert_legendary_to_legacy, legendary_report)
+    assert legacy.property_overview.full_address == legendary_report.property_identity.full_address
+
+
+def test_serialize_legendary_report(benchmark: Any, legendary_report: LegendaryPropertyReport) -> None:
+    body = benchmark(report_json, legendary_report)
+    assert body.startswith(b"{")
@@ -0,0 +1,34 @@
+"""
+pytest-benchmark configuration for the micro-benchmarks
+
+Without pytest-benchmark installed every benchmark is skipped. When a run is
+compared against a saved one (`--benchmark-compare`) and no threshold is
+given, a mean slowdown beyond DEFAULT_COMPARE_FAIL fails the run.
+"""
+import os
+
+import pytest
+
+# Nothing here reads the cache; keep imports of the services from creating one
+os.environ.setdefault("ANALYSIS_CACHE_ENABLED", "false")
+
+try:
+    from pytest_benchmark.utils import parse_compare_fail
+except ImportError:  # pytest-benchmark is optional
+    parse_compare_fail = None
+
+# Regression threshold applied to --benchmark-compare runs unless --benchmark-compare-fail is given
+DEFAULT_COMPARE_FAIL = "mean:20%"
+
+if parse_compare_fail is None:
+    @pytest.fixture
+    def benchmark():
+        pytest.skip("pytest-benchmark is not installed (pip install pytest-benchmark)")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config: pytest.Config) -> None:
+    if parse_compare_fail is None:
+        return
+    if config.getoption("benchmark_compare") and not config.getoption("benchmark_compare_fail"):
+        config.option.benchmark_compare_fail = [parse_compare_fail(DEFAULT_COMPARE_FAIL)]
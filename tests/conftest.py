@@ -0,0 +1,52 @@
+"""
+Shared test setup
+
+Settings are read when `app.config` is imported, so the environment is pinned
+here first: placeholder API keys, no analysis cache, and job and cache files in
+a throwaway directory. Tests build their services with injected fakes and never
+reach Estated or Anthropic.
+"""
+import os
+import tempfile
+
+_STATE_DIR = tempfile.mkdtemp(prefix="alyprop-tests-")
+os.environ.setdefault("ESTATED_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+os.environ.setdefault("ANALYSIS_CACHE_ENABLED", "false")
+os.environ.setdefault("ANALYSIS_CACHE_PATH", os.path.join(_STATE_DIR, "analysis_cache.sqlite3"))
+os.environ.setdefault("JOB_STORE_PATH", os.path.join(_STATE_DIR, "report_jobs.sqlite3"))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def state_dir(tmp_path) -> str:
+    """Directory for a test's SQLite files"""
+    return str(tmp_path)
+
+
+@pytest.fixture
+def fake_estated():
+    from tests.fakes import FakeEstated
+    return FakeEstated()
+
+
+@pytest.fixture
+def fake_anthropic():
+    from tests.fakes import FakeAnthropicClient
+    return FakeAnthropicClient()
+
+
+@pytest.fixture
+def app_client(monkeypatch, tmp_path, fake_estated, fake_anthropic):
+    """TestClient running the real app and lifespan against the fake Estated and Anthropic"""
+    from fastapi.testclient import TestClient
+
+    from app import main
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "JOB_STORE_PATH", str(tmp_path / "report_jobs.sqlite3"))
+    monkeypatch.setattr("app.services.container.create_http_client", fake_estated.http_client)
+    monkeypatch.setattr("app.services.container.create_anthropic_client", lambda: fake_anthropic)
+    with TestClient(main.app) as client:
+        yield client
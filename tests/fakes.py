@@ -0,0 +1,118 @@
+"""
+In-process stand-ins for the Estated and Anthropic clients
+
+`FakeAnthropicClient` answers `messages.create` with the benchmark legendary
+analysis; `FakeEstated` is an httpx transport serving Estated property records.
+Both count the calls they receive, so tests can assert on upstream usage.
+"""
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import anthropic
+import httpx
+
+from benchmarks.fixtures import estated_property_record, sample_legendary_response
+
+
+def text_message(text: str, usage: Any = None) -> SimpleNamespace:
+    """Minimal Messages API response carrying one text block"""
+    return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)], usage=usage, stop_reason="end_turn")
+
+
+def api_error(status_code: int, retry_after: Optional[float] = None) -> anthropic.APIStatusError:
+    """Anthropic API error for an HTTP status, as the SDK raises it"""
+    headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(status_code, headers=headers, request=request)
+    error_class = anthropic.RateLimitError if status_code == 429 else anthropic.APIStatusError
+    return error_class(f"HTTP {status_code}", response=response, body=None)
+
+
+class FakeMessages:
+    def __init__(self, client: "FakeAnthropicClient"):
+        self._client = client
+
+    async def create(self, **request: Any) -> Any:
+        client = self._client
+        client.requests.append(request)
+        client.in_flight += 1
+        client.max_in_flight = max(client.max_in_flight, client.in_flight)
+        try:
+            if client.delay:
+                await asyncio.sleep(client.delay)
+            if client.errors:
+                raise client.errors.pop(0)
+            return client.respond(request)
+        finally:
+            client.in_flight -= 1
+
+
+class FakeAnthropicClient:
+    """
+    Fake `anthropic.AsyncAnthropic` exposing `messages.create`
+
+    Args:
+        text: Assistant reply; defaults to the benchmark legendary analysis
+        delay: Seconds each call takes
+        errors: Exceptions raised by the first calls, in order
+        respond: Builds the response for a request, overriding `text`
+    """
+
+    def __init__(
+        self,
+        text: Optional[str] = None,
+        delay: float = 0.0,
+        errors: Optional[List[Exception]] = None,
+        respond: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ):
+        self.text = text if text is not None else sample_legendary_response()
+        self.delay = delay
+        self.errors = list(errors or [])
+        self.respond = respond or (lambda request: text_message(self.text))
+        self.requests: List[Dict[str, Any]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.messages = FakeMessages(self)
+
+    @property
+    def calls(self) -> int:
+        return len(self.requests)
+
+    async def close(self) -> None:
+        pass
+
+
+class FakeEstated:
+    """
+    httpx transport answering `GET /property` like Estated
+
+    Args:
+        statuses: HTTP statuses returned by the first requests, in order; later
+            requests succeed with `estated_property_record(address)`
+        delay: Seconds each response takes
+    """
+
+    def __init__(self, statuses: Optional[List[int]] = None, delay: float = 0.0):
+        self.statuses = list(statuses or [])
+        self.delay = delay
+        self.addresses: List[str] = []
+
+    @property
+    def calls(self) -> int:
+        return len(self.addresses)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        address = parse_qs(urlparse(str(request.url)).query).get("address", [""])[0]
+        self.addresses.append(address)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.statuses:
+            status = self.statuses.pop(0)
+            if status != 200:
+                return httpx.Response(status, json={"error": {"code": status}})
+        return httpx.Response(200, json=estated_property_record(address))
+
+    def http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
@@ -0,0 +1,77 @@
+import pytest
+
+from app.services.address import canonical_address_key, is_same_address, normalize_address
+
+
+@pytest.mark.parametrize("variant", [
+    "123 Main Street, Springfield, IL 62704",
+    "123 main st, springfield, il 62704",
+    "123 MAIN ST. SPRINGFIELD IL 62704",
+    "  123  Main   Street ,Springfield,  IL   62704 ",
+    "123 Main Str, Springfield, IL 62704",
+])
+def test_street_suffix_spellings_share_a_key(variant):
+    assert canonical_address_key(variant) == "123 MAIN ST SPRINGFIELD IL 62704"
+
+
+@pytest.mark.parametrize("address, street", [
+    ("456 North Oak Avenue, Austin, TX 78701", "456 N OAK AVE"),
+    ("456 N. Oak Ave, Austin, TX 78701", "456 N OAK AVE"),
+    ("789 Elm Boulevard Southwest, Austin, TX 78701", "789 ELM BLVD SW"),
+    ("789 Elm Blvd SW, Austin, TX 78701", "789 ELM BLVD SW"),
+    ("12 Hill Terrace Austin TX 78701", "12 HILL TER"),
+    # A directional that is the street name is kept
+    ("123 North Street, Austin, TX 78701", "123 NORTH ST"),
+])
+def test_directionals_and_suffixes_are_abbreviated(address, street):
+    assert normalize_address(address).street == street
+
+
+@pytest.mark.parametrize("variant", [
+    "500 Pine Road Apartment 4B, Dallas, TX 75201",
+    "500 Pine Rd Apt 4B, Dallas, TX 75201",
+    "500 Pine Rd, Apt. 4B, Dallas, TX 75201",
+    "500 Pine Rd #4B, Dallas, TX 75201",
+    "500 Pine Rd, Unit 4B, Dallas, TX 75201",
+    "500 Pine Rd Suite # 4B Dallas TX 75201",
+])
+def test_unit_designators_fold_to_a_hash(variant):
+    normalized = normalize_address(variant)
+    assert normalized.street == "500 PINE RD"
+    assert normalized.unit == "4B"
+    assert normalized.key == "500 PINE RD #4B DALLAS TX 75201"
+
+
+def test_units_keep_addresses_apart():
+    assert canonical_address_key("500 Pine Rd Apt 4B, Dallas, TX") != canonical_address_key("500 Pine Rd Apt 5, Dallas, TX")
+    assert canonical_address_key("500 Pine Rd Apt 4B, Dallas, TX") != canonical_address_key("500 Pine Rd, Dallas, TX")
+
+
+@pytest.mark.parametrize("variant", [
+    "123 Main St, Springfield, IL 62704-1234",
+    "123 Main St, Springfield, IL 627041234",
+    "123 Main St, Springfield, IL 62704, USA",
+    "123 Main St, Springfield, IL 62704 USA",
+    "123 Main St, Springfield, IL 62704-1234, United States",
+])
+def test_zip_plus_four_and_trailing_country_are_dropped(variant):
+    normalized = normalize_address(variant)
+    assert normalized.zip_code == "62704"
+    assert normalized.key == "123 MAIN ST SPRINGFIELD IL 62704"
+
+
+def test_bare_five_digit_number_is_not_taken_for_a_zip():
+    assert normalize_address("12345").zip_code is None
+
+
+def test_is_same_address_ignores_city_and_state():
+    # Owner mailing addresses often carry the postal city rather than the parcel's
+    assert is_same_address("123 Main St, Springfield, IL 62704", "123 MAIN STREET, SPRINGFLD, ILLINOIS 62704")
+    assert is_same_address("123 Main St, Springfield, IL", "123 Main Street, Chatham, IL 62704")
+
+
+def test_is_same_address_compares_street_unit_and_zip():
+    assert not is_same_address("123 Main St, Springfield, IL 62704", "125 Main St, Springfield, IL 62704")
+    assert not is_same_address("123 Main St Apt 1, Springfield, IL", "123 Main St Apt 2, Springfield, IL")
+    assert not is_same_address("123 Main St, Springfield, IL 62704", "123 Main St, Springfield, IL 62711")
+    assert not is_same_address("", "123 Main St")
@@ -0,0 +1,221 @@
+import asyncio
+import os
+import sqlite3
+import time
+
+import pytest
+
+from app.models import AnalysisSource
+from app.services.ai_analyzer import LegendaryAIAnalyzer
+from app.services.analysis_cache import AnalysisCache
+from app.services.estated_client import EstatedClient
+from app.services.rate_limiter import AnthropicGovernor
+from benchmarks.fixtures import SAMPLE_ADDRESS, estated_property_record, sample_property_data
+from tests.fakes import FakeAnthropicClient
+
+
+@pytest.fixture
+def cache_path(state_dir):
+    return os.path.join(state_dir, "analysis.sqlite3")
+
+
+@pytest.fixture
+def analysis_cache(cache_path):
+    cache = AnalysisCache(cache_path, ttl_seconds=3600, stale_seconds=3600)
+    yield cache
+    cache.close()
+
+
+def _analyzer(client: FakeAnthropicClient, analysis_cache: AnalysisCache) -> LegendaryAIAnalyzer:
+    return LegendaryAIAnalyzer(client=client, analysis_cache=analysis_cache, governor=AnthropicGovernor())
+
+
+def _age_rows(cache: AnalysisCache, seconds: float) -> None:
+    with cache._lock:
+        cache._conn.execute("UPDATE analysis_cache SET created_at = created_at - ?", (seconds,))
+        cache._conn.commit()
+
+
+# Property data shape
+
+def test_estated_record_is_parsed_into_the_nested_shape():
+    property_data = EstatedClient()._parse_property_response(estated_property_record(SAMPLE_ADDRESS))
+
+    assert set(property_data) == {"address", "property", "owner", "valuation", "raw_data"}
+    assert property_data["address"]["formatted_address"] == "1234 OAK STREET, AUSTIN, TX 78701"
+    assert {"street", "city", "state", "zip", "county"} <= set(property_data["address"])
+    assert {"year_built", "sqft", "bedrooms", "bathrooms", "last_sale_price"} <= set(property_data["property"])
+    assert property_data["owner"]["mailing_address"].startswith("PO BOX 4410, DALLAS")
+    assert set(property_data["valuation"]) == {"avm", "tax_assessed_value", "property_tax_amount"}
+
+
+def test_empty_estated_fields_are_omitted():
+    record = estated_property_record(SAMPLE_ADDRESS)
+    record["address"]["formatted_street_address"] = None
+    record["structure"]["year_built"] = ""
+    property_data = EstatedClient()._parse_property_response(record)
+
+    assert "formatted_address" not in property_data["address"]
+    assert "street" not in property_data["address"]
+    assert "year_built" not in property_data["property"]
+
+
+# Fingerprints and property keys
+
+def test_address_variants_share_a_property_key():
+    analyzer = _analyzer(FakeAnthropicClient(), analysis_cache=None)
+    upper = sample_property_data()
+    lower = sample_property_data()
+    lower["address"]["formatted_address"] = "1234 oak st, austin, tx 78701"
+
+    assert analyzer._property_key(upper) == analyzer._property_key(lower) == "1234 OAK ST AUSTIN TX 78701"
+
+
+def test_properties_with_identical_fields_do_not_share_an_analysis():
+    analyzer = _analyzer(FakeAnthropicClient(), analysis_cache=None)
+    first = sample_property_data()
+    second = sample_property_data()
+    second["address"]["formatted_address"] = "1236 OAK STREET, AUSTIN, TX 78701"
+
+    first_fields = analyzer._extract_prompt_fields(first)
+    second_fields = analyzer._extract_prompt_fields(second)
+    first_fields.pop("formatted_address")
+    second_fields.pop("formatted_address")
+    assert first_fields == second_fields
+    assert analyzer._property_key(first) != analyzer._property_key(second)
+    assert analyzer._analysis_fingerprint(first) != analyzer._analysis_fingerprint(second)
+
+
+def test_changed_inputs_change_the_fingerprint_but_not_the_property_key():
+    analyzer = _analyzer(FakeAnthropicClient(), analysis_cache=None)
+    before = sample_property_data()
+    after = sample_property_data()
+    after["valuation"]["avm"] += 50_000
+
+    assert analyzer._property_key(before) == analyzer._property_key(after)
+    assert analyzer._analysis_fingerprint(before) != analyzer._analysis_fingerprint(after)
+
+
+# Serving from the cache
+
+def test_stale_analysis_is_served_while_it_is_refreshed(analysis_cache):
+    client = FakeAnthropicClient()
+    analyzer = _analyzer(client, analysis_cache)
+    property_data = sample_property_data()
+
+    async def scenario():
+        await analyzer.analyze_property_legendary(property_data)
+        _age_rows(analysis_cache, 5400)  # past the TTL, inside the stale window
+
+        stale = await analyzer.analyze_property_legendary(property_data)
+        await asyncio.gather(*analyzer._refresh_tasks.values())
+        fresh = await analyzer.analyze_property_legendary(property_data)
+        return stale, fresh
+
+    stale, fresh = asyncio.run(scenario())
+    assert stale.source == AnalysisSource.CACHE and stale.age_seconds >= 5400
+    assert fresh.source == AnalysisSource.CACHE and fresh.age_seconds < 60
+    assert client.calls == 2
+    assert analysis_cache.stats()["stale_hits"] == 1
+
+
+def test_expired_analysis_is_a_miss(analysis_cache):
+    client = FakeAnthropicClient()
+    analyzer = _analyzer(client, analysis_cache)
+    property_data = sample_property_data()
+
+    async def scenario():
+        await analyzer.analyze_property_legendary(property_data)
+        _age_rows(analysis_cache, 7300)
+        return await analyzer.analyze_property_legendary(property_data)
+
+    assert asyncio.run(scenario()).source == AnalysisSource.AI
+    assert client.calls == 2
+
+
+def test_latest_analysis_of_the_property_is_served_when_claude_fails(analysis_cache):
+    client = FakeAnthropicClient()
+    analyzer = _analyzer(client, analysis_cache)
+    old_inputs = sample_property_data()
+    new_inputs = sample_property_data()
+    new_inputs["valuation"]["avm"] += 50_000
+    other_property = sample_property_data("9 Elm Street, Austin, TX 78701")
+
+    async def scenario():
+        cached = await analyzer.analyze_property_legendary(old_inputs)
+        _age_rows(analysis_cache, 10 ** 6)  # long expired, still retained
+        client.errors = [RuntimeError("Claude is down")] * 2
+        degraded = await analyzer.analyze_property_legendary(new_inputs)
+        unknown = await analyzer.analyze_property_legendary(other_property)
+        return cached, degraded, unknown
+
+    cached, degraded, unknown = asyncio.run(scenario())
+    assert degraded.source == AnalysisSource.CACHE
+    assert degraded.insights == cached.insights
+    assert unknown.source == AnalysisSource.RULES
+
+
+def test_get_latest_returns_the_newest_row_for_the_property(analysis_cache):
+    async def scenario():
+        await analysis_cache.set("old", {"version": 1}, "1234 OAK ST AUSTIN TX 78701")
+        _age_rows(analysis_cache, 60)
+        await analysis_cache.set("new", {"version": 2}, "1234 OAK ST AUSTIN TX 78701")
+        await analysis_cache.set("other", {"version": 3}, "9 ELM ST AUSTIN TX 78701")
+        return (
+            await analysis_cache.get_latest("1234 OAK ST AUSTIN TX 78701"),
+            await analysis_cache.get_latest("5 PINE ST AUSTIN TX 78701"),
+        )
+
+    latest, missing = asyncio.run(scenario())
+    assert latest.insights == {"version": 2}
+    assert missing is None
+
+
+# Retention and schema
+
+def test_rows_past_retention_are_pruned_on_write(cache_path):
+    cache = AnalysisCache(cache_path, ttl_seconds=10, stale_seconds=10, retention_seconds=100, prune_every=2)
+
+    async def scenario():
+        await cache.set("old", {"n": 1}, "A")
+        _age_rows(cache, 150)
+        await cache.set("recent", {"n": 2}, "B")  # second write: prunes
+        return await cache.get_latest("A"), await cache.get_latest("B")
+
+    old, recent = asyncio.run(scenario())
+    assert old is None and recent is not None
+    assert cache.stats()["pruned"] == 1
+    cache.close()
+
+
+def test_retention_never_drops_servable_rows(cache_path):
+    cache = AnalysisCache(cache_path, ttl_seconds=60, stale_seconds=60, retention_seconds=10)
+    assert cache.retention_seconds == 120
+    cache.close()
+
+
+def test_databases_without_property_keys_are_migrated(cache_path):
+    conn = sqlite3.connect(cache_path)
+    conn.execute(
+        "CREATE TABLE analysis_cache (fingerprint TEXT PRIMARY KEY, insights TEXT NOT NULL, created_at REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO analysis_cache VALUES ('legacy', '{\"n\": 1}', ?)", (time.time(),))
+    conn.commit()
+    conn.close()
+
+    cache = AnalysisCache(cache_path, ttl_seconds=3600, stale_seconds=0)
+
+    async def scenario():
+        legacy = await cache.get("legacy")
+        await cache.set("current", {"n": 2}, "1234 OAK ST AUSTIN TX 78701")
+        return legacy, await cache.get_latest("1234 OAK ST AUSTIN TX 78701")
+
+    legacy, latest = asyncio.run(scenario())
+    columns = {row[1] for row in cache._conn.execute("PRAGMA table_info(analysis_cache)")}
+    indexes = {row[1] for row in cache._conn.execute("PRAGMA index_list(analysis_cache)")}
+    cache.close()
+
+    assert "property_key" in columns
+    assert {"analysis_cache_property", "analysis_cache_created"} <= indexes
+    assert legacy.insights == {"n": 1}
+    assert latest.insights == {"n": 2}
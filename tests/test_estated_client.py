@@ -0,0 +1,301 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.services import resilience
+from app.config import settings
+from app.services.estated_client import EstatedClient, EstatedUnavailableError, _is_transient, create_http_client
+from app.services.property_cache import PropertyCache
+from app.services.resilience import (
+    CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN, CircuitBreaker, CircuitOpenError, RetryPolicy
+)
+from tests.fakes import FakeEstated
+
+ADDRESS = "1234 Oak Street, Austin, TX 78701"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resilience, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def _client(estated: FakeEstated, **kwargs) -> EstatedClient:
+    kwargs.setdefault("retry_policy", RetryPolicy(max_attempts=3, base_delay=0, max_delay=0, deadline_seconds=5))
+    return EstatedClient(http_client=estated.http_client(), cache=PropertyCache(), **kwargs)
+
+
+class Flaky:
+    """Operation failing with the given errors before succeeding"""
+
+    def __init__(self, *errors: Exception, delay: float = 0.0):
+        self.errors = list(errors)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+# Retry policy
+
+def test_backoff_is_full_jitter_capped_at_max_delay():
+    policy = RetryPolicy(max_attempts=10, base_delay=0.1, max_delay=1.0, deadline_seconds=60)
+    for attempt, cap in [(0, 0.1), (1, 0.2), (3, 0.8), (4, 1.0), (9, 1.0)]:
+        delays = [policy.backoff(attempt) for _ in range(200)]
+        assert all(0 <= delay <= cap for delay in delays)
+        assert max(delays) > cap / 2  # jitter spans the range rather than sitting at zero
+
+
+def test_transient_failures_are_retried_until_success():
+    policy = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0, deadline_seconds=5)
+    operation = Flaky(httpx.ConnectError("refused"), httpx.ReadTimeout("slow"))
+    assert asyncio.run(policy.run(operation, _is_transient)) == "ok"
+    assert operation.calls == 3
+
+
+def test_non_transient_failures_are_not_retried():
+    policy = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0, deadline_seconds=5)
+    operation = Flaky(ValueError("bad payload"))
+    with pytest.raises(ValueError):
+        asyncio.run(policy.run(operation, _is_transient))
+    assert operation.calls == 1
+
+
+def test_retries_stop_at_max_attempts():
+    policy = RetryPolicy(max_attempts=2, base_delay=0, max_delay=0, deadline_seconds=5)
+    operation = Flaky(*(httpx.ConnectError("refused") for _ in range(5)))
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(policy.run(operation, _is_transient))
+    assert operation.calls == 2
+
+
+def test_no_retry_is_started_past_the_deadline(monkeypatch):
+    policy = RetryPolicy(max_attempts=5, base_delay=10, max_delay=10, deadline_seconds=1)
+    monkeypatch.setattr(policy, "backoff", lambda attempt: 5.0)
+    operation = Flaky(httpx.ConnectError("refused"), httpx.ConnectError("refused"))
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(policy.run(operation, _is_transient))
+    assert operation.calls == 1
+
+
+def test_an_attempt_running_at_the_deadline_is_cut_off():
+    policy = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0, deadline_seconds=0.05)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(policy.run(Flaky(delay=1.0), _is_transient))
+
+
+# Circuit breaker
+
+def _fail_times(breaker: CircuitBreaker, count: int) -> None:
+    async def failing():
+        raise httpx.ConnectError("refused")
+
+    for _ in range(count):
+        with pytest.raises(httpx.ConnectError):
+            asyncio.run(breaker.call(failing))
+
+
+def test_circuit_opens_after_consecutive_failures_and_fails_fast(clock):
+    breaker = CircuitBreaker("Test", failure_threshold=3, reset_seconds=30)
+    _fail_times(breaker, 2)
+    assert breaker.state == CIRCUIT_CLOSED
+    _fail_times(breaker, 1)
+    assert breaker.state == CIRCUIT_OPEN
+
+    operation = Flaky()
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(breaker.call(operation))
+    assert operation.calls == 0
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("Test", failure_threshold=3, reset_seconds=30)
+    _fail_times(breaker, 2)
+    asyncio.run(breaker.call(Flaky()))
+    _fail_times(breaker, 2)
+    assert breaker.state == CIRCUIT_CLOSED
+
+
+def test_half_open_circuit_lets_one_trial_through_then_closes(clock):
+    breaker = CircuitBreaker("Test", failure_threshold=1, reset_seconds=30)
+    _fail_times(breaker, 1)
+    clock.now += 30
+
+    async def scenario():
+        trial = Flaky(delay=0.05)
+        other = Flaky()
+        results = await asyncio.gather(breaker.call(trial), breaker.call(other), return_exceptions=True)
+        return trial.calls, other.calls, results
+
+    trial_calls, other_calls, results = asyncio.run(scenario())
+    assert (trial_calls, other_calls) == (1, 0)
+    assert results[0] == "ok" and isinstance(results[1], CircuitOpenError)
+    assert breaker.state == CIRCUIT_CLOSED
+
+
+def test_failed_trial_reopens_the_circuit(clock):
+    breaker = CircuitBreaker("Test", failure_threshold=1, reset_seconds=30)
+    _fail_times(breaker, 1)
+    clock.now += 30
+    _fail_times(breaker, 1)
+    assert breaker.state == CIRCUIT_OPEN
+
+    clock.now += 29
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(breaker.call(Flaky()))
+    clock.now += 1
+    asyncio.run(breaker.call(Flaky()))
+    assert breaker.state == CIRCUIT_CLOSED
+
+
+def test_cancelled_trial_does_not_block_the_next_one(clock):
+    breaker = CircuitBreaker("Test", failure_threshold=1, reset_seconds=30)
+    _fail_times(breaker, 1)
+    clock.now += 30
+
+    async def scenario():
+        trial = asyncio.create_task(breaker.call(Flaky(delay=1.0)))
+        await asyncio.sleep(0)
+        assert breaker.state == CIRCUIT_HALF_OPEN
+        trial.cancel()
+        await asyncio.gather(trial, return_exceptions=True)
+        return await breaker.call(Flaky())
+
+    assert asyncio.run(scenario()) == "ok"
+    assert breaker.state == CIRCUIT_CLOSED
+
+
+# Estated client
+
+def test_property_is_parsed_and_cached():
+    estated = FakeEstated()
+
+    async def scenario():
+        client = _client(estated)
+        first = await client.get_property_data(ADDRESS)
+        second = await client.get_property_data(ADDRESS.lower())
+        await client.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first["address"]["formatted_address"]
+    assert first is second
+    assert estated.calls == 1
+
+
+def test_missing_property_returns_none_and_is_cached():
+    estated = FakeEstated(statuses=[404])
+
+    async def scenario():
+        client = _client(estated)
+        result = await client.get_property_data(ADDRESS), await client.get_property_data(ADDRESS)
+        await client.close()
+        return result
+
+    assert asyncio.run(scenario()) == (None, None)
+    assert estated.calls == 1
+
+
+@pytest.mark.parametrize("status", [400, 401, 403, 422])
+def test_rejected_requests_raise_instead_of_reporting_not_found(status):
+    estated = FakeEstated(statuses=[status])
+
+    async def scenario():
+        client = _client(estated)
+        with pytest.raises(EstatedUnavailableError, match=str(status)):
+            await client.get_property_data(ADDRESS)
+        # Not cached and not retried: the next lookup asks Estated again
+        property_data = await client.get_property_data(ADDRESS)
+        await client.close()
+        return property_data
+
+    assert asyncio.run(scenario()) is not None
+    assert estated.calls == 2
+
+
+def test_transient_statuses_are_retried():
+    estated = FakeEstated(statuses=[503, 429])
+
+    async def scenario():
+        client = _client(estated)
+        property_data = await client.get_property_data(ADDRESS)
+        await client.close()
+        return property_data
+
+    assert asyncio.run(scenario()) is not None
+    assert estated.calls == 3
+
+
+def test_persistent_failures_open_the_circuit():
+    estated = FakeEstated(statuses=[503] * 6)
+    breaker = CircuitBreaker("Estated", failure_threshold=2, reset_seconds=60)
+
+    async def scenario():
+        client = _client(estated, circuit_breaker=breaker)
+        for _ in range(3):
+            with pytest.raises(EstatedUnavailableError):
+                await client.get_property_data(ADDRESS)
+        await client.close()
+
+    asyncio.run(scenario())
+    assert breaker.state == CIRCUIT_OPEN
+    assert estated.calls == 6  # two lookups of three attempts; the third failed fast
+
+
+def test_rejected_estated_request_is_a_503_not_a_404(app_client, fake_estated):
+    fake_estated.statuses = [401]
+    response = app_client.post("/property/legendary", json={"address": ADDRESS})
+    assert response.status_code == 503
+    assert "401" in response.json()["error"]
+
+
+# HTTP client
+
+def test_http2_falls_back_with_a_warning_when_h2_is_missing(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "ESTATED_HTTP2", True)
+    monkeypatch.setattr("app.services.estated_client.importlib.util.find_spec", lambda name: None)
+
+    with caplog.at_level(logging.WARNING):
+        client = create_http_client()
+
+    assert client._transport._pool._http2 is False
+    assert any("h2 package is not installed" in record.getMessage() for record in caplog.records)
+    asyncio.run(client.aclose())
+
+
+def test_http2_is_used_when_h2_is_installed(monkeypatch):
+    pytest.importorskip("h2")
+    monkeypatch.setattr(settings, "ESTATED_HTTP2", True)
+    client = create_http_client()
+    assert client._transport._pool._http2 is True
+    asyncio.run(client.aclose())
+
+
+def test_http1_is_used_without_a_warning_when_http2_is_off(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "ESTATED_HTTP2", False)
+
+    with caplog.at_level(logging.WARNING):
+        client = create_http_client()
+
+    assert client._transport._pool._http2 is False
+    assert not caplog.records
+    asyncio.run(client.aclose())
@@ -0,0 +1,104 @@
+import math
+
+import pytest
+
+from app.services.financials import (
+    FinancialAssumptions, annual_debt_service, cash_on_cash_return, compute_financial_metrics,
+    monthly_carrying_costs, monthly_rent, net_operating_income
+)
+from benchmarks.bench_financials import batch_inputs, synthetic_properties
+
+ASSUMPTIONS = FinancialAssumptions(
+    rent_to_value_monthly=0.008,
+    vacancy_rate=0.05,
+    expense_ratio=0.35,
+    property_tax_rate=0.02,
+    insurance_rate=0.004,
+    maintenance_rate=0.01,
+    mortgage_rate=0.06,
+    loan_term_years=30,
+    down_payment_ratio=0.25,
+    closing_cost_ratio=0.03,
+)
+
+
+def _property(avm=None, last_sale_price=None, sqft=None, tax=None):
+    property_details = {"last_sale_price": last_sale_price, "sqft": sqft}
+    valuation = {"avm": avm, "property_tax_amount": tax}
+    return {
+        "property": {key: value for key, value in property_details.items() if value is not None},
+        "valuation": {key: value for key, value in valuation.items() if value is not None},
+    }
+
+
+def test_debt_service_at_a_zero_rate_is_straight_line():
+    assumptions = FinancialAssumptions(mortgage_rate=0.0, loan_term_years=30, down_payment_ratio=0.25)
+    # $300k financed over 360 payments
+    assert annual_debt_service(400_000, assumptions) == pytest.approx(10_000)
+
+
+def test_debt_service_at_a_nonzero_rate_matches_the_amortization_formula():
+    # $300k at 6% over 30 years: $1,798.65 a month
+    assert annual_debt_service(400_000, ASSUMPTIONS) == pytest.approx(1798.65 * 12, abs=0.1)
+
+
+def test_income_formulas():
+    rent = monthly_rent(400_000, ASSUMPTIONS)
+    assert rent == pytest.approx(3200)
+    assert net_operating_income(rent, ASSUMPTIONS) == pytest.approx(3200 * 12 * 0.95 * 0.65)
+    assert monthly_carrying_costs(400_000, 6000, ASSUMPTIONS) == pytest.approx((6000 + 400_000 * 0.014) / 12)
+
+
+def test_cash_on_cash_return_nets_out_debt_service():
+    noi = 30_000
+    expected = (noi - annual_debt_service(400_000, ASSUMPTIONS)) / (400_000 * 0.28)
+    assert cash_on_cash_return(noi, 400_000, ASSUMPTIONS) == pytest.approx(expected)
+
+
+def test_metrics_for_a_complete_property():
+    metrics = compute_financial_metrics(_property(avm=400_000, last_sale_price=250_000, sqft=2000, tax=6000), ASSUMPTIONS)
+
+    assert metrics["price_per_sqft_current"] == 200.0
+    assert metrics["price_per_sqft_historical"] == 125.0
+    assert metrics["estimated_equity"] == 150_000
+    assert metrics["monthly_rent"] == 3200.0
+    assert metrics["cap_rate"] == round(metrics["noi"] / 400_000 * 100, 2)
+    assert metrics["monthly_carrying_costs"] == round((6000 + 400_000 * 0.014) / 12, 2)
+
+
+def test_missing_avm_leaves_value_based_metrics_none():
+    metrics = compute_financial_metrics(_property(last_sale_price=250_000, sqft=2000), ASSUMPTIONS)
+
+    assert metrics["price_per_sqft_historical"] == 125.0
+    for name in ("price_per_sqft_current", "estimated_equity", "monthly_rent", "noi", "cap_rate",
+                 "cash_on_cash_return", "monthly_carrying_costs"):
+        assert metrics[name] is None, name
+
+
+@pytest.mark.parametrize("sqft", [None, 0, -5, "n/a"])
+def test_missing_or_invalid_area_leaves_per_sqft_metrics_none(sqft):
+    metrics = compute_financial_metrics(_property(avm=400_000, last_sale_price=250_000, sqft=sqft), ASSUMPTIONS)
+    assert metrics["price_per_sqft_current"] is None
+    assert metrics["price_per_sqft_historical"] is None
+    assert metrics["monthly_rent"] == 3200.0
+
+
+def test_missing_tax_is_estimated_from_the_tax_rate():
+    metrics = compute_financial_metrics(_property(avm=400_000), ASSUMPTIONS)
+    assert metrics["monthly_carrying_costs"] == round((400_000 * 0.02 + 400_000 * 0.014) / 12, 2)
+
+
+def test_batch_matches_scalar_metrics():
+    pytest.importorskip("numpy")
+    from app.services.financials import compute_financial_metrics_batch
+
+    properties = synthetic_properties(500, missing_rate=0.2)
+    batch = compute_financial_metrics_batch(assumptions=ASSUMPTIONS, **batch_inputs(properties))
+
+    for index, property_data in enumerate(properties):
+        for name, value in compute_financial_metrics(property_data, ASSUMPTIONS).items():
+            batch_value = float(batch[name][index])
+            if value is None:
+                assert math.isnan(batch_value), (index, name)
+            else:
+                assert batch_value == pytest.approx(value, abs=0.011), (index, name)
@@ -0,0 +1,203 @@
+import asyncio
+import os
+import sqlite3
+import time
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.services.job_queue import (
+    JOB_COMPLETED, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JobQueueFullError, JobStore, ReportJobQueue
+)
+
+
+class RecordingGenerator:
+    """Stand-in for LegendaryReportGenerator that records the addresses it was asked for"""
+
+    def __init__(self, error: Exception = None, hold: asyncio.Event = None):
+        self.addresses: List[str] = []
+        self.error = error
+        self.hold = hold
+
+    async def generate_legendary_report(self, address: str):
+        self.addresses.append(address)
+        if self.hold:
+            await self.hold.wait()
+        if self.error:
+            raise self.error
+        return SimpleNamespace(model_dump_json=lambda: '{"address_analyzed": "%s"}' % address)
+
+
+def _store(state_dir: str, **kwargs) -> JobStore:
+    return JobStore(os.path.join(state_dir, "jobs.sqlite3"), **kwargs)
+
+
+async def _drain(queue: ReportJobQueue) -> None:
+    await asyncio.wait_for(queue._queue.join(), 5)
+
+
+def test_jobs_run_in_priority_then_submission_order(state_dir):
+    async def scenario():
+        generator = RecordingGenerator(hold=asyncio.Event())
+        queue = ReportJobQueue(generator, store=_store(state_dir), worker_count=1)
+        await queue.start()
+        await queue.submit("busy", 5)
+        await asyncio.sleep(0.05)  # the only worker picks it up and blocks
+        for address, priority in [("low", 9), ("first-high", 1), ("normal", 5), ("second-high", 1)]:
+            await queue.submit(address, priority)
+        generator.hold.set()
+        await _drain(queue)
+        await queue.stop()
+        return generator.addresses
+
+    assert asyncio.run(scenario()) == ["busy", "first-high", "second-high", "normal", "low"]
+
+
+def test_completed_and_failed_jobs_are_recorded(state_dir):
+    async def scenario():
+        ok = ReportJobQueue(RecordingGenerator(), store=_store(state_dir), worker_count=1)
+        await ok.start()
+        done = await ok.submit("1 Oak St")
+        await _drain(ok)
+        done = await ok.get(done["job_id"])
+        await ok.stop()
+
+        failing = ReportJobQueue(RecordingGenerator(ValueError("not found")), store=_store(state_dir), worker_count=1)
+        await failing.start()
+        failed = await failing.submit("2 Oak St")
+        await _drain(failing)
+        failed = await failing.get(failed["job_id"])
+        await failing.stop()
+        return done, failed
+
+    done, failed = asyncio.run(scenario())
+    assert done["status"] == JOB_COMPLETED and done["result"] == {"address_analyzed": "1 Oak St"}
+    assert failed["status"] == JOB_FAILED and failed["error"] == "not found"
+
+
+def test_concurrent_submissions_cannot_overfill_the_queue(state_dir):
+    async def scenario():
+        queue = ReportJobQueue(RecordingGenerator(), store=_store(state_dir), max_queue_size=3)
+        results = await asyncio.gather(*(queue.submit(f"{n} Oak St") for n in range(10)), return_exceptions=True)
+        return queue, results
+
+    queue, results = asyncio.run(scenario())
+    assert sum(not isinstance(result, Exception) for result in results) == 3
+    assert all(isinstance(result, JobQueueFullError) for result in results if isinstance(result, Exception))
+    assert queue.stats()["queued"] == 3
+
+
+def test_full_queue_returns_429(state_dir, monkeypatch):
+    queue = ReportJobQueue(RecordingGenerator(), store=_store(state_dir), max_queue_size=1)
+    monkeypatch.setitem(main.app.dependency_overrides, main.get_job_queue, lambda: queue)
+
+    # No lifespan: the queue has no workers, so the first job stays queued
+    client = TestClient(main.app)
+    accepted = client.post("/property/legendary/jobs", json={"address": "1 Oak St"})
+    rejected = client.post("/property/legendary/jobs", json={"address": "2 Oak St"})
+
+    assert accepted.status_code == 202 and accepted.json()["status"] == JOB_QUEUED
+    assert rejected.status_code == 429
+    assert "full" in rejected.json()["error"]
+
+
+def test_unfinished_jobs_are_recovered_on_restart(state_dir):
+    async def scenario():
+        path = os.path.join(state_dir, "jobs.sqlite3")
+        first_run = ReportJobQueue(RecordingGenerator(), store=JobStore(path))
+        queued = await first_run.submit("1 Oak St", priority=5)
+        running = await first_run.submit("2 Oak St", priority=1)
+        await first_run.store.update(running["job_id"], JOB_RUNNING)
+        first_run.store.close()  # process stops before any worker ran
+
+        generator = RecordingGenerator()
+        second_run = ReportJobQueue(generator, store=JobStore(path), worker_count=1)
+        await second_run.start()
+        await _drain(second_run)
+        statuses = [(await second_run.get(job["job_id"]))["status"] for job in (queued, running)]
+        await second_run.stop()
+        return generator.addresses, statuses
+
+    addresses, statuses = asyncio.run(scenario())
+    assert addresses == ["2 Oak St", "1 Oak St"]
+    assert statuses == [JOB_COMPLETED, JOB_COMPLETED]
+
+
+def test_finished_jobs_past_retention_are_pruned_on_submit(state_dir):
+    async def scenario():
+        store = _store(state_dir, retention_seconds=3600)
+        queue = ReportJobQueue(RecordingGenerator(), store=store, worker_count=1)
+        await queue.start()
+        old = await queue.submit("1 Oak St")
+        await _drain(queue)
+        waiting = await store.create("waiting", "2 Oak St", 5)  # queued long ago, never finished
+        store._conn.execute("UPDATE report_jobs SET updated_at = ?", (time.time() - 7200,))
+        store._conn.commit()
+
+        await queue.submit("3 Oak St")
+        result = await queue.get(old["job_id"]), await queue.get(waiting["job_id"])
+        await queue.stop()
+        return result
+
+    old, waiting = asyncio.run(scenario())
+    assert old is None
+    assert waiting is not None and waiting["status"] == JOB_QUEUED
+
+
+def test_worker_survives_store_errors_and_retries_the_final_update(state_dir, monkeypatch):
+    monkeypatch.setattr("app.services.job_queue.FINISH_RETRY_DELAY_SECONDS", 0)
+
+    async def scenario():
+        store = _store(state_dir)
+        queue = ReportJobQueue(RecordingGenerator(), store=store, worker_count=1)
+        update_sync = store._update_sync
+        failures = {"running": 1, "completed": 2}
+
+        def flaky_update(job_id, status, result, error):
+            if failures.get(status):
+                failures[status] -= 1
+                raise sqlite3.OperationalError("database is locked")
+            update_sync(job_id, status, result, error)
+
+        store._update_sync = flaky_update
+        await queue.start()
+        lost = await queue.submit("1 Oak St")  # its "running" update fails
+        kept = await queue.submit("2 Oak St")  # its "completed" update fails twice, then lands
+        await _drain(queue)
+        result = queue._workers[0].done(), await queue.get(lost["job_id"]), await queue.get(kept["job_id"])
+        await queue.stop()
+        return result
+
+    worker_died, lost, kept = asyncio.run(scenario())
+    assert not worker_died
+    assert lost["status"] == JOB_QUEUED  # never started; re-run after a restart
+    assert kept["status"] == JOB_COMPLETED
+
+
+def test_job_is_marked_failed_when_its_report_cannot_be_stored(state_dir, monkeypatch):
+    monkeypatch.setattr("app.services.job_queue.FINISH_RETRY_DELAY_SECONDS", 0)
+
+    async def scenario():
+        store = _store(state_dir)
+        queue = ReportJobQueue(RecordingGenerator(), store=store, worker_count=1)
+        update_sync = store._update_sync
+
+        def no_room_for_reports(job_id, status, result, error):
+            if status == JOB_COMPLETED:
+                raise sqlite3.OperationalError("database or disk is full")
+            update_sync(job_id, status, result, error)
+
+        store._update_sync = no_room_for_reports
+        await queue.start()
+        job = await queue.submit("1 Oak St")
+        await _drain(queue)
+        job = await queue.get(job["job_id"])
+        await queue.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job["status"] == JOB_FAILED
+    assert "could not be stored" in job["error"]
@@ -0,0 +1,62 @@
+import asyncio
+import os
+
+import pytest
+
+from app.models import AnalysisSource
+from app.services.ai_analyzer import LEGENDARY_SECTION_KEYS, LegendaryAIAnalyzer
+from app.services.analysis_cache import AnalysisCache
+from app.services.rate_limiter import AnthropicGovernor
+from benchmarks.fixtures import sample_legendary_response, sample_property_data
+from tests.fakes import FakeAnthropicClient
+
+FULL_RESPONSE = sample_legendary_response()
+# Cut off partway, as by max_tokens: the later section headings never arrive
+TRUNCATED_RESPONSE = FULL_RESPONSE[:len(FULL_RESPONSE) // 2]
+
+
+@pytest.fixture
+def analysis_cache(state_dir):
+    cache = AnalysisCache(os.path.join(state_dir, "analysis.sqlite3"), ttl_seconds=3600, stale_seconds=3600)
+    yield cache
+    cache.close()
+
+
+def _analyzer(client: FakeAnthropicClient, analysis_cache: AnalysisCache = None) -> LegendaryAIAnalyzer:
+    return LegendaryAIAnalyzer(client=client, analysis_cache=analysis_cache, governor=AnthropicGovernor())
+
+
+def test_full_text_response_is_complete_and_cached(analysis_cache):
+    client = FakeAnthropicClient(FULL_RESPONSE)
+    analyzer = _analyzer(client, analysis_cache)
+    property_data = sample_property_data()
+
+    async def scenario():
+        first = await analyzer.analyze_property_legendary(property_data)
+        second = await analyzer.analyze_property_legendary(property_data)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first.source == AnalysisSource.AI
+    assert set(first.insights) == set(LEGENDARY_SECTION_KEYS)
+    assert second.source == AnalysisSource.CACHE
+    assert client.calls == 1
+
+
+def test_truncated_text_response_is_served_but_not_cached(analysis_cache):
+    client = FakeAnthropicClient(TRUNCATED_RESPONSE)
+    analyzer = _analyzer(client, analysis_cache)
+    property_data = sample_property_data()
+
+    async def scenario():
+        insights, complete = await analyzer._generate_legendary_analysis(property_data)
+        first = await analyzer.analyze_property_legendary(property_data)
+        second = await analyzer.analyze_property_legendary(property_data)
+        return insights, complete, first, second
+
+    insights, complete, first, second = asyncio.run(scenario())
+    assert complete is False
+    assert set(insights) == set(LEGENDARY_SECTION_KEYS)
+    assert first.source == second.source == AnalysisSource.AI
+    assert client.calls == 3
+    assert analysis_cache.stats()["hits"] == 0
@@ -0,0 +1,226 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import anthropic
+import pytest
+
+from app.services import rate_limiter
+from app.services.rate_limiter import AnthropicGovernor, TokenBucket, estimate_request_tokens
+from tests.fakes import FakeAnthropicClient, api_error, text_message
+
+REQUEST = {"model": "claude-test", "max_tokens": 100, "messages": [{"role": "user", "content": "x" * 400}]}
+
+
+class FakeClock:
+    """Monotonic clock that only moves when the code under test sleeps"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(
+        rate_limiter, "asyncio", SimpleNamespace(sleep=clock.sleep, Semaphore=asyncio.Semaphore, Lock=asyncio.Lock)
+    )
+    return clock
+
+
+def _governor(**kwargs) -> AnthropicGovernor:
+    kwargs.setdefault("max_concurrency", 10)
+    kwargs.setdefault("requests_per_minute", 0)
+    kwargs.setdefault("tokens_per_minute", 0)
+    kwargs.setdefault("max_retries", 2)
+    return AnthropicGovernor(**kwargs)
+
+
+# Token bucket
+
+def test_bucket_waits_for_the_refill_it_needs(clock):
+    bucket = TokenBucket(per_minute=60)
+
+    async def scenario():
+        await bucket.acquire(60)
+        await bucket.acquire(30)
+
+    asyncio.run(scenario())
+    assert clock.sleeps == [30.0]
+    assert bucket.tokens == 0
+
+
+def test_bucket_refund_is_capped_at_capacity(clock):
+    bucket = TokenBucket(per_minute=60)
+    asyncio.run(bucket.acquire(10))
+    bucket.refund(25)
+    assert bucket.tokens == 60
+
+
+def test_oversized_request_waits_for_a_full_bucket(clock):
+    bucket = TokenBucket(per_minute=60)
+
+    async def scenario():
+        await bucket.acquire(1)
+        await bucket.acquire(500)
+
+    asyncio.run(scenario())
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+def test_zero_rate_disables_the_bucket(clock):
+    bucket = TokenBucket(per_minute=0)
+    asyncio.run(bucket.acquire(10 ** 9))
+    assert clock.sleeps == []
+
+
+# Governor
+
+def test_token_reservation_is_settled_against_reported_usage(clock):
+    usage = SimpleNamespace(input_tokens=80, output_tokens=20, cache_creation_input_tokens=0)
+    client = FakeAnthropicClient(respond=lambda request: text_message("ok", usage))
+    governor = _governor(tokens_per_minute=10_000)
+
+    asyncio.run(governor.create_message(client, **REQUEST))
+
+    assert estimate_request_tokens(REQUEST) > 100
+    assert governor._token_bucket.tokens == 10_000 - 100
+
+
+def test_requests_per_minute_spaces_out_requests(clock):
+    client = FakeAnthropicClient(text="ok")
+    governor = _governor(requests_per_minute=2)
+
+    async def scenario():
+        for _ in range(3):
+            await governor.create_message(client, **REQUEST)
+
+    asyncio.run(scenario())
+    assert client.calls == 3
+    assert clock.sleeps == [30.0]
+
+
+@pytest.mark.parametrize("status_code", [429, 529])
+def test_rate_limiting_pauses_for_retry_after_then_retries(clock, status_code):
+    client = FakeAnthropicClient(text="ok", errors=[api_error(status_code, retry_after=7)])
+    governor = _governor()
+
+    response = asyncio.run(governor.create_message(client, **REQUEST))
+
+    assert response.content[0].text == "ok"
+    assert client.calls == 2
+    assert clock.sleeps == [7.0]
+    assert governor.stats()["rate_limited"] == 1
+
+
+def test_pause_holds_back_other_callers(clock):
+    client = FakeAnthropicClient(text="ok")
+    governor = _governor()
+    # Another caller was just rate limited
+    governor._pause_for(api_error(429, retry_after=5), attempt=0)
+
+    async def scenario():
+        await governor.create_message(client, **REQUEST)
+        await governor.create_message(client, **REQUEST)
+
+    asyncio.run(scenario())
+    # The first request waited out the pause; the second found it over
+    assert clock.sleeps == [5.0]
+    assert client.calls == 2
+
+
+def test_missing_retry_after_backs_off_exponentially(clock):
+    client = FakeAnthropicClient(text="ok", errors=[api_error(429), api_error(429)])
+    governor = _governor()
+
+    asyncio.run(governor.create_message(client, **REQUEST))
+    assert clock.sleeps == [1.0, 2.0]
+
+
+def test_rate_limiting_gives_up_after_max_retries(clock):
+    client = FakeAnthropicClient(text="ok", errors=[api_error(429, retry_after=1)] * 3)
+    governor = _governor(max_retries=2)
+
+    with pytest.raises(anthropic.RateLimitError):
+        asyncio.run(governor.create_message(client, **REQUEST))
+    assert client.calls == 3
+
+
+def test_other_api_errors_are_not_retried(clock):
+    client = FakeAnthropicClient(text="ok", errors=[api_error(500)])
+    governor = _governor()
+
+    with pytest.raises(anthropic.APIStatusError):
+        asyncio.run(governor.create_message(client, **REQUEST))
+    assert client.calls == 1
+    assert clock.sleeps == []
+
+
+def test_concurrency_is_capped_by_the_semaphore(clock):
+    client = FakeAnthropicClient(text="ok", delay=0.02)
+    governor = _governor(max_concurrency=2)
+
+    async def scenario():
+        await asyncio.gather(*(governor.create_message(client, **REQUEST) for _ in range(6)))
+
+    asyncio.run(scenario())
+    assert client.calls == 6
+    assert client.max_in_flight == 2
+    assert governor.stats()["in_flight"] == 0
+
+
+# Streaming
+
+class FakeStreamingClient:
+    """Client whose `messages.stream` fails to open or fails mid-stream on demand"""
+
+    def __init__(self, open_errors=(), stream_error=None):
+        self.open_errors = list(open_errors)
+        self.stream_error = stream_error
+        self.opened = 0
+        self.messages = SimpleNamespace(stream=self._stream)
+
+    @asynccontextmanager
+    async def _stream(self, **request):
+        if self.open_errors:
+            raise self.open_errors.pop(0)
+        self.opened += 1
+        yield SimpleNamespace(text="partial")
+
+
+def test_stream_is_retried_while_opening(clock):
+    client = FakeStreamingClient(open_errors=[api_error(429, retry_after=3)])
+    governor = _governor()
+
+    async def scenario():
+        async with governor.stream_message(client, **REQUEST) as stream:
+            return stream.text
+
+    assert asyncio.run(scenario()) == "partial"
+    assert client.opened == 1
+    assert clock.sleeps == [3.0]
+
+
+def test_stream_is_never_retried_once_open(clock):
+    client = FakeStreamingClient()
+    governor = _governor()
+
+    async def scenario():
+        async with governor.stream_message(client, **REQUEST):
+            raise api_error(529, retry_after=1)  # overloaded after text was delivered
+
+    with pytest.raises(anthropic.APIStatusError):
+        asyncio.run(scenario())
+    assert client.opened == 1
+    assert clock.sleeps == []
+    assert governor.stats()["in_flight"] == 0
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+
+from app.services.ai_analyzer import LegendaryAIAnalyzer
+from app.services.estated_client import EstatedClient
+from app.services.property_cache import PropertyCache
+from app.services.rate_limiter import AnthropicGovernor
+from app.services.report_generator import LegendaryReportGenerator
+from app.services.singleflight import SingleFlight
+from tests.fakes import FakeAnthropicClient, FakeEstated
+
+ADDRESS_VARIANTS = [
+    "1234 Oak Street, Austin, TX 78701",
+    "1234 oak st, austin, tx 78701",
+    "1234 OAK STREET AUSTIN TX 78701",
+    "  1234 Oak St.,  Austin, TX 78701-4410 ",
+]
+
+
+def _generator(estated: FakeEstated, claude: FakeAnthropicClient) -> LegendaryReportGenerator:
+    return LegendaryReportGenerator(
+        estated_client=EstatedClient(http_client=estated.http_client(), cache=PropertyCache()),
+        legendary_ai_analyzer=LegendaryAIAnalyzer(client=claude, analysis_cache=None, governor=AnthropicGovernor())
+    )
+
+
+def test_concurrent_reports_for_one_property_share_the_upstream_calls():
+    estated = FakeEstated(delay=0.05)
+    claude = FakeAnthropicClient(delay=0.05)
+    generator = _generator(estated, claude)
+
+    async def scenario():
+        return await asyncio.gather(*(generator.generate_legendary_report(address) for address in ADDRESS_VARIANTS * 3))
+
+    reports = asyncio.run(scenario())
+    assert estated.calls == 1
+    assert claude.calls == 1
+    # Each caller still gets its own report
+    assert len({report.report_id for report in reports}) == len(reports)
+    assert [report.address_analyzed for report in reports] == ADDRESS_VARIANTS * 3
+
+
+def test_different_properties_are_not_coalesced():
+    estated = FakeEstated(delay=0.05)
+    claude = FakeAnthropicClient(delay=0.05)
+    generator = _generator(estated, claude)
+
+    async def scenario():
+        await asyncio.gather(
+            generator.generate_legendary_report("1234 Oak Street, Austin, TX 78701"),
+            generator.generate_legendary_report("1236 Oak Street, Austin, TX 78701"),
+        )
+
+    asyncio.run(scenario())
+    assert estated.calls == 2
+    assert claude.calls == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    estated = FakeEstated()
+    claude = FakeAnthropicClient(delay=0.1)
+    generator = _generator(estated, claude)
+
+    async def scenario():
+        leaving = asyncio.create_task(generator.generate_legendary_report(ADDRESS_VARIANTS[0]))
+        staying = asyncio.create_task(generator.generate_legendary_report(ADDRESS_VARIANTS[1]))
+        await asyncio.sleep(0.03)  # both are waiting on Claude
+        leaving.cancel()
+        report = await staying
+        return leaving, report
+
+    leaving, report = asyncio.run(scenario())
+    assert leaving.cancelled()
+    assert report.address_analyzed == ADDRESS_VARIANTS[1]
+    assert claude.calls == 1
+
+
+def test_key_is_released_after_an_error():
+    estated = FakeEstated(statuses=[404])
+    claude = FakeAnthropicClient()
+    generator = _generator(estated, claude)
+
+    async def scenario():
+        failures = await asyncio.gather(
+            *(generator.generate_legendary_report(address) for address in ADDRESS_VARIANTS[:2]),
+            return_exceptions=True
+        )
+        inflight_after_error = generator._inflight.inflight_count
+        # 404s are cached, so drop the cached miss to let the retry reach Estated
+        generator.estated_client.cache.clear()
+        report = await generator.generate_legendary_report(ADDRESS_VARIANTS[0])
+        return failures, inflight_after_error, report
+
+    failures, inflight_after_error, report = asyncio.run(scenario())
+    assert all(isinstance(failure, ValueError) for failure in failures)
+    assert inflight_after_error == 0
+    assert report is not None
+    assert estated.calls == 2
+
+
+def test_singleflight_delivers_one_result_or_error_to_every_waiter():
+    flight = SingleFlight()
+    calls = []
+
+    async def work(result):
+        calls.append(result)
+        await asyncio.sleep(0.01)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def scenario():
+        values = await asyncio.gather(*(flight.do("key", lambda: work("value")) for _ in range(5)))
+        errors = await asyncio.gather(
+            *(flight.do("key", lambda: work(RuntimeError("boom"))) for _ in range(3)), return_exceptions=True
+        )
+        return values, errors
+
+    values, errors = asyncio.run(scenario())
+    assert values == ["value"] * 5
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert len(calls) == 2
+    assert flight.inflight_count == 0
+
+
+def test_work_finishes_even_if_every_waiter_is_cancelled():
+    flight = SingleFlight()
+    finished = []
+
+    async def work():
+        await asyncio.sleep(0.02)
+        finished.append(True)
+        return "done"
+
+    async def scenario():
+        waiter = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert finished == [True]
+    assert flight.inflight_count == 0
@@ -0,0 +1,144 @@
+import asyncio
+import os
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+from pydantic import ValidationError
+
+from app.config import settings
+from app.models import AnalysisSource
+from app.services.ai_analyzer import LEGENDARY_SECTION_KEYS, LegendaryAIAnalyzer
+from app.services.analysis_cache import AnalysisCache
+from app.services.rate_limiter import AnthropicGovernor
+from app.services.structured_output import (
+    LEGENDARY_ANALYSIS_TOOL_NAME,
+    _ai_section_model,
+    parse_legendary_tool_output
+)
+from benchmarks.fixtures import sample_property_data
+from tests.fakes import FakeAnthropicClient
+
+SAMPLE_VALUES = {str: "Solid", int: 7, float: 250000.0, List[str]: ["Location"]}
+
+
+def full_tool_input(section_keys=LEGENDARY_SECTION_KEYS) -> Dict[str, Dict[str, Any]]:
+    """Tool input that fills every AI field of the given sections"""
+    tool_input = {}
+    for section_key in section_keys:
+        fields = _ai_section_model(section_key).model_fields
+        tool_input[section_key] = {
+            name: SAMPLE_VALUES.get(field.annotation, SAMPLE_VALUES[float])
+            for name, field in fields.items()
+        }
+    return tool_input
+
+
+def tool_message(tool_input: Dict[str, Any]) -> SimpleNamespace:
+    """Messages API response carrying one analysis tool call"""
+    block = SimpleNamespace(type="tool_use", name=LEGENDARY_ANALYSIS_TOOL_NAME, input=tool_input)
+    return SimpleNamespace(content=[block], usage=None, stop_reason="tool_use")
+
+
+def tool_client(tool_input: Dict[str, Any]) -> FakeAnthropicClient:
+    """Fake client answering each request with the sections it asked for"""
+    def respond(request):
+        properties = request["tools"][0]["input_schema"]["properties"]
+        return tool_message({key: value for key, value in tool_input.items() if key in properties})
+
+    return FakeAnthropicClient(respond=respond)
+
+
+@pytest.fixture
+def analysis_cache(state_dir):
+    cache = AnalysisCache(os.path.join(state_dir, "analysis.sqlite3"), ttl_seconds=3600, stale_seconds=3600)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def json_mode(monkeypatch):
+    monkeypatch.setattr(settings, "LEGENDARY_OUTPUT_MODE", "json")
+
+
+def _analyze_twice(client: FakeAnthropicClient, analysis_cache: AnalysisCache):
+    analyzer = LegendaryAIAnalyzer(client=client, analysis_cache=analysis_cache, governor=AnthropicGovernor())
+    property_data = sample_property_data()
+
+    async def scenario():
+        first = await analyzer.analyze_property_legendary(property_data)
+        second = await analyzer.analyze_property_legendary(property_data)
+        return first, second
+
+    return asyncio.run(scenario())
+
+
+def test_full_tool_input_reports_no_missing_fields():
+    insights, missing_fields = parse_legendary_tool_output(tool_message(full_tool_input()), LEGENDARY_SECTION_KEYS)
+
+    assert missing_fields == []
+    assert set(insights) == set(LEGENDARY_SECTION_KEYS)
+
+
+def test_omitted_optional_field_is_reported_missing():
+    tool_input = full_tool_input(["deal_strategy"])
+    del tool_input["deal_strategy"]["suggested_purchase_price"]
+
+    insights, missing_fields = parse_legendary_tool_output(tool_message(tool_input), ["deal_strategy"])
+
+    assert missing_fields == ["deal_strategy.suggested_purchase_price"]
+    assert insights["deal_strategy"]["suggested_purchase_price"] is None
+
+
+def test_omitted_required_field_fails_validation():
+    tool_input = full_tool_input(["property_identity"])
+    del tool_input["property_identity"]["structure_condition"]
+
+    with pytest.raises(ValidationError):
+        parse_legendary_tool_output(tool_message(tool_input), ["property_identity"])
+
+
+def test_response_without_tool_call_is_rejected():
+    response = SimpleNamespace(content=[SimpleNamespace(type="text", text="No tool call")])
+
+    with pytest.raises(ValueError):
+        parse_legendary_tool_output(response, LEGENDARY_SECTION_KEYS)
+
+
+@pytest.mark.parametrize("analysis_mode", ["monolithic", "sectioned"])
+def test_complete_json_analysis_is_cached(monkeypatch, json_mode, analysis_cache, analysis_mode):
+    monkeypatch.setattr(settings, "LEGENDARY_ANALYSIS_MODE", analysis_mode)
+    client = tool_client(full_tool_input())
+
+    first, second = _analyze_twice(client, analysis_cache)
+
+    assert first.source == AnalysisSource.AI
+    assert second.source == AnalysisSource.CACHE
+
+
+@pytest.mark.parametrize("analysis_mode", ["monolithic", "sectioned"])
+def test_json_analysis_with_missing_fields_is_served_but_not_cached(
+    monkeypatch, json_mode, analysis_cache, analysis_mode
+):
+    monkeypatch.setattr(settings, "LEGENDARY_ANALYSIS_MODE", analysis_mode)
+    tool_input = full_tool_input()
+    del tool_input["deal_strategy"]["suggested_purchase_price"]
+    client = tool_client(tool_input)
+
+    first, second = _analyze_twice(client, analysis_cache)
+
+    assert first.source == second.source == AnalysisSource.AI
+    assert first.insights["deal_strategy"]["suggested_purchase_price"] is None
+    assert analysis_cache.stats()["hits"] == 0
+
+
+def test_invalid_json_analysis_is_not_cached(json_mode, analysis_cache):
+    tool_input = full_tool_input()
+    del tool_input["property_identity"]["structure_condition"]
+    client = tool_client(tool_input)
+
+    first, second = _analyze_twice(client, analysis_cache)
+
+    assert first.source != AnalysisSource.AI
+    assert second.source != AnalysisSource.CACHE
+    assert analysis_cache.stats()["hits"] == 0
@@ -0,0 +1,80 @@
+import logging
+
+import pytest
+
+from app.services import tracing
+from app.services.tracing import TRACE_ID_HEADER, TraceIdLogFilter, configure_tracing
+
+
+@pytest.fixture
+def memory_tracer():
+    tracer = configure_tracing("memory")
+    yield tracer
+    configure_tracing("none")
+
+
+def _find(node, name):
+    """First node called `name` in a span tree, depth first"""
+    if node["name"] == name:
+        return node
+    for child in node["children"]:
+        found = _find(child, name)
+        if found is not None:
+            return found
+    return None
+
+
+def _names(node):
+    return [child["name"] for child in node["children"]]
+
+
+def test_legendary_request_produces_one_span_tree(app_client, memory_tracer):
+    response = app_client.post("/property/legendary", json={"address": "1234 Oak Street, Austin, TX 78701"})
+    assert response.status_code == 200
+
+    trace_id = response.headers[TRACE_ID_HEADER]
+    assert len(trace_id) == 32
+    assert {span.trace_id for span in memory_tracer.exporter.spans} == {trace_id}
+
+    [root] = memory_tracer.exporter.span_tree(trace_id)
+    assert root["name"] == "POST /property/legendary"
+    assert root["attributes"]["http_status"] == 200
+
+    report = _find(root, "generate_legendary_report")
+    assert _names(report) == ["estated.get_property_data", "ai.analyze_legendary", "report.assemble"]
+    estated, analysis, _ = report["children"]
+    assert estated["attributes"]["cache_hit"] is False
+    assert _names(analysis) == ["claude.messages.create", "ai.parse"]
+    assert all(node["error"] is None for node in (root, report, estated, analysis))
+
+
+def test_failed_step_is_marked_on_its_span(app_client, memory_tracer, fake_estated):
+    fake_estated.statuses = [404]
+    response = app_client.post("/property/legendary", json={"address": "1 Nowhere Rd, Austin, TX 78701"})
+    assert response.status_code == 404
+
+    [root] = memory_tracer.exporter.span_tree(response.headers[TRACE_ID_HEADER])
+    report = _find(root, "generate_legendary_report")
+    assert report["error"] == "ValueError"
+    assert _names(report) == ["estated.get_property_data"]
+
+
+def test_log_lines_carry_the_request_trace_id(app_client, caplog):
+    caplog.handler.addFilter(TraceIdLogFilter())
+    with caplog.at_level(logging.INFO):
+        response = app_client.post("/property/legendary", json={"address": "1234 Oak Street, Austin, TX 78701"})
+
+    trace_id = response.headers[TRACE_ID_HEADER]
+    request_lines = [record for record in caplog.records if record.name.startswith("app.") and "legendary" in record.getMessage().lower()]
+    assert request_lines
+    assert {record.trace_id for record in request_lines} == {trace_id}
+
+    logging.getLogger("app.test").info("outside any request")
+    assert caplog.records[-1].trace_id == "-"
+
+
+def test_every_request_gets_its_own_trace_id(app_client):
+    first = app_client.get("/health").headers[TRACE_ID_HEADER]
+    second = app_client.get("/health").headers[TRACE_ID_HEADER]
+    assert first != second
+    assert tracing.current_trace_id() is None